@@ -0,0 +1,5 @@
+import sys
+
+from habit_tracker.main import main
+
+sys.exit(main())
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import Iterable, List, Optional, Tuple
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple, Union
 
 from habit_tracker.models import Habit
-from habit_tracker.utils_time import normalize_daily, normalize_weekly
+from habit_tracker.periodicity import periodicity_rule
+from habit_tracker.utils_time import US_PER_DAY, epoch_day, from_stamp, to_stamp
+
+
+class HabitStats(NamedTuple):
+    name: str
+    longest_streak: int
+    current_streak: int  # 0 unless the streak is still alive (see current_streak_for_habit)
+    completions: int
+    completion_rate: float  # completed periods / periods since the first completion
 
 
 def list_all_habits(habits: List[Habit]) -> List[Habit]:
@@ -12,70 +22,15 @@ def list_all_habits(habits: List[Habit]) -> List[Habit]:
 
 
 def habits_by_periodicity(habits: List[Habit], periodicity: str) -> List[Habit]:
-    p = periodicity.strip().lower()
+    rule = periodicity_rule(periodicity)
+    p = str(rule) if rule is not None else periodicity.strip().lower()
     return [h for h in habits if h.periodicity == p]
 
 
-def _longest_consecutive_dates(dates: Iterable[date]) -> int:
-    s = sorted(set(dates))
-    if not s:
-        return 0
-
-    best = 1
-    current = 1
-    for i in range(1, len(s)):
-        if (s[i] - s[i - 1]).days == 1:
-            current += 1
-            best = max(best, current)
-        else:
-            current = 1
-    return best
-
-
-def _longest_consecutive_iso_weeks(weeks: Iterable[Tuple[int, int]]) -> int:
-    wset = set(weeks)
-    if not wset:
-        return 0
-
-    def next_week(y: int, w: int) -> Tuple[int, int]:
-        from datetime import datetime, timedelta
-
-        monday = datetime.fromisocalendar(y, w, 1).date()
-        nxt = monday + timedelta(days=7)
-        ny, nw, _ = nxt.isocalendar()
-        return ny, nw
-
-    best = 0
-    for (y, w) in wset:
-        from datetime import datetime, timedelta
-
-        monday = datetime.fromisocalendar(y, w, 1).date()
-        prev = monday - timedelta(days=7)
-        py, pw, _ = prev.isocalendar()
-
-        if (py, pw) in wset:
-            continue
-
-        length = 1
-        cy, cw = y, w
-        while True:
-            ny, nw = next_week(cy, cw)
-            if (ny, nw) in wset:
-                length += 1
-                cy, cw = ny, nw
-            else:
-                break
-        best = max(best, length)
-
-    return best
-
-
 def longest_streak_for_habit(habit: Habit) -> int:
-    if habit.periodicity == "daily":
-        return _longest_consecutive_dates(normalize_daily(habit.completions))
-    if habit.periodicity == "weekly":
-        return _longest_consecutive_iso_weeks(normalize_weekly(habit.completions))
-    return 0
+    # Maintained incrementally by Habit.add_completion; see Periodicity.scan
+    # in periodicity.py for the single-pass engine behind full recomputes.
+    return habit.longest_streak
 
 
 def longest_streak_overall(habits: List[Habit]) -> int:
@@ -102,3 +57,99 @@ def longest_streak_overall_with_habit(habits: List[Habit]) -> Optional[Tuple[str
         return None
 
     return best_habit.name, best_streak
+
+
+def current_streak_for_habit(habit: Habit, today: Optional[date] = None) -> int:
+    """
+    Length of the streak that is still alive: its last period is the
+    current period or the one before it (which can still be extended).
+    """
+    rule = habit.rule
+    if rule is None or habit.last_period is None:
+        return 0
+    today_period = rule.period_of_day(epoch_day(today or date.today()))
+    return habit.current_streak if habit.last_period >= today_period - 1 else 0
+
+
+def habit_stats(habit: Habit, today: Optional[date] = None) -> HabitStats:
+    rule = habit.rule
+    stamps = habit.stamps
+    rate = 0.0
+    if rule is not None and stamps:
+        today_period = rule.period_of_day(epoch_day(today or date.today()))
+        first = rule.period_of_day(stamps[0] // US_PER_DAY)
+        last = rule.period_of_day(stamps[-1] // US_PER_DAY)
+        completed = len(set(rule.periods(stamps)))
+        rate = completed / (max(today_period, last) - first + 1)
+
+    return HabitStats(
+        name=habit.name,
+        longest_streak=longest_streak_for_habit(habit),
+        current_streak=current_streak_for_habit(habit, today),
+        completions=len(stamps),
+        completion_rate=rate,
+    )
+
+
+# --- Range queries (bisect over the sorted completion stamps) ---
+
+def _as_stamp(value: Union[date, datetime]) -> int:
+    if isinstance(value, datetime):
+        return to_stamp(value)
+    return epoch_day(value) * US_PER_DAY
+
+
+def _stamp_range(habit: Habit, start: Union[date, datetime], end: Union[date, datetime]) -> Tuple[int, int]:
+    stamps = habit.stamps
+    return bisect_left(stamps, _as_stamp(start)), bisect_left(stamps, _as_stamp(end))
+
+
+def completions_between(habit: Habit, start: Union[date, datetime], end: Union[date, datetime]) -> List[datetime]:
+    """Completions with start <= ts < end, oldest first (dates mean midnight)."""
+    lo, hi = _stamp_range(habit, start, end)
+    return [from_stamp(s) for s in habit.stamps[lo:hi]]
+
+
+def count_completions_between(habit: Habit, start: Union[date, datetime], end: Union[date, datetime]) -> int:
+    lo, hi = _stamp_range(habit, start, end)
+    return hi - lo
+
+
+def completion_rate(habit: Habit, start: date, end: date) -> float:
+    """Share of the habit's periods from start to end (both days inclusive) that were completed."""
+    rule = habit.rule
+    if rule is None or end < start:
+        return 0.0
+
+    first = rule.period_of_day(epoch_day(start))
+    last = rule.period_of_day(epoch_day(end))
+    lo, hi = _stamp_range(habit, start, end + timedelta(days=1))
+    completed = len(set(rule.periods(habit.stamps[lo:hi])))
+    return completed / (last - first + 1)
+
+
+def rolling_counts(
+    habit: Habit,
+    window: int = 7,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> List[Tuple[date, int]]:
+    """
+    For each day from start (default: first completion) to end (default:
+    today), the number of completions in the `window` days ending that day.
+    """
+    stamps = habit.stamps
+    if start is None:
+        if not stamps:
+            return []
+        start = from_stamp(stamps[0]).date()
+    end = end or date.today()
+
+    out: List[Tuple[date, int]] = []
+    day = start
+    one_day = timedelta(days=1)
+    while day <= end:
+        next_day = day + one_day
+        out.append((day, count_completions_between(habit, next_day - timedelta(days=window), next_day)))
+        day = next_day
+    return out
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Hashable, NamedTuple, Optional, Tuple, TypeVar
+
+from habit_tracker.analytics import HabitStats, habit_stats, longest_streak_for_habit
+from habit_tracker.models import Habit
+from habit_tracker.tracker import HabitTracker
+
+T = TypeVar("T")
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class AnalyticsCache:
+    """
+    Memoizing analytics layer on top of a HabitTracker.
+
+    Results are keyed on the tracker's per-habit version counters, so a
+    check-off only invalidates the habit it touched; everything else is
+    served from a bounded LRU. By default (maxsize=None) the bound grows
+    with the number of habits, so a full pass never evicts its own
+    entries; the overall result has a slot of its own.
+    """
+
+    DEFAULT_MAXSIZE = 4096
+
+    def __init__(self, tracker: HabitTracker, maxsize: Optional[int] = None) -> None:
+        self.tracker = tracker
+        self.maxsize = maxsize
+        self._limit = maxsize if maxsize is not None else self.DEFAULT_MAXSIZE
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._overall: Optional[Tuple[int, Optional[Tuple[str, int]]]] = None  # (habits_version, result)
+        self.hits = 0
+        self.misses = 0
+
+    # --- Cached analytics ---
+    def longest_streak(self, habit: Habit) -> int:
+        return self._habit_cached("longest", habit, lambda: longest_streak_for_habit(habit))
+
+    def stats(self, habit: Habit, today: Optional[date] = None) -> HabitStats:
+        today = today or date.today()
+        return self._habit_cached(("stats", today), habit, lambda: habit_stats(habit, today))
+
+    def longest_overall_with_habit(self) -> Optional[Tuple[str, int]]:
+        version = self.tracker.habits_version
+        if self._overall is not None and self._overall[0] == version:
+            self.hits += 1
+            return self._overall[1]
+        self.misses += 1
+        best = self._compute_overall()
+        self._overall = (version, best)
+        return best
+
+    # --- Bookkeeping ---
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self._limit, len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._overall = None
+        self.hits = self.misses = 0
+
+    def _compute_overall(self) -> Optional[Tuple[str, int]]:
+        habits = self.tracker.list_habits()
+        if self.maxsize is None:
+            self._limit = max(self._limit, 2 * len(habits))
+        best: Optional[Tuple[str, int]] = None
+        for h in habits:
+            streak = self.longest_streak(h)
+            if streak > (best[1] if best else 0):
+                best = (h.name, streak)
+        return best
+
+    def _habit_cached(self, kind: Hashable, habit: Habit, compute: Callable[[], T]) -> T:
+        version = self.tracker.habit_version(habit.name)
+        if version is None:  # not managed by the tracker: nothing to key on
+            return compute()
+        return self._cached((kind, habit.name.strip().lower(), version), compute)
+
+    def _cached(self, key: Hashable, compute: Callable[[], T]) -> T:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self._entries[key] = compute()
+            if len(self._entries) > self._limit:
+                self._entries.popitem(last=False)
+            return value  # type: ignore[return-value]
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value  # type: ignore[return-value]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+from habit_tracker.analytics import HabitStats, habit_stats
+from habit_tracker.models import Habit
+from habit_tracker.utils_time import US_PER_DAY, epoch_day
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency: fall back to pure Python
+    np = None
+
+HAS_NUMPY = np is not None
+
+_UNIT_CODES = {"day": 0, "week": 1, "month": 2}
+
+
+def batch_stats(
+    habits: Sequence[Habit],
+    today: Optional[date] = None,
+    use_numpy: Optional[bool] = None,
+) -> List[HabitStats]:
+    """
+    HabitStats for every habit at once. Same results as analytics.habit_stats;
+    with NumPy installed the work is a handful of array operations over all
+    habits' completions packed into one flat array.
+    """
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy and np is None:
+        raise RuntimeError("NumPy is not installed.")
+
+    today = today or date.today()
+    if not use_numpy or not habits:
+        return [habit_stats(h, today) for h in habits]
+    return _batch_stats_numpy(habits, today)
+
+
+def longest_streak_overall_with_habit(
+    habits: Sequence[Habit], use_numpy: Optional[bool] = None
+) -> Optional[Tuple[str, int]]:
+    """Vectorized counterpart of analytics.longest_streak_overall_with_habit."""
+    best: Optional[Tuple[str, int]] = None
+    for stats in batch_stats(habits, use_numpy=use_numpy):
+        if stats.longest_streak > (best[1] if best else 0):
+            best = (stats.name, stats.longest_streak)
+    return best
+
+
+def _segment_starts(*keys: "np.ndarray") -> "np.ndarray":
+    """Indexes where any of the (equal-length) key arrays changes value."""
+    size = len(keys[0])
+    change = np.zeros(size, dtype=bool)
+    if size:
+        change[0] = True
+    for k in keys:
+        change[1:] |= k[1:] != k[:-1]
+    return np.flatnonzero(change)
+
+
+def _batch_stats_numpy(habits: Sequence[Habit], today: date) -> List[HabitStats]:
+    n = len(habits)
+    rules = [h.rule for h in habits]
+    unit = np.array([_UNIT_CODES[r.unit] if r else -1 for r in rules], dtype=np.int64)
+    every = np.array([r.every if r else 1 for r in rules], dtype=np.int64)
+    times = np.array([r.times if r else 1 for r in rules], dtype=np.int64)
+    anchor = np.array([r.anchor if r else 0 for r in rules], dtype=np.int64)
+
+    # --- Pack: one flat stamp column + per-habit counts (offsets) ---
+    counts = np.fromiter((len(h.stamps) for h in habits), dtype=np.int64, count=n)
+    columns = [np.frombuffer(h.stamps, dtype=np.int64) for h in habits if len(h.stamps)]
+    stamps = np.concatenate(columns) if columns else np.zeros(0, dtype=np.int64)
+    hid = np.repeat(np.arange(n, dtype=np.int64), counts)
+
+    # --- Distinct completion days per habit (stamps are sorted per habit) ---
+    days = stamps // US_PER_DAY
+    first = _segment_starts(hid, days)
+    days, hid = days[first], hid[first]
+
+    keep = unit[hid] >= 0
+    days, hid = days[keep], hid[keep]
+
+    # --- Period number of every completion day ---
+    u = unit[hid]
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    period = np.where(u == 0, (days - anchor[hid]) // every[hid], np.where(u == 1, (days + 3) // 7, months))
+
+    # --- Distinct (habit, period) segments and how many days each has ---
+    seg = _segment_starts(hid, period)
+    seg_days = np.diff(np.append(seg, len(period)))
+    seg_hid, seg_period = hid[seg], period[seg]
+
+    has_any = np.zeros(n, dtype=bool)
+    first_period = np.zeros(n, dtype=np.int64)
+    last_period = np.zeros(n, dtype=np.int64)
+    if len(seg):
+        groups = _segment_starts(seg_hid)
+        owners = seg_hid[groups]
+        has_any[owners] = True
+        first_period[owners] = seg_period[groups]
+        last_period[owners] = seg_period[np.append(groups[1:], len(seg)) - 1]
+
+    # --- Completed periods (enough distinct days) ---
+    done = seg_days >= times[seg_hid]
+    q_hid, q_period = seg_hid[done], seg_period[done]
+    completed = np.bincount(q_hid, minlength=n)
+
+    # --- Runs of consecutive completed periods ---
+    gap = np.ones(len(q_period), dtype=bool)
+    gap[1:] = (q_period[1:] != q_period[:-1] + 1) | (q_hid[1:] != q_hid[:-1])
+    run = np.flatnonzero(gap)
+    run_len = np.diff(np.append(run, len(q_period)))
+    run_hid = q_hid[run]
+
+    longest = np.zeros(n, dtype=np.int64)
+    current = np.zeros(n, dtype=np.int64)
+    last_done = np.full(n, np.iinfo(np.int64).min // 2, dtype=np.int64)
+    if len(run):
+        groups = _segment_starts(run_hid)
+        owners = run_hid[groups]
+        longest[owners] = np.maximum.reduceat(run_len, groups)
+        last_run = np.append(groups[1:], len(run)) - 1
+        current[owners] = run_len[last_run]
+        last_done[owners] = q_period[run[last_run] + run_len[last_run] - 1]
+
+    # --- Relative to today ---
+    today_day = epoch_day(today)
+    today_month = (today.year - 1970) * 12 + today.month - 1
+    today_period = np.where(unit == 0, (today_day - anchor) // every, np.where(unit == 1, (today_day + 3) // 7, today_month))
+
+    current = np.where(last_done >= today_period - 1, current, 0)
+    span = np.maximum(today_period, last_period) - first_period + 1
+    rate = np.where(has_any, completed / np.maximum(span, 1), 0.0)
+
+    return [
+        HabitStats(
+            name=h.name,
+            longest_streak=int(longest[i]),
+            current_streak=int(current[i]),
+            completions=int(counts[i]),
+            completion_rate=float(rate[i]),
+        )
+        for i, h in enumerate(habits)
+    ]
@@ -0,0 +1,189 @@
+"""
+asyncio facade over a ThreadSafeHabitTracker, for use inside event loops.
+
+- mutations change the in-memory state on the loop (microseconds), then
+  await the write that persists them. Writes run in an executor and are
+  group-committed: every mutation made while a write is queued or running
+  joins the next one, so N concurrent check-offs cost one or two writes
+  instead of N.
+- load/refresh and bulk mutations (add_completions, replace_all_habits)
+  run in the executor, and so do the analytics calls, which compute
+  from a snapshot through a shared AnalyticsCache.
+- queries (list_habits, get_task, ...) are plain methods: they read the
+  tracker's current snapshot and do no I/O.
+
+    async with AsyncHabitTracker(JsonStorage("data.json")) as tracker:
+        await tracker.load()
+        await asyncio.gather(*(tracker.check_off(name) for name in names))
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Executor
+from contextlib import ExitStack
+from datetime import date, datetime
+from functools import partial
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+from habit_tracker.analytics import HabitStats
+from habit_tracker.analytics_cache import AnalyticsCache
+from habit_tracker.models import Habit, Task
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.threadsafe import ThreadSafeHabitTracker, TrackerSnapshot
+
+T = TypeVar("T")
+
+
+class AsyncHabitTracker:
+    """Async HabitTracker API with group-committed, non-blocking writes; see the module docstring."""
+
+    def __init__(self, storage: JsonStorage, executor: Optional[Executor] = None) -> None:
+        self.tracker = ThreadSafeHabitTracker(storage=storage)
+        self.executor = executor  # None: the loop's default executor
+        # Held open for the tracker's lifetime: mutations only queue their
+        # ops, and _flush_loop decides when they are written.
+        self._deferred = ExitStack()
+        self._deferred.enter_context(self.tracker.batch())
+        self._waiters: List[asyncio.Future] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._analytics = AnalyticsCache(self.tracker)
+        self._analytics_lock = threading.Lock()
+
+    async def __aenter__(self) -> "AsyncHabitTracker":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    # --- Persistence ---
+    async def load(self) -> None:
+        await self._offload(self.tracker.load)
+
+    async def refresh(self) -> bool:
+        """Merge changes other processes wrote (see HabitTracker.refresh)."""
+        return await self._offload(self.tracker.refresh)
+
+    async def flush(self) -> None:
+        """Wait until every mutation made so far is written."""
+        await self._persisted()
+
+    async def aclose(self) -> None:
+        await self.flush()
+        self._deferred.close()
+
+    def _persisted(self) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush_loop())
+        return waiter
+
+    async def _flush_loop(self) -> None:
+        while self._waiters:
+            await asyncio.sleep(0)  # let mutations scheduled alongside this one join the write
+            waiters, self._waiters = self._waiters, []
+            try:
+                await self._offload(self.tracker.flush)
+            except Exception as e:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+            else:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+
+    async def _offload(self, fn: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(fn, *args))
+
+    async def _mutate(self, fn: Callable[..., T], *args: Any, offload: bool = False) -> T:
+        result = await self._offload(fn, *args) if offload else fn(*args)
+        await self._persisted()
+        return result
+
+    # --- Habits ---
+    async def create_habit(self, name: str, periodicity: str, description: str = "") -> Habit:
+        return await self._mutate(self.tracker.create_habit, name, periodicity, description)
+
+    async def check_off(self, name: str, ts: Optional[datetime] = None) -> None:
+        await self._mutate(self.tracker.check_off, name, ts or datetime.now())
+
+    async def add_completions(self, name: str, timestamps: Iterable[datetime]) -> int:
+        return await self._mutate(self.tracker.add_completions, name, list(timestamps), offload=True)
+
+    async def set_habit_active(self, name: str, active: bool) -> None:
+        await self._mutate(self.tracker.set_habit_active, name, active)
+
+    async def delete_habit(self, name: str) -> None:
+        await self._mutate(self.tracker.delete_habit, name)
+
+    async def replace_all_habits(self, habits: List[Habit]) -> None:
+        await self._mutate(self.tracker.replace_all_habits, habits, offload=True)
+
+    # --- Tasks ---
+    async def create_task(
+        self,
+        title: str,
+        urgent: bool,
+        important: bool,
+        description: str = "",
+        due_datetime: Optional[str] = None,
+    ) -> Task:
+        return await self._mutate(self.tracker.create_task, title, urgent, important, description, due_datetime)
+
+    async def complete_task(self, task_id: str) -> Task:
+        return await self._mutate(self.tracker.complete_task, task_id)
+
+    async def remove_task(self, task_id: str) -> None:
+        await self._mutate(self.tracker.remove_task, task_id)
+
+    # --- Queries (snapshot reads, no I/O) ---
+    def snapshot(self) -> TrackerSnapshot:
+        return self.tracker.snapshot()
+
+    def list_habits(self) -> List[Habit]:
+        return self.tracker.list_habits()
+
+    def get_habit_by_name(self, name: str) -> Optional[Habit]:
+        return self.tracker.get_habit_by_name(name)
+
+    def list_tasks(self) -> List[Task]:
+        return self.tracker.list_tasks()
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        return self.tracker.get_task(task_id)
+
+    def upcoming_tasks(self, *args, **kwargs) -> List[Task]:
+        return self.tracker.upcoming_tasks(*args, **kwargs)
+
+    def overdue_tasks(self, *args, **kwargs) -> List[Task]:
+        return self.tracker.overdue_tasks(*args, **kwargs)
+
+    # --- Analytics (executor) ---
+    async def longest_streak(self, name: str) -> int:
+        return await self._offload(self._with_habit, name, self._analytics.longest_streak)
+
+    async def stats(self, name: str, today: Optional[date] = None) -> HabitStats:
+        return await self._offload(self._with_habit, name, lambda habit: self._analytics.stats(habit, today))
+
+    async def longest_overall_with_habit(self) -> Optional[Tuple[str, int]]:
+        return await self._offload(self._with_snapshot, self._analytics.longest_overall_with_habit)
+
+    def _with_snapshot(self, compute: Callable[[], T]) -> T:
+        # The cache keys results on version counters: reading them from the
+        # same snapshot as the habits keeps a concurrent write from filing
+        # an old result under a new version.
+        with self._analytics_lock:
+            self._analytics.tracker = self.tracker.snapshot()
+            return compute()
+
+    def _with_habit(self, name: str, compute: Callable[[Habit], T]) -> T:
+        def run() -> T:
+            habit = self._analytics.tracker.get_habit_by_name(name)
+            if habit is None:
+                raise ValueError("Habit not found.")
+            return compute(habit)
+
+        return self._with_snapshot(run)
@@ -0,0 +1,188 @@
+"""
+Benchmarks for the storage / tracker / analytics hot paths.
+
+    python -m habit_tracker.bench --sizes 100,1000,10000 --out bench.json
+    python -m habit_tracker.bench --baseline bench.json   # exit 1 on regression
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from habit_tracker.analytics import longest_streak_for_habit, longest_streak_overall_with_habit
+from habit_tracker.fixtures import write_synthetic_dataset
+from habit_tracker.storage_binary import BinaryStorage, json_to_binary
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.tracker import HabitTracker
+
+
+class BenchResult(NamedTuple):
+    name: str
+    size: int
+    ops: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    peak_kib: float
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def measure(
+    name: str,
+    size: int,
+    op: Callable[[], object],
+    min_time: float = 0.5,
+    min_ops: int = 5,
+    max_ops: int = 100_000,
+) -> BenchResult:
+    """Time op() repeatedly (at least min_ops times / min_time seconds), then once under tracemalloc."""
+    timings: List[int] = []
+    started = time.perf_counter()
+    while len(timings) < max_ops and (len(timings) < min_ops or time.perf_counter() - started < min_time):
+        t0 = time.perf_counter_ns()
+        op()
+        timings.append(time.perf_counter_ns() - t0)
+
+    tracemalloc.start()
+    try:
+        op()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    total_s = sum(timings) / 1e9
+    return BenchResult(
+        name=name,
+        size=size,
+        ops=len(timings),
+        ops_per_sec=len(timings) / total_s if total_s else float("inf"),
+        p50_us=_percentile(timings, 0.50) / 1000,
+        p99_us=_percentile(timings, 0.99) / 1000,
+        peak_kib=peak / 1024,
+    )
+
+
+def run_benchmarks(
+    sizes: Sequence[int],
+    years: float = 1.0,
+    min_time: float = 0.5,
+    seed: int = 0,
+) -> List[BenchResult]:
+    results: List[BenchResult] = []
+    rng = random.Random(seed)
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "data.json"
+            write_synthetic_dataset(str(path), n_habits=size, years=years, n_tasks=max(1, size // 10), seed=seed)
+
+            storage = JsonStorage(file_path=str(path))
+            tracker = HabitTracker(storage=storage)
+            tracker.load()
+            habits = tracker.list_habits()
+            names = [h.name for h in habits]
+            daily = [h for h in habits if h.periodicity == "daily"] or habits
+            weekly = [h for h in habits if h.periodicity == "weekly"] or habits
+            tasks = tracker.list_tasks()
+
+            def bench(name: str, op: Callable[[], object]) -> None:
+                results.append(measure(name, size, op, min_time=min_time))
+
+            bench("JsonStorage.load", storage.load)
+            bench("JsonStorage.load[lazy]", JsonStorage(file_path=str(path), lazy=True).load)
+            snapshot_path = Path(tmp) / "data.htsnap"
+            json_to_binary(path, snapshot_path)
+            bench("BinaryStorage.load", BinaryStorage(file_path=str(snapshot_path)).load)
+            bench("JsonStorage.save", lambda: storage.save(habits, tasks))
+            bench("HabitTracker.check_off", lambda: tracker.check_off(rng.choice(names)))
+            bench("HabitTracker.get_habit_by_name", lambda: tracker.get_habit_by_name(rng.choice(names)))
+            bench("longest_streak_for_habit[daily]", lambda: longest_streak_for_habit(rng.choice(daily)))
+            bench("longest_streak_for_habit[weekly]", lambda: longest_streak_for_habit(rng.choice(weekly)))
+            bench("longest_streak_overall_with_habit", lambda: longest_streak_overall_with_habit(habits))
+
+    return results
+
+
+def to_json(results: Sequence[BenchResult]) -> dict:
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": [r._asdict() for r in results],
+    }
+
+
+def compare(results: Sequence[BenchResult], baseline: dict, tolerance: float = 0.25) -> List[str]:
+    """Human-readable regressions: p50 latency worse than baseline by more than `tolerance`."""
+    base: Dict[tuple, dict] = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = base.get((r.name, r.size))
+        if old is None or not old["p50_us"]:
+            continue
+        ratio = r.p50_us / old["p50_us"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{r.name} @ {r.size}: p50 {old['p50_us']:.1f}us -> {r.p50_us:.1f}us ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def _print_table(results: Sequence[BenchResult]) -> None:
+    print(f"{'benchmark':<36} {'size':>7} {'ops/s':>12} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+    for r in results:
+        print(
+            f"{r.name:<36} {r.size:>7} {r.ops_per_sec:>12.1f} {r.p50_us:>10.1f} {r.p99_us:>10.1f} {r.peak_kib:>10.1f}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m habit_tracker.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000", help="comma-separated habit counts (default: 100,1000)")
+    parser.add_argument("--years", type=float, default=1.0, help="history length per habit (default: 1)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per benchmark (default: 0.5)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a previous --out file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = run_benchmarks(sizes, years=args.years, min_time=args.min_time, seed=args.seed)
+    _print_table(results)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(to_json(results), indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, tolerance=args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-from habit_tracker.analytics import (
-    habits_by_periodicity,
-    list_all_habits,
-    longest_streak_for_habit,
-    longest_streak_overall_with_habit,
-)
-from habit_tracker.fixtures import build_predefined_habits_with_4_weeks_data
+from typing import TYPE_CHECKING
+
 from habit_tracker.storage_json import JsonStorage
 from habit_tracker.tracker import HabitTracker
 
+if TYPE_CHECKING:
+    from habit_tracker.analytics_cache import AnalyticsCache
+
+# Analytics and the demo fixtures are imported by the menus that use them,
+# so starting the CLI only loads the tracker and its storage.
 
 
 def _ask_int(prompt: str, min_value: int | None = None, max_value: int | None = None) -> int:
@@ -77,7 +77,9 @@ def _print_tasks_numbered(tasks) -> None:
 
 # ---------- Menus ----------
 
-def _analytics_menu(tracker: HabitTracker) -> None:
+def _analytics_menu(tracker: HabitTracker, cache: AnalyticsCache) -> None:
+    from habit_tracker.analytics import habits_by_periodicity, list_all_habits
+
     while True:
         print("\n--- Analytics ---")
         print("1) List all habits")
@@ -93,12 +95,12 @@ def _analytics_menu(tracker: HabitTracker) -> None:
             _print_habits_numbered(habits)
 
         elif choice == "2":
-            p = input("Periodicity (daily/weekly): ").strip()
+            p = input("Periodicity (daily/weekly/monthly/every-N-days/N-per-week): ").strip()
             habits = habits_by_periodicity(tracker.list_habits(), p)
             _print_habits_numbered(habits)
 
         elif choice == "3":
-            result = longest_streak_overall_with_habit(tracker.list_habits())
+            result = cache.longest_overall_with_habit()
             if result is None:
                 print("No habits available.")
             else:
@@ -113,7 +115,7 @@ def _analytics_menu(tracker: HabitTracker) -> None:
             if habit is None:
                 print("Habit not found.")
             else:
-                value = longest_streak_for_habit(habit)
+                value = cache.longest_streak(habit)
                 print(f"Longest streak for '{habit.name}': {value}")
 
         elif choice == "5":
@@ -130,7 +132,8 @@ def _task_matrix_menu(tracker: HabitTracker) -> None:
         print("3) List tasks by quadrant (1-4)")
         print("4) Mark task completed (pick by number)")
         print("5) Delete task (pick by number)")
-        print("6) Back")
+        print("6) Deadlines (overdue / due in the next 24h)")
+        print("7) Back")
 
         choice = input("Select an option: ").strip()
 
@@ -165,7 +168,7 @@ def _task_matrix_menu(tracker: HabitTracker) -> None:
                 if not tasks:
                     continue
                 idx = _ask_int("Task number to mark completed: ", 1, len(tasks))
-                tracker.mark_task_completed(idx)
+                tracker.complete_task(tasks[idx - 1].id)
                 print("Task marked completed & saved.")
 
             elif choice == "5":
@@ -174,10 +177,16 @@ def _task_matrix_menu(tracker: HabitTracker) -> None:
                 if not tasks:
                     continue
                 idx = _ask_int("Task number to delete: ", 1, len(tasks))
-                tracker.delete_task(idx)
+                tracker.remove_task(tasks[idx - 1].id)
                 print("Task deleted & saved.")
 
             elif choice == "6":
+                print("\nOverdue:")
+                _print_tasks_numbered(tracker.overdue_tasks())
+                print("\nDue in the next 24h:")
+                _print_tasks_numbered(tracker.upcoming_tasks())
+
+            elif choice == "7":
                 break
             else:
                 print("Invalid option. Try again.")
@@ -187,11 +196,13 @@ def _task_matrix_menu(tracker: HabitTracker) -> None:
 
 
 def run_cli() -> None:
-    storage = JsonStorage(file_path="data.json")
+    storage = JsonStorage(file_path="data.json", lazy=True)
     tracker = HabitTracker(storage=storage)
     tracker.load()
+    cache: AnalyticsCache | None = None
 
     while True:
+        tracker.refresh()  # pick up changes made by the GUI or another CLI
         print("\n=== Habit Tracker (Phase 2) ===")
         print("1) Create habit")
         print("2) List habits (numbered)")
@@ -209,7 +220,7 @@ def run_cli() -> None:
             if choice == "1":
                 name = input("Habit name: ").strip()
                 description = input("Description (optional): ").strip()
-                periodicity = input("Periodicity (daily/weekly): ").strip()
+                periodicity = input("Periodicity (daily/weekly/monthly/every-N-days/N-per-week): ").strip()
                 tracker.create_habit(name=name, description=description, periodicity=periodicity)
                 print("Habit created & saved.")
 
@@ -217,7 +228,7 @@ def run_cli() -> None:
                 _print_habits_numbered(tracker.list_habits())
 
             elif choice == "3":
-                p = input("Periodicity to filter (daily/weekly): ").strip()
+                p = input("Periodicity to filter (daily/weekly/monthly/...): ").strip()
                 _print_habits_numbered(tracker.list_habits_by_periodicity(p))
 
             elif choice == "4":
@@ -239,11 +250,17 @@ def run_cli() -> None:
                     print("Cancelled.")
 
             elif choice == "6":
-                _analytics_menu(tracker)
+                if cache is None:
+                    from habit_tracker.analytics_cache import AnalyticsCache
+
+                    cache = AnalyticsCache(tracker)
+                _analytics_menu(tracker, cache)
 
             elif choice == "7":
                 confirm = _ask_yes_no("This will REPLACE current habits with demo data. Continue? (y/n): ")
                 if confirm:
+                    from habit_tracker.fixtures import build_predefined_habits_with_4_weeks_data
+
                     tracker.replace_all_habits(build_predefined_habits_with_4_weeks_data())
                     print("Demo data loaded & saved.")
                 else:
@@ -253,7 +270,7 @@ def run_cli() -> None:
                 _task_matrix_menu(tracker)
 
             elif choice == "9":
-                tracker.save()
+                tracker.close()
                 print("Goodbye!")
                 break
 
@@ -0,0 +1,395 @@
+"""
+Non-interactive command line: one subcommand per invocation, or many
+newline-delimited commands with --batch.
+
+    python -m habit_tracker add Workout --periodicity daily
+    python -m habit_tracker checkoff Workout
+    python -m habit_tracker tasks add "Pay taxes" --urgent --important --due "12/01/26 14:30"
+    python -m habit_tracker --batch commands.txt      # or "-" / no file for stdin
+    python -m habit_tracker serve --port 8000         # HTTP/JSON API (see server.py)
+
+Every invocation loads the data once and saves once, however many
+commands a batch holds: batch commands are applied in memory inside
+HabitTracker.batch(). Lines in a batch use the same syntax as the
+subcommands (shell quoting, "#" comments and blank lines allowed).
+"""
+from __future__ import annotations
+
+import argparse
+import shlex
+import sys
+from datetime import datetime
+from typing import IO, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from habit_tracker.models import Task
+from habit_tracker.tracker import HabitTracker
+
+
+class UsageError(ValueError):
+    pass
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    # Raise instead of exiting, so one bad batch line doesn't end the batch.
+    def error(self, message: str) -> None:
+        raise UsageError(message)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = _ArgumentParser(prog="habit_tracker", description="Habit Tracker command line.")
+    parser.add_argument("--data", default="data.json", help="data file (.json, .sqlite3/.db or .htsnap)")
+    parser.add_argument(
+        "--batch",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="read newline-delimited commands from FILE (default: stdin) and save once",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="run the command in a fresh interpreter and report import times (stderr)",
+    )
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    p = sub.add_parser("add", help="create a habit")
+    p.add_argument("name")
+    p.add_argument("--periodicity", "-p", default="daily")
+    p.add_argument("--description", "-d", default="")
+
+    p = sub.add_parser("checkoff", help="record a completion")
+    p.add_argument("name")
+    p.add_argument("--at", help="ISO timestamp (default: now)")
+
+    p = sub.add_parser("delete", help="delete a habit")
+    p.add_argument("name")
+
+    p = sub.add_parser("list", help="list habits")
+    p.add_argument("--periodicity", "-p")
+
+    p = sub.add_parser("streaks", help="longest and current streaks")
+    p.add_argument("name", nargs="?")
+
+    p = sub.add_parser("import", help="import completions from a CSV or NDJSON file")
+    p.add_argument("path")
+
+    p = sub.add_parser("export", help="export completions (.csv) or everything (NDJSON)")
+    p.add_argument("path")
+
+    tasks = sub.add_parser("tasks", help="Eisenhower matrix tasks")
+    tsub = tasks.add_subparsers(dest="task_command", metavar="TASK_COMMAND")
+
+    p = tsub.add_parser("add", help="create a task")
+    p.add_argument("title")
+    p.add_argument("--urgent", action="store_true")
+    p.add_argument("--important", action="store_true")
+    p.add_argument("--description", "-d", default="")
+    p.add_argument("--due", help="DD/MM/YY HH:MM or an ISO date")
+
+    p = tsub.add_parser("list", help="list tasks")
+    p.add_argument("--quadrant", "-q", type=int, choices=range(1, 5))
+    status = p.add_mutually_exclusive_group()
+    status.add_argument("--open", dest="completed", action="store_false", default=None)
+    status.add_argument("--done", dest="completed", action="store_true", default=None)
+
+    p = tsub.add_parser("done", help="mark a task completed")
+    p.add_argument("id", help="task id (or a unique prefix of it)")
+
+    p = tsub.add_parser("delete", help="delete a task")
+    p.add_argument("id", help="task id (or a unique prefix of it)")
+
+    tsub.add_parser("due", help="overdue tasks and tasks due in the next 24h")
+
+    p = sub.add_parser("serve", help="serve the data as a local HTTP/JSON API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8000)
+    p.add_argument(
+        "--write-behind",
+        type=float,
+        metavar="SECONDS",
+        help="coalesce saves made within SECONDS of each other (default: save on every write)",
+    )
+    p.add_argument("--quiet", action="store_true", help="don't log requests")
+    return parser
+
+
+def open_storage(path: str):
+    """Storage backend for a data file, chosen by its extension."""
+    if path.endswith((".sqlite3", ".sqlite", ".db")):
+        from habit_tracker.storage_sqlite import SqliteStorage
+
+        return SqliteStorage(file_path=path, lazy=True)
+    if path.endswith(".htsnap"):
+        from habit_tracker.storage_binary import BinaryStorage
+
+        return BinaryStorage(file_path=path, lazy=True)
+    from habit_tracker.storage_json import JsonStorage
+
+    return JsonStorage(file_path=path, lazy=True)
+
+
+# --- Output ---
+
+def _format_task(t: Task) -> str:
+    status = "DONE" if t.completed else "TODO"
+    due = f" | due: {t.due_datetime}" if t.due_datetime else ""
+    return f"{t.id[:8]} [{status}] [Q{t.quadrant}] {t.title}{due}"
+
+
+def _print_tasks(tasks: List[Task], out: IO[str]) -> None:
+    for t in tasks:
+        print(_format_task(t), file=out)
+
+
+def _resolve_task(tracker: HabitTracker, ref: str) -> Task:
+    task = tracker.get_task(ref)
+    if task is not None:
+        return task
+    matches = [t for t in tracker.list_tasks() if t.id.startswith(ref)] if ref else []
+    if len(matches) > 1:
+        raise ValueError(f"Task id '{ref}' is ambiguous.")
+    if not matches:
+        raise ValueError("Task not found.")
+    return matches[0]
+
+
+def _parse_at(raw: Optional[str]) -> Optional[datetime]:
+    if raw is None:
+        return None
+    try:
+        return datetime.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(f"Invalid timestamp {raw!r}; use ISO format, e.g. 2026-01-12T07:30.") from None
+
+
+# --- Dispatch ---
+
+def run_command(tracker: HabitTracker, args: argparse.Namespace, out: IO[str]) -> None:
+    """Apply one parsed command; raises ValueError on bad input, OSError on unreadable/unwritable files."""
+    cmd = args.command
+    if cmd == "add":
+        habit = tracker.create_habit(name=args.name, periodicity=args.periodicity, description=args.description)
+        print(f"Added habit '{habit.name}' [{habit.periodicity}].", file=out)
+
+    elif cmd == "checkoff":
+        tracker.check_off(args.name, _parse_at(args.at))
+
+    elif cmd == "delete":
+        tracker.delete_habit(args.name)
+
+    elif cmd == "list":
+        habits = tracker.list_habits_by_periodicity(args.periodicity) if args.periodicity else tracker.list_habits()
+        for h in habits:
+            print(f"{h.name} [{h.periodicity}] (completions: {len(h.completions)})", file=out)
+
+    elif cmd == "streaks":
+        from habit_tracker.analytics import habit_stats
+
+        if args.name is not None:
+            habit = tracker.get_habit_by_name(args.name)
+            if habit is None:
+                raise ValueError("Habit not found.")
+            habits = [habit]
+        else:
+            habits = tracker.list_habits()
+        for h in habits:
+            s = habit_stats(h)
+            print(f"{s.name}: longest {s.longest_streak}, current {s.current_streak}", file=out)
+
+    elif cmd == "import":
+        import csv
+
+        from habit_tracker.transfer import import_file
+
+        try:
+            result = import_file(tracker, args.path)
+        except csv.Error as e:
+            raise ValueError(f"{args.path}: {e}") from None
+        print(
+            f"Imported {result.added} completions "
+            f"({result.duplicates} duplicates, {result.unknown} for unknown habits).",
+            file=out,
+        )
+
+    elif cmd == "export":
+        from habit_tracker.transfer import export_completions_csv, export_ndjson
+
+        if args.path.lower().endswith(".csv"):
+            n = export_completions_csv(tracker.list_habits(), args.path)
+        else:
+            n = export_ndjson(tracker.list_habits(), tracker.list_tasks(), args.path)
+        print(f"Wrote {n} rows to {args.path}.", file=out)
+
+    elif cmd == "tasks":
+        _run_task_command(tracker, args, out)
+
+    else:
+        raise UsageError("a command is required")
+
+
+def _run_task_command(tracker: HabitTracker, args: argparse.Namespace, out: IO[str]) -> None:
+    cmd = args.task_command
+    if cmd == "add":
+        task = tracker.create_task(
+            title=args.title,
+            urgent=args.urgent,
+            important=args.important,
+            description=args.description,
+            due_datetime=args.due,
+        )
+        print(f"Added task {task.id[:8]}.", file=out)
+
+    elif cmd == "list":
+        if args.quadrant is not None:
+            tasks = tracker.list_tasks_by_quadrant(args.quadrant)
+            if args.completed is not None:
+                tasks = [t for t in tasks if t.completed == args.completed]
+        elif args.completed is not None:
+            tasks = tracker.list_tasks_by_status(args.completed)
+        else:
+            tasks = tracker.list_tasks()
+        _print_tasks(tasks, out)
+
+    elif cmd == "done":
+        tracker.complete_task(_resolve_task(tracker, args.id).id)
+
+    elif cmd == "delete":
+        tracker.remove_task(_resolve_task(tracker, args.id).id)
+
+    elif cmd == "due":
+        print("Overdue:", file=out)
+        _print_tasks(tracker.overdue_tasks(), out)
+        print("Due in the next 24h:", file=out)
+        _print_tasks(tracker.upcoming_tasks(), out)
+
+    else:
+        raise UsageError("a tasks command is required (add, list, done, delete, due)")
+
+
+def _split(line: str) -> List[str]:
+    # shlex is slow; most batch lines (check-offs by name) need no quoting.
+    if '"' in line or "'" in line or "\\" in line:
+        return shlex.split(line)
+    return line.split()
+
+
+def _checkoff_of(argv: List[str]) -> Optional[Tuple[str, Optional[str]]]:
+    """(name, at) for a plain "checkoff NAME [--at TS]" line, without argparse."""
+    if argv[0] != "checkoff" or len(argv) < 2 or argv[1].startswith("-"):
+        return None
+    if len(argv) == 2:
+        return argv[1], None
+    if len(argv) == 4 and argv[2] == "--at":
+        return argv[1], argv[3]
+    return None
+
+
+def run_batch(
+    tracker: HabitTracker,
+    lines: Iterable[str],
+    out: IO[str],
+    err: IO[str],
+    parser: Optional[argparse.ArgumentParser] = None,
+) -> int:
+    """
+    Apply newline-delimited commands in memory and persist once at the end.
+    A failing line (bad input, or a file it names that can't be read or
+    written) is reported on err and skipped. Returns the number of failed
+    lines.
+
+    Consecutive check-offs are grouped per habit and applied with
+    add_completions(), so a run of (possibly backdated) check-offs costs
+    one merge per habit instead of one insert each. Like separate
+    checkoff commands, repeated timestamps are all recorded.
+    """
+    parser = parser or build_parser()
+    failed = 0
+    checkoffs: Dict[str, List[Tuple[int, datetime]]] = {}
+
+    def report(lineno: int, e: Exception) -> None:
+        nonlocal failed
+        failed += 1
+        print(f"line {lineno}: {e}", file=err)
+
+    def apply_checkoffs() -> None:
+        for name, entries in checkoffs.items():
+            try:
+                tracker.add_completions(name, [ts for _lineno, ts in entries], dedupe=False)
+            except ValueError as e:
+                for lineno, _ts in entries:
+                    report(lineno, e)
+        checkoffs.clear()
+
+    with tracker.batch():
+        for lineno, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                argv = _split(line)
+                checkoff = _checkoff_of(argv)
+                if checkoff is not None:
+                    name, at = checkoff
+                    checkoffs.setdefault(name, []).append((lineno, _parse_at(at) or datetime.now()))
+                    continue
+                apply_checkoffs()
+                args = parser.parse_args(argv)
+                if args.batch is not None:
+                    raise UsageError("--batch can't be nested")
+                if args.profile_startup:
+                    raise UsageError("--profile-startup can't run inside a batch")
+                if args.command == "serve":
+                    raise UsageError("serve can't run inside a batch")
+                run_command(tracker, args, out)
+            except (ValueError, OSError) as e:
+                report(lineno, e)
+        apply_checkoffs()
+    return failed
+
+
+def main(
+    argv: Optional[Sequence[str]] = None,
+    stdin: Optional[IO[str]] = None,
+    out: Optional[IO[str]] = None,
+    err: Optional[IO[str]] = None,
+) -> int:
+    stdin, out, err = stdin or sys.stdin, out or sys.stdout, err or sys.stderr
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except UsageError as e:
+        print(parser.format_usage().rstrip(), file=err)
+        print(f"error: {e}", file=err)
+        return 2
+
+    if args.profile_startup:
+        from habit_tracker.startup import profile_startup
+
+        argv = sys.argv[1:] if argv is None else argv
+        return profile_startup([a for a in argv if a != "--profile-startup"], err)
+
+    if args.command == "serve" and args.batch is None:
+        from habit_tracker.server import serve
+
+        return serve(open_storage(args.data), args.host, args.port, args.write_behind, verbose=not args.quiet)
+
+    tracker = HabitTracker(storage=open_storage(args.data))
+    try:
+        tracker.load()
+        if args.batch is not None:
+            if args.batch == "-":
+                failed = run_batch(tracker, stdin, out, err, parser)
+            else:
+                with open(args.batch, encoding="utf-8") as f:
+                    failed = run_batch(tracker, f, out, err, parser)
+            return 1 if failed else 0
+        if args.command is None:
+            print(parser.format_usage().rstrip(), file=err)
+            return 2
+        run_command(tracker, args, out)
+        return 0
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=err)
+        return 2 if isinstance(e, UsageError) else 1
+    finally:
+        tracker.close()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import random
 from datetime import datetime, timedelta
-from typing import List
+from pathlib import Path
+from typing import Iterator, List, Optional
 
-from habit_tracker.models import Habit
+from habit_tracker.models import Habit, Task
+from habit_tracker.storage_json import write_json_stream
 
 
 def build_predefined_habits_with_4_weeks_data() -> List[Habit]:
@@ -63,3 +66,146 @@ def build_predefined_habits_with_4_weeks_data() -> List[Habit]:
         drawing.completions.append(d.isoformat())
 
     return [workout, reading, walk, teeth, drawing]
+
+
+# ----------------------------
+# Synthetic large datasets (for scaling / benchmark work)
+# ----------------------------
+
+PATTERNS = ("streaky", "random", "weekly")
+
+
+def iter_synthetic_habit_records(
+    n_habits: int = 1000,
+    years: float = 1.0,
+    pattern: str = "mixed",
+    completion_probability: float = 0.7,
+    duplicate_rate: float = 0.0,
+    out_of_order_rate: float = 0.0,
+    seed: int = 0,
+    end: Optional[datetime] = None,
+) -> Iterator[dict]:
+    """
+    Yields habit records in the data.json layout, one at a time.
+
+    pattern:
+    - "streaky": daily habit, completions come in runs (Markov chain)
+    - "random":  daily habit, each day completed independently
+    - "weekly":  weekly habit, at most one completion per ISO week
+    - "mixed":   each habit picks one of the above
+
+    duplicate_rate / out_of_order_rate inject exact duplicate timestamps and
+    swapped (unsorted) entries into the completions list, the way hand-edited
+    or merged files look. Habit i only depends on (seed, i), so records are
+    reproducible whatever subset is consumed.
+    """
+    if pattern not in PATTERNS and pattern != "mixed":
+        raise ValueError(f"Pattern must be one of {', '.join(PATTERNS)} or 'mixed'.")
+    if not 0.0 <= completion_probability <= 1.0:
+        raise ValueError("completion_probability must be between 0 and 1.")
+
+    end = end or datetime(2026, 1, 1)
+    n_days = max(1, int(years * 365))
+    start = end - timedelta(days=n_days)
+
+    for i in range(n_habits):
+        rng = random.Random(seed * 1_000_003 + i)
+        kind = pattern if pattern != "mixed" else PATTERNS[i % len(PATTERNS)]
+        p = completion_probability
+
+        stamps: List[datetime] = []
+        if kind == "weekly":
+            # Blocks are ISO weeks (Monday to Sunday), clipped to the date range.
+            for week_start in range(-start.weekday(), n_days, 7):
+                if rng.random() < p:
+                    first = max(0, week_start)
+                    day = first + rng.randrange(min(week_start + 7, n_days) - first)
+                    stamps.append(start + timedelta(days=day, hours=rng.randint(6, 22), minutes=rng.randrange(60)))
+        else:
+            # Streaky: stay "on" with 0.9, switch on with a probability that
+            # keeps the long-run completion share at p.
+            p_stay = 0.9
+            p_start = min(1.0, (1 - p_stay) * p / (1 - p)) if p < 1 else 1.0
+            done = False
+            for day in range(n_days):
+                if kind == "random":
+                    done = rng.random() < p
+                else:
+                    done = rng.random() < (p_stay if done else p_start)
+                if done:
+                    stamps.append(start + timedelta(days=day, hours=rng.randint(6, 22), minutes=rng.randrange(60)))
+
+        completions = [ts.isoformat() for ts in stamps]
+        if duplicate_rate and completions:
+            for _ in range(int(len(completions) * duplicate_rate)):
+                j = rng.randrange(len(completions))
+                completions.insert(j, completions[j])
+        if out_of_order_rate and len(completions) > 1:
+            for _ in range(int(len(completions) * out_of_order_rate)):
+                a, b = rng.randrange(len(completions)), rng.randrange(len(completions))
+                completions[a], completions[b] = completions[b], completions[a]
+
+        yield {
+            "name": f"Habit {i:06d}",
+            "periodicity": "weekly" if kind == "weekly" else "daily",
+            "description": f"Synthetic {kind} habit",
+            "created_at": start.isoformat(),
+            "completions": completions,
+            "is_active": rng.random() > 0.05,
+        }
+
+
+def iter_synthetic_task_records(n_tasks: int = 100, seed: int = 0, end: Optional[datetime] = None) -> Iterator[dict]:
+    """Yields task records in the data.json layout, with both due-date spellings in use."""
+    rng = random.Random(seed * 1_000_003 - 1)
+    end = end or datetime(2026, 1, 1)
+    for i in range(n_tasks):
+        due: Optional[str] = None
+        roll = rng.random()
+        if roll < 0.4:
+            due = (end + timedelta(hours=rng.randint(-24 * 30, 24 * 30))).strftime("%d/%m/%y %H:%M")
+        elif roll < 0.7:
+            due = (end + timedelta(minutes=rng.randint(-60 * 24 * 30, 60 * 24 * 30))).isoformat()
+
+        yield {
+            "title": f"Task {i:06d}",
+            "urgent": rng.random() < 0.5,
+            "important": rng.random() < 0.5,
+            "description": "",
+            "due_datetime": due,
+            "created_at": (end - timedelta(days=rng.randint(0, 365))).isoformat(),
+            "completed": rng.random() < 0.3,
+        }
+
+
+def iter_synthetic_habits(**kwargs) -> Iterator[Habit]:
+    """Habit objects for iter_synthetic_habit_records(**kwargs)."""
+    return (Habit.from_dict(r) for r in iter_synthetic_habit_records(**kwargs))
+
+
+def write_synthetic_dataset(target, n_tasks: int = 100, **kwargs) -> None:
+    """
+    Stream a synthetic dataset into `target`:
+    - a path: written as a data.json-layout file, records kept verbatim
+      (so injected duplicates / out-of-order entries survive)
+    - a storage object: via save_iter() when available, else save()
+    kwargs are passed to iter_synthetic_habit_records.
+    """
+    seed = kwargs.get("seed", 0)
+    end = kwargs.get("end")
+
+    if isinstance(target, (str, Path)):
+        write_json_stream(
+            Path(target),
+            iter_synthetic_habit_records(**kwargs),
+            iter_synthetic_task_records(n_tasks, seed=seed, end=end),
+        )
+        return
+
+    habits = iter_synthetic_habits(**kwargs)
+    tasks = (Task.from_dict(r) for r in iter_synthetic_task_records(n_tasks, seed=seed, end=end))
+    save_iter = getattr(target, "save_iter", None)
+    if save_iter is not None:
+        save_iter(habits, tasks)
+    else:
+        target.save(list(habits), list(tasks))
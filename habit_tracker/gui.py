@@ -1,16 +1,107 @@
 from __future__ import annotations
 
 import tkinter as tk
+import tkinter.font as tkfont
+from collections import deque
 from tkinter import messagebox
-from typing import Optional
+from typing import Callable, Deque, List, Optional, Tuple
 
-from habit_tracker.analytics import (
-    longest_streak_for_habit,
-    longest_streak_overall_with_habit,
-)
-from habit_tracker.fixtures import build_predefined_habits_with_4_weeks_data
+from habit_tracker.analytics_cache import AnalyticsCache
+from habit_tracker.listview import ListModel
+from habit_tracker.models import Habit, Task
+from habit_tracker.repository import name_key
 from habit_tracker.storage_json import JsonStorage
-from habit_tracker.tracker import HabitTracker
+from habit_tracker.threadsafe import ThreadSafeHabitTracker
+from habit_tracker.tracker import Change
+from habit_tracker.worker import BackgroundWorker
+
+
+def _format_habit(h: Habit) -> str:
+    return f"{h.name} [{h.periodicity}]  (completions: {len(h.completions)})"
+
+
+def _format_task(t: Task) -> str:
+    status = "DONE" if t.completed else "TODO"
+    due = f" | due: {t.due_datetime}" if t.due_datetime else ""
+    return f"[{status}] [Q{t.quadrant}] {t.title}{due}"
+
+
+class VirtualListbox(tk.Frame):
+    """
+    A Listbox holding only the rows of a ListModel that fit in view, with
+    its own scrollbar over the whole model. render() rewrites just the
+    visible rows whose text changed.
+    """
+
+    def __init__(self, master, model: ListModel, on_select: Callable[[], None] = lambda: None, **listbox_options) -> None:
+        super().__init__(master)
+        self.model = model
+        self.start = 0
+        self._on_select = on_select
+        self._shown: List[Tuple[str, str]] = []
+        self._selected: Optional[str] = None
+
+        self.listbox = tk.Listbox(self, exportselection=False, **listbox_options)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._line_height = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+
+        self.listbox.bind("<<ListboxSelect>>", self._selection_changed)
+        self.listbox.bind("<Configure>", lambda e: self.render())
+        self.listbox.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda e: self._scroll(-1))
+        self.listbox.bind("<Button-5>", lambda e: self._scroll(1))
+
+    def selected_key(self) -> Optional[str]:
+        return self._selected
+
+    def page_size(self) -> int:
+        rows = int(self.listbox.cget("height"))
+        return max(rows, self.listbox.winfo_height() // self._line_height + 1)
+
+    def render(self) -> None:
+        total = len(self.model)
+        page = self.page_size()
+        self.start = max(0, min(self.start, total - page))
+        rows = self.model.window(self.start, page)
+
+        for i, row in enumerate(rows):
+            if i >= len(self._shown):
+                self.listbox.insert(tk.END, row[1])
+            elif self._shown[i] != row:
+                self.listbox.delete(i)
+                self.listbox.insert(i, row[1])
+        if len(self._shown) > len(rows):
+            self.listbox.delete(len(rows), tk.END)
+        self._shown = rows
+
+        self.listbox.selection_clear(0, tk.END)
+        for i, (key, _text) in enumerate(rows):
+            if key == self._selected:
+                self.listbox.selection_set(i)
+        if total:
+            self.scrollbar.set(self.start / total, (self.start + len(rows)) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _selection_changed(self, _event=None) -> None:
+        sel = self.listbox.curselection()
+        if sel and sel[0] < len(self._shown):
+            self._selected = self._shown[sel[0]][0]
+            self._on_select()
+
+    def _scroll(self, rows: int) -> str:
+        self.start += rows
+        self.render()
+        return "break"
+
+    def _yview(self, action: str, amount: str, unit: str = "units") -> None:
+        if action == "moveto":
+            self.start = int(float(amount) * len(self.model))
+        else:
+            self.start += int(amount) * (self.page_size() if unit == "pages" else 1)
+        self.render()
 
 
 class HabitTrackerGUI(tk.Tk):
@@ -19,8 +110,36 @@ class HabitTrackerGUI(tk.Tk):
         self.title("Habit Tracker")
         self.geometry("900x520")
 
-        self.tracker = HabitTracker(storage=JsonStorage(file_path="data.json"))
+        # write_behind: saves run on a timer thread instead of in button handlers.
+        # The worker (refresh, analytics) and that timer (merges while
+        # flushing) share the tracker with the Tk thread, hence the
+        # thread-safe variant: Tk-thread reads come from its snapshots.
+        self.tracker = ThreadSafeHabitTracker(storage=JsonStorage(file_path="data.json", lazy=True), write_behind=0.5)
         self.tracker.load()
+        # Only used from the worker thread (jobs run one at a time), always
+        # over a snapshot (see _snapshot_analytics).
+        self.analytics = AnalyticsCache(self.tracker)
+        self.worker = BackgroundWorker()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Lists follow tracker change notifications (which may arrive from the
+        # write-behind thread): queued here, applied on the Tk thread.
+        self._changes: Deque[Change] = deque()
+        self.tracker.subscribe(self._changes.append)
+        self.habit_model = ListModel(
+            items=self.tracker.list_habits,
+            get=self.tracker.get_habit_by_name,
+            key=lambda h: name_key(h.name),
+            fmt=_format_habit,
+            text=lambda h: h.name,
+        )
+        self.task_model = ListModel(
+            items=self.tracker.list_tasks,
+            get=self.tracker.get_task,
+            key=lambda t: t.id,
+            fmt=_format_task,
+            text=lambda t: t.title,
+        )
 
         # ---------- Layout containers ----------
         left = tk.Frame(self, padx=10, pady=10)
@@ -32,9 +151,12 @@ class HabitTrackerGUI(tk.Tk):
         # ---------- Habits list ----------
         tk.Label(left, text="Habits", font=("Segoe UI", 14, "bold")).pack(anchor="w")
 
-        self.habit_list = tk.Listbox(left, height=16, width=60)
-        self.habit_list.pack(fill=tk.BOTH, expand=True, pady=(6, 8))
-        self.habit_list.bind("<<ListboxSelect>>", lambda e: self.refresh_stats())
+        self.habit_search = tk.StringVar()
+        self.habit_search.trace_add("write", lambda *a: self._search(self.habit_model, self.habit_view, self.habit_search))
+        tk.Entry(left, textvariable=self.habit_search, width=30).pack(anchor="w", pady=(6, 0))
+
+        self.habit_view = VirtualListbox(left, self.habit_model, on_select=self.refresh_stats, height=16, width=60)
+        self.habit_view.pack(fill=tk.BOTH, expand=True, pady=(6, 8))
 
         habit_buttons = tk.Frame(left)
         habit_buttons.pack(fill=tk.X, pady=(0, 10))
@@ -54,7 +176,9 @@ class HabitTrackerGUI(tk.Tk):
 
         tk.Label(create_box, text="Periodicity").grid(row=1, column=0, sticky="w", pady=(6, 0))
         self.h_period = tk.StringVar(value="daily")
-        tk.OptionMenu(create_box, self.h_period, "daily", "weekly").grid(row=1, column=1, sticky="w", padx=6, pady=(6, 0))
+        tk.OptionMenu(
+            create_box, self.h_period, "daily", "weekly", "monthly", "every-2-days", "3-per-week"
+        ).grid(row=1, column=1, sticky="w", padx=6, pady=(6, 0))
 
         tk.Label(create_box, text="Description").grid(row=2, column=0, sticky="w", pady=(6, 0))
         self.h_desc = tk.Entry(create_box, width=45)
@@ -74,8 +198,12 @@ class HabitTrackerGUI(tk.Tk):
         tasks_box = tk.LabelFrame(right, text="Eisenhower Tasks", padx=10, pady=10)
         tasks_box.pack(fill=tk.BOTH, expand=True, pady=(12, 0))
 
-        self.task_list = tk.Listbox(tasks_box, height=10)
-        self.task_list.pack(fill=tk.BOTH, expand=True, pady=(0, 8))
+        self.task_search = tk.StringVar()
+        self.task_search.trace_add("write", lambda *a: self._search(self.task_model, self.task_view, self.task_search))
+        tk.Entry(tasks_box, textvariable=self.task_search, width=26).pack(anchor="w", pady=(0, 6))
+
+        self.task_view = VirtualListbox(tasks_box, self.task_model, height=10)
+        self.task_view.pack(fill=tk.BOTH, expand=True, pady=(0, 8))
 
         t_form = tk.Frame(tasks_box)
         t_form.pack(fill=tk.X)
@@ -97,52 +225,109 @@ class HabitTrackerGUI(tk.Tk):
         btns.pack(fill=tk.X)
 
         tk.Button(btns, text="Add Task", command=self.add_task).pack(side=tk.LEFT)
-        tk.Button(btns, text="Refresh Tasks", command=self.refresh_tasks).pack(side=tk.LEFT, padx=6)
+        tk.Button(btns, text="Refresh Tasks", command=self.refresh_all).pack(side=tk.LEFT, padx=6)
         tk.Button(btns, text="Mark Task Done", command=self.mark_task_done).pack(side=tk.LEFT, padx=6)
         tk.Button(btns, text="Delete Task", command=self.delete_task).pack(side=tk.LEFT, padx=6)
 
         # initial fill
         self.refresh_all()
+        self.after(self.POLL_MS, self._poll_storage)
+        self.after(self.DRAIN_MS, self._drain_worker)
 
     # ----------------- Helpers -----------------
 
+    POLL_MS = 2000
+    DRAIN_MS = 50
+
+    def on_close(self) -> None:
+        # Changes reach data.json within write_behind seconds of being made;
+        # close() writes whatever is still pending.
+        self.worker.stop()
+        try:
+            self.tracker.close()
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save changes: {e}")
+        self.destroy()
+
+    def _drain_worker(self) -> None:
+        # Results of background jobs and queued list changes are applied
+        # here, on the Tk thread.
+        try:
+            self._apply_changes()
+            for job in self.worker.poll():
+                if job.key == "stats":
+                    self._set_stats_text(f"Error: {job.error}" if job.error else job.value)
+                elif job.key == "longest":
+                    self._show_longest_overall(job.value, job.error)
+        finally:
+            self.after(self.DRAIN_MS, self._drain_worker)
+
+    def _poll_storage(self) -> None:
+        # Another process (e.g. the CLI) may have written data.json. The
+        # check (and any reload/merge) runs on the worker; merged changes
+        # arrive as notifications and are applied by _drain_worker.
+        self.worker.submit("refresh", self.tracker.refresh)
+        self.after(self.POLL_MS, self._poll_storage)
+
+    def _apply_changes(self) -> None:
+        changed = {"habit": set(), "task": set()}
+        while self._changes:
+            change = self._changes.popleft()
+            keys = changed[change.kind]
+            if keys is not None:
+                if change.key is None:
+                    changed[change.kind] = None
+                else:
+                    keys.add(change.key)
+
+        habits, tasks = changed["habit"], changed["task"]
+        if habits is None or habits:
+            self.habit_model.apply(habits)
+            self.habit_view.render()
+            self.refresh_stats()
+        if tasks is None or tasks:
+            self.task_model.apply(tasks)
+            self.task_view.render()
+
+    def _search(self, model: ListModel, view: VirtualListbox, query: tk.StringVar) -> None:
+        model.set_query(query.get())
+        view.start = 0
+        view.render()
+
     def refresh_all(self) -> None:
+        self.worker.submit("refresh", self.tracker.refresh)
+        self._apply_changes()
         self.refresh_habits()
         self.refresh_tasks()
         self.refresh_stats()
 
     def refresh_habits(self) -> None:
-        self.habit_list.delete(0, tk.END)
-        for h in self.tracker.list_habits():
-            self.habit_list.insert(tk.END, f"{h.name} [{h.periodicity}]  (completions: {len(h.completions)})")
+        self.habit_view.render()
 
     def refresh_tasks(self) -> None:
-        self.task_list.delete(0, tk.END)
-        tasks = self.tracker.list_tasks()
-        for i, t in enumerate(tasks, start=1):
-            status = "DONE" if t.completed else "TODO"
-            quad = (
-                "Q1" if (t.urgent and t.important)
-                else "Q2" if ((not t.urgent) and t.important)
-                else "Q3" if (t.urgent and (not t.important))
-                else "Q4"
-            )
-            due = f" | due: {t.due_datetime}" if t.due_datetime else ""
-            self.task_list.insert(tk.END, f"{i}) [{status}] [{quad}] {t.title}{due}")
+        self.task_view.render()
 
     def selected_habit_name(self) -> Optional[str]:
-        sel = self.habit_list.curselection()
-        if not sel:
-            return None
-        idx = sel[0]
-        habits = self.tracker.list_habits()
-        if idx < 0 or idx >= len(habits):
-            return None
-        return habits[idx].name
+        key = self.habit_view.selected_key()
+        habit = self.tracker.get_habit_by_name(key) if key is not None else None
+        return habit.name if habit is not None else None
 
     def refresh_stats(self) -> None:
+        # Any job still running for an older selection is dropped when it ends.
         name = self.selected_habit_name()
-        overall = longest_streak_overall_with_habit(self.tracker.list_habits())
+        self._set_stats_text("Computing…")
+        self.worker.submit("stats", self._compute_stats, name)
+
+    def _snapshot_analytics(self) -> AnalyticsCache:
+        # Worker thread only. Habits and the versions the cache keys on come
+        # from one snapshot, so Tk-thread writes can't change them mid-job.
+        self.analytics.tracker = self.tracker.snapshot()
+        return self.analytics
+
+    def _compute_stats(self, name: Optional[str]) -> str:
+        # Runs on the worker thread: no widget access here.
+        analytics = self._snapshot_analytics()
+        overall = analytics.longest_overall_with_habit()
 
         lines = []
         if overall is None:
@@ -154,15 +339,17 @@ class HabitTrackerGUI(tk.Tk):
         if name is None:
             lines.append("Selected habit: (none)")
         else:
-            habit = self.tracker.get_habit_by_name(name)
+            habit = analytics.tracker.get_habit_by_name(name)
             if habit:
                 lines.append(f"Selected habit: {habit.name}")
-                lines.append(f"Streak for selected: {longest_streak_for_habit(habit)}")
+                lines.append(f"Streak for selected: {analytics.longest_streak(habit)}")
                 lines.append(f"Total completions: {len(habit.completions)}")
+        return "\n".join(lines)
 
+    def _set_stats_text(self, text: str) -> None:
         self.stats_text.configure(state="normal")
         self.stats_text.delete("1.0", tk.END)
-        self.stats_text.insert(tk.END, "\n".join(lines))
+        self.stats_text.insert(tk.END, text)
         self.stats_text.configure(state="disabled")
 
     # ----------------- Habit actions -----------------
@@ -175,8 +362,8 @@ class HabitTrackerGUI(tk.Tk):
             self.tracker.create_habit(name=name, periodicity=period, description=desc)
             self.h_name.delete(0, tk.END)
             self.h_desc.delete(0, tk.END)
-            self.refresh_all()
-            messagebox.showinfo("Success", "Habit created & saved.")
+            self._apply_changes()
+            messagebox.showinfo("Success", "Habit created.")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
@@ -187,7 +374,7 @@ class HabitTrackerGUI(tk.Tk):
             return
         try:
             self.tracker.check_off(name)
-            self.refresh_all()
+            self._apply_changes()
             messagebox.showinfo("Success", f"Checked-off: {name}")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
@@ -201,7 +388,7 @@ class HabitTrackerGUI(tk.Tk):
             return
         try:
             self.tracker.delete_habit(name)
-            self.refresh_all()
+            self._apply_changes()
             messagebox.showinfo("Deleted", f"Deleted: {name}")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
@@ -209,13 +396,19 @@ class HabitTrackerGUI(tk.Tk):
     def load_demo(self) -> None:
         if not messagebox.askyesno("Confirm", "Replace all habits with demo data?"):
             return
+        from habit_tracker.fixtures import build_predefined_habits_with_4_weeks_data
+
         self.tracker.replace_all_habits(build_predefined_habits_with_4_weeks_data())
-        self.refresh_all()
-        messagebox.showinfo("Loaded", "Demo habits loaded & saved.")
+        self._apply_changes()
+        messagebox.showinfo("Loaded", "Demo habits loaded.")
 
     def show_longest_overall(self) -> None:
-        overall = longest_streak_overall_with_habit(self.tracker.list_habits())
-        if overall is None:
+        self.worker.submit("longest", lambda: self._snapshot_analytics().longest_overall_with_habit())
+
+    def _show_longest_overall(self, overall, error: Optional[BaseException]) -> None:
+        if error is not None:
+            messagebox.showerror("Error", str(error))
+        elif overall is None:
             messagebox.showinfo("Longest overall", "No habits available.")
         else:
             name, streak = overall
@@ -240,35 +433,33 @@ class HabitTrackerGUI(tk.Tk):
             self.t_due.delete(0, tk.END)
             self.t_urgent.set(False)
             self.t_important.set(False)
-            self.refresh_tasks()
-            messagebox.showinfo("Success", "Task created & saved.")
+            self._apply_changes()
+            messagebox.showinfo("Success", "Task created.")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
     def mark_task_done(self) -> None:
-        sel = self.task_list.curselection()
-        if not sel:
+        task_id = self.task_view.selected_key()
+        if task_id is None or self.tracker.get_task(task_id) is None:
             messagebox.showwarning("No selection", "Select a task first.")
             return
-        idx = sel[0] + 1  # 1-based for tracker
         try:
-            self.tracker.mark_task_completed(idx)
-            self.refresh_tasks()
+            self.tracker.complete_task(task_id)
+            self._apply_changes()
             messagebox.showinfo("Success", "Task marked DONE.")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
     def delete_task(self) -> None:
-        sel = self.task_list.curselection()
-        if not sel:
+        task_id = self.task_view.selected_key()
+        if task_id is None or self.tracker.get_task(task_id) is None:
             messagebox.showwarning("No selection", "Select a task first.")
             return
-        idx = sel[0] + 1
         if not messagebox.askyesno("Confirm", "Delete selected task?"):
             return
         try:
-            self.tracker.delete_task(idx)
-            self.refresh_tasks()
+            self.tracker.remove_task(task_id)
+            self._apply_changes()
             messagebox.showinfo("Deleted", "Task deleted.")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
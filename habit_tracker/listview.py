@@ -0,0 +1,153 @@
+"""
+Tk-free logic behind the GUI lists: a keyed row model that formats only
+the rows in view, incremental updates from HabitTracker change
+notifications, and word-prefix search backed by a sorted index.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def _words(text: str) -> Set[str]:
+    return set(text.lower().split())
+
+
+class PrefixIndex:
+    """
+    Sorted (word, key) pairs over the words of each key's text, so
+    "find keys with a word starting with q" is a bisect plus the matches.
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[Tuple[str, str]] = []
+        self._words: Dict[str, Set[str]] = {}
+
+    def set(self, key: str, text: str) -> None:
+        words = _words(text)
+        old = self._words.get(key, set())
+        if words == old:
+            return
+        for word in old - words:
+            del self._entries[bisect_left(self._entries, (word, key))]
+        for word in words - old:
+            insort(self._entries, (word, key))
+        self._words[key] = words
+
+    def discard(self, key: str) -> None:
+        for word in self._words.pop(key, ()):
+            del self._entries[bisect_left(self._entries, (word, key))]
+
+    def clear(self) -> None:
+        self._entries = []
+        self._words = {}
+
+    def _prefix_keys(self, prefix: str) -> Set[str]:
+        out = set()
+        i = bisect_left(self._entries, (prefix,))
+        entries = self._entries
+        while i < len(entries) and entries[i][0].startswith(prefix):
+            out.add(entries[i][1])
+            i += 1
+        return out
+
+    def search(self, query: str) -> Set[str]:
+        """Keys having, for every word of query, a word that starts with it."""
+        result: Optional[Set[str]] = None
+        for prefix in sorted(_words(query), key=len, reverse=True):  # longest = most selective first
+            keys = self._prefix_keys(prefix)
+            result = keys if result is None else result & keys
+            if not result:
+                break
+        return result if result is not None else set(self._words)
+
+
+class ListModel(Generic[T]):
+    """
+    Rows of a list view, keyed like HabitTracker change notifications
+    (habit name_key / task id).
+
+    - apply(keys) updates only the given keys (None: rebuild the key list)
+    - rows are formatted lazily, only when they're in window(), and cached
+      until their key changes
+    - set_query() filters through a PrefixIndex over text(item)
+    """
+
+    def __init__(
+        self,
+        items: Callable[[], Iterable[T]],
+        get: Callable[[str], Optional[T]],
+        key: Callable[[T], str],
+        fmt: Callable[[T], str],
+        text: Callable[[T], str],
+    ) -> None:
+        self._items = items
+        self._get = get
+        self._key = key
+        self._fmt = fmt
+        self._text = text
+        self._order: Dict[str, None] = {}  # insertion-ordered set of keys
+        self._rows: Optional[List[str]] = None  # cached list(self._order), or the filtered keys
+        self._formatted: Dict[str, str] = {}
+        self._index = PrefixIndex()
+        self._query = ""
+        self.apply(None)
+
+    # --- Updates ---
+    def apply(self, keys: Optional[Iterable[str]]) -> None:
+        if keys is None:
+            self._order = {}
+            self._formatted = {}
+            self._index.clear()
+            for item in self._items():
+                k = self._key(item)
+                self._order[k] = None
+                self._index.set(k, self._text(item))
+        else:
+            for k in keys:
+                item = self._get(k)
+                self._formatted.pop(k, None)
+                if item is None:
+                    self._order.pop(k, None)
+                    self._index.discard(k)
+                else:
+                    self._order.setdefault(k, None)
+                    self._index.set(k, self._text(item))
+        self._rows = None
+
+    def set_query(self, query: str) -> None:
+        query = query.strip()
+        if query != self._query:
+            self._query = query
+            self._rows = None
+
+    # --- Reads ---
+    def keys(self) -> List[str]:
+        """Keys of the visible rows: all in insertion order, or the matches sorted by text."""
+        if self._rows is None:
+            if not self._query:
+                self._rows = list(self._order)
+            else:
+                matches = []
+                for k in self._index.search(self._query):
+                    item = self._get(k)
+                    if item is not None:  # gone, but its change isn't applied yet
+                        matches.append((self._text(item).lower(), k))
+                self._rows = [k for _text, k in sorted(matches)]
+        return self._rows
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def window(self, start: int, size: int) -> List[Tuple[str, str]]:
+        """(key, formatted row) for rows start .. start+size-1."""
+        out = []
+        for k in self.keys()[start:start + size]:
+            row = self._formatted.get(k)
+            if row is None:
+                item = self._get(k)
+                row = self._formatted[k] = self._fmt(item) if item is not None else ""
+            out.append((k, row))
+        return out
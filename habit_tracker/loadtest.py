@@ -0,0 +1,182 @@
+"""
+Load test for the HTTP server (habit_tracker.server).
+
+    python -m habit_tracker.loadtest                       # spawns a local server on synthetic data
+    python -m habit_tracker.loadtest --url http://127.0.0.1:8000 --threads 16 --seconds 10
+
+Each worker thread keeps one keep-alive connection and loops over a mix
+of conditional GETs (listings, per-habit stats, longest streak; sent with
+If-None-Match from the ETags it has seen) and check-offs (--write-ratio).
+Reports throughput, latency percentiles and the share of 304s.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import quote, urlsplit
+
+from habit_tracker.bench import _percentile
+from habit_tracker.server import TrackerHTTPServer
+
+
+class LoadResult(NamedTuple):
+    requests: int
+    seconds: float
+    requests_per_sec: float
+    p50_ms: float
+    p99_ms: float
+    statuses: Dict[int, int]
+    errors: int
+
+    @property
+    def not_modified_ratio(self) -> float:
+        return self.statuses.get(304, 0) / self.requests if self.requests else 0.0
+
+
+def _worker(
+    host: str,
+    port: int,
+    names: List[str],
+    seconds: float,
+    write_ratio: float,
+    seed: int,
+    latencies: List[float],
+    statuses: Counter,
+    errors: List[int],
+) -> None:
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    etags: Dict[str, str] = {}
+    paths = ["/habits", "/tasks", "/analytics/longest"] + [f"/habits/{quote(n, safe='')}/stats" for n in names]
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if names and rng.random() < write_ratio:
+            method, path, body = "POST", f"/habits/{quote(rng.choice(names), safe='')}/checkoff", b"{}"
+            headers = {"Content-Type": "application/json"}
+        else:
+            method, path, body = "GET", rng.choice(paths), None
+            headers = {"If-None-Match": etags[path]} if path in etags else {}
+        t0 = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            conn.close()  # reconnects on the next request
+            continue
+        latencies.append(time.perf_counter() - t0)
+        statuses[response.status] += 1
+        etag = response.getheader("ETag")
+        if etag is not None:
+            etags[path] = etag
+    conn.close()
+
+
+def run_load(
+    url: str,
+    threads: int = 8,
+    seconds: float = 5.0,
+    write_ratio: float = 0.05,
+    seed: int = 0,
+) -> LoadResult:
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    conn.request("GET", "/habits")
+    names = [h["name"] for h in json.loads(conn.getresponse().read())]
+    conn.close()
+
+    latencies: List[float] = []  # list.append and Counter updates are atomic enough under the GIL
+    statuses: Counter = Counter()
+    errors: List[int] = []
+    workers = [
+        threading.Thread(
+            target=_worker,
+            args=(host, port, names, seconds, write_ratio, seed + i, latencies, statuses, errors),
+            daemon=True,
+        )
+        for i in range(threads)
+    ]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return LoadResult(
+        requests=len(latencies),
+        seconds=elapsed,
+        requests_per_sec=len(latencies) / elapsed if elapsed else 0.0,
+        p50_ms=_percentile(latencies, 0.50) * 1000,
+        p99_ms=_percentile(latencies, 0.99) * 1000,
+        statuses=dict(statuses),
+        errors=len(errors),
+    )
+
+
+def local_server(
+    data_dir: str, n_habits: int, seed: int = 0, write_behind: Optional[float] = None
+) -> Tuple[str, TrackerHTTPServer]:
+    """Start a server on an ephemeral port over a synthetic dataset; returns (url, server)."""
+    from habit_tracker.fixtures import write_synthetic_dataset
+    from habit_tracker.storage_json import JsonStorage
+    from habit_tracker.threadsafe import ThreadSafeHabitTracker
+
+    path = Path(data_dir) / "data.json"
+    write_synthetic_dataset(str(path), n_habits=n_habits, years=1.0, n_tasks=max(1, n_habits // 10), seed=seed)
+    tracker = ThreadSafeHabitTracker(storage=JsonStorage(file_path=str(path)), write_behind=write_behind)
+    tracker.load()
+    server = TrackerHTTPServer(("127.0.0.1", 0), tracker)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m habit_tracker.loadtest", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="server to test (default: spawn one on synthetic data)")
+    parser.add_argument("--habits", type=int, default=50, help="habits in the spawned server's data (default: 50)")
+    parser.add_argument("--threads", type=int, default=8, help="concurrent connections (default: 8)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="test duration (default: 5)")
+    parser.add_argument("--write-ratio", type=float, default=0.05, help="share of check-offs (default: 0.05)")
+    parser.add_argument(
+        "--write-behind", type=float, metavar="SECONDS", help="spawned server coalesces saves (see `serve --write-behind`)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = None
+        url = args.url
+        if url is None:
+            url, server = local_server(tmp, args.habits, seed=args.seed, write_behind=args.write_behind)
+        try:
+            result = run_load(url, args.threads, args.seconds, args.write_ratio, args.seed)
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+                server.api.tracker.close()
+
+    print(f"{url}: {result.requests} requests in {result.seconds:.1f}s over {args.threads} connections")
+    print(f"  {result.requests_per_sec:.0f} req/s, p50 {result.p50_ms:.2f} ms, p99 {result.p99_ms:.2f} ms")
+    print(
+        "  status: " + ", ".join(f"{code} x{n}" for code, n in sorted(result.statuses.items()))
+        + f" ({result.not_modified_ratio:.0%} not modified), {result.errors} errors"
+    )
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,33 @@
-from habit_tracker.cli import run_cli
-from habit_tracker.gui import run_gui
+import sys
+from typing import Optional, Sequence
 
+# Everything below main() is imported on demand: the scripted CLI never
+# loads tkinter, and the interactive CLI never loads the GUI.
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if "--profile-startup" in argv:
+        from habit_tracker.startup import profile_startup
+
+        return profile_startup([a for a in argv if a != "--profile-startup"])
+
+    if argv:
+        from habit_tracker.commands import main as run_command_line
+
+        return run_command_line(argv)
 
-def main() -> None:
     mode = input("Start in GUI mode? (y/n): ").strip().lower()
     if mode in {"y", "yes"}:
+        from habit_tracker.gui import run_gui
+
         run_gui()
     else:
+        from habit_tracker.cli import run_cli
+
         run_cli()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(main())
@@ -1,36 +1,337 @@
 from __future__ import annotations
 
+from array import array
+from bisect import insort
+from heapq import merge
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from habit_tracker.periodicity import Periodicity, periodicity_rule
+from habit_tracker.streaks import EMPTY_STREAK, StreakState
+from habit_tracker.utils_time import (
+    US_PER_DAY, due_stamp, format_stamp, format_stamps, from_stamp, parse_iso, parse_stamp, to_stamp,
+)
+
+
+_LEGACY_TASK_NAMESPACE = "6f1f7d0e-3c57-4f7e-9a52-2d7c1b0e8a41"
+
+
+# uuid is imported on first use: it pulls in platform, which is a large
+# part of a cold CLI start that never creates a task.
+def new_task_id() -> str:
+    from uuid import uuid4
+
+    return uuid4().hex
+
+
+def _legacy_task_id(created_raw: Optional[str], title: str) -> str:
+    from uuid import UUID, uuid5
+
+    return uuid5(UUID(_LEGACY_TASK_NAMESPACE), f"{created_raw}|{title}").hex
+
+
+class Completions(Sequence[str]):
+    """
+    List-like ISO-string view over a habit's completion stamps.
+
+    Keeps the old `habit.completions` API (len, iteration, indexing,
+    append of ISO strings) working on top of the compact array.
+    """
+
+    __slots__ = ("_habit",)
+
+    def __init__(self, habit: "Habit") -> None:
+        self._habit = habit
+
+    def __len__(self) -> int:
+        return self._habit.completion_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return format_stamps(self._habit.stamps[index])
+        return format_stamp(self._habit.stamps[index])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(format_stamps(self._habit.stamps))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Completions):
+            return self._habit.stamps == other._habit.stamps
+        return list(self) == other
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def append(self, value: Union[str, datetime]) -> None:
+        self._habit.add_completion(parse_iso(value) if isinstance(value, str) else value)
 
 
-@dataclass
 class Habit:
-    name: str
-    periodicity: str  # "daily" or "weekly"
-    description: str = ""
-    created_at: datetime = field(default_factory=datetime.now)
-    completions: List[str] = field(default_factory=list)  # ISO datetime strings
-    is_active: bool = True
+    """
+    A habit with its completion history.
+
+    Completions are kept as a sorted array('q') of epoch-microsecond
+    stamps (see utils_time), parsed once when loaded; `completions`
+    exposes them as ISO strings for display and serialization.
+
+    Streak state (current run, longest run, last completed period) is
+    maintained on every add_completion: O(1) for in-order completions,
+    full rescan only for backdated ones.
+
+    Habits built with Habit.lazy() start as headers only: the history is
+    fetched from a loader (ISO strings) the first time it is needed.
+    """
+
+    __slots__ = (
+        "name", "_periodicity", "description", "created_at", "is_active",
+        "_stamps", "_streak", "_loader", "_count",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        periodicity: str,  # see periodicity.py: "daily", "weekly", "monthly", "every-N-days", "N-per-week"
+        description: str = "",
+        created_at: Optional[datetime] = None,
+        completions: Optional[Iterable[Union[str, datetime]]] = None,
+        is_active: bool = True,
+    ) -> None:
+        self.name = name
+        self._periodicity = periodicity
+        self.description = description
+        self.created_at = created_at if created_at is not None else datetime.now()
+        self.is_active = is_active
+        self._stamps = array("q")
+        self._streak: Optional[StreakState] = EMPTY_STREAK  # None: unknown until loaded
+        self._loader: Optional[Callable[[], Union[Iterable[str], array]]] = None
+        self._count = 0
+        if completions:
+            self.completions = completions
+
+    @classmethod
+    def lazy(cls, data: dict, count: int, loader: Callable[[], Union[Iterable[str], array]]) -> "Habit":
+        """
+        Header-only habit from a to_dict()-style record without completions.
+        `count` is the number of completions; loader() returns them as ISO
+        strings, or as a sorted array('q') of stamps, and is called once to
+        load them. A saved streak (see from_dict) is used as-is, so streak
+        reads don't trigger the load either.
+        """
+        habit = cls._from_header(data)
+        habit._loader = loader
+        habit._count = count
+        habit._streak = habit._saved_streak(data.get("streak"), count)
+        return habit
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loader is None
+
+    @property
+    def completion_count(self) -> int:
+        return self._count if self._loader is not None else len(self._stamps)
+
+    def materialize(self) -> None:
+        """Fetch the completion history now (no-op unless lazy and not loaded yet)."""
+        loader = self._loader
+        if loader is None:
+            return
+        values = loader()
+        self._stamps = values if isinstance(values, array) else array("q", sorted(map(parse_stamp, values)))
+        if self._streak is None or self._count != len(self._stamps):
+            self._recompute_streak()
+        # Cleared last: a reader on another thread (GUI worker) either sees
+        # the loaded history or loads it again, never a half-loaded habit.
+        self._loader = None
+
+    def copy(self) -> "Habit":
+        """Independent copy with its own completion array (an unloaded habit stays unloaded)."""
+        clone = Habit.__new__(Habit)
+        for attr in Habit.__slots__:
+            setattr(clone, attr, getattr(self, attr))
+        clone._stamps = array("q", self._stamps)
+        return clone
+
+    @property
+    def periodicity(self) -> str:
+        return self._periodicity
+
+    @periodicity.setter
+    def periodicity(self, value: str) -> None:
+        self.materialize()
+        self._periodicity = value
+        self._recompute_streak()
+
+    @property
+    def rule(self) -> Optional[Periodicity]:
+        """The periodicity rule, with every-N-days periods counted from the creation day."""
+        rule = periodicity_rule(self._periodicity)
+        return rule.anchored(to_stamp(self.created_at) // US_PER_DAY) if rule is not None else None
+
+    @property
+    def stamps(self) -> array:
+        """Sorted completion stamps (microseconds since 1970-01-01)."""
+        self.materialize()
+        return self._stamps
+
+    @property
+    def completions(self) -> Completions:
+        return Completions(self)
+
+    @completions.setter
+    def completions(self, values: Iterable[Union[str, datetime]]) -> None:
+        self._loader = None
+        self._stamps = array(
+            "q",
+            sorted(parse_stamp(v) if isinstance(v, str) else to_stamp(v) for v in values),
+        )
+        self._recompute_streak()
 
     def add_completion(self, ts: Optional[datetime] = None) -> None:
         if ts is None:
             ts = datetime.now()
-        self.completions.append(ts.isoformat())
+        stamp = to_stamp(ts)
+        stamps = self.stamps
+        if not stamps or stamp >= stamps[-1]:
+            stamps.append(stamp)
+            rule = self.rule
+            if rule is not None:
+                self._streak = rule.advance(self._streak, stamp)
+        else:
+            insort(stamps, stamp)
+            self._recompute_streak()
+
+    def add_stamps(self, stamps: Iterable[int]) -> None:
+        """Add many completions (as stamps) with a single streak update/rescan."""
+        new = sorted(stamps)
+        if not new:
+            return
+        self.materialize()
+        if not self._stamps or new[0] >= self._stamps[-1]:
+            self._stamps.extend(new)
+            rule = self.rule
+            if rule is not None:
+                state = self._streak
+                for stamp in new:
+                    state = rule.advance(state, stamp)
+                self._streak = state
+        else:
+            self._stamps = array("q", merge(self._stamps, new))
+            self._recompute_streak()
+
+    # --- Streak state ---
+    @property
+    def streak_state(self) -> StreakState:
+        if self._streak is None:
+            self.materialize()
+        return self._streak
+
+    @property
+    def current_streak(self) -> int:
+        """Length of the run of consecutive periods ending at the last completed one."""
+        return self.streak_state.current
+
+    @property
+    def longest_streak(self) -> int:
+        return self.streak_state.longest
+
+    @property
+    def last_period(self) -> Optional[int]:
+        """Latest completed period number (see periodicity.Periodicity)."""
+        return self.streak_state.last
+
+    def _recompute_streak(self) -> None:
+        rule = self.rule
+        self._streak = EMPTY_STREAK if rule is None else rule.scan(self._stamps)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Habit):
+            return NotImplemented
+        return (
+            self.name == other.name
+            and self.periodicity == other.periodicity
+            and self.description == other.description
+            and self.created_at == other.created_at
+            and self.is_active == other.is_active
+            and self.stamps == other.stamps
+        )
+
+    __hash__ = None  # mutable, like the former dataclass
+
+    def same_as(self, other: "Habit") -> bool:
+        """
+        Like ==, but avoids loading lazy histories when it can: if either
+        side is unloaded, equal headers, counts and saved streak states are
+        taken as equal (every app mutation changes one of them).
+        """
+        if (
+            self.name != other.name
+            or self.periodicity != other.periodicity
+            or self.description != other.description
+            or self.created_at != other.created_at
+            or self.is_active != other.is_active
+            or self.completion_count != other.completion_count
+        ):
+            return False
+        if (not self.is_loaded or not other.is_loaded) and None not in (self._streak, other._streak):
+            return self._streak == other._streak
+        return self.stamps == other.stamps
+
+    def __repr__(self) -> str:
+        return (
+            f"Habit(name={self.name!r}, periodicity={self.periodicity!r}, "
+            f"description={self.description!r}, created_at={self.created_at!r}, "
+            f"completions={self.completion_count}, is_active={self.is_active!r})"
+        )
 
     def to_dict(self) -> dict:
-        return {
+        # An unloaded habit passes its stored completions through unparsed,
+        # and leaves the streak out if it doesn't have a saved one.
+        if self._loader is not None:
+            raw = self._loader()
+            completions = format_stamps(raw) if isinstance(raw, array) else list(raw)
+        else:
+            completions = format_stamps(self._stamps)
+        record = {
             "name": self.name,
             "periodicity": self.periodicity,
             "description": self.description,
             "created_at": self.created_at.isoformat(),
-            "completions": list(self.completions),
+            "completions": completions,
             "is_active": self.is_active,
         }
+        if self._streak is not None:
+            record["streak"] = self.streak_record()
+        return record
+
+    def streak_record(self) -> dict:
+        """Streak state as stored next to the completions (see _saved_streak)."""
+        rule = self.rule
+        return {
+            **self.streak_state._asdict(),
+            "count": self.completion_count,
+            "anchor": rule.anchor if rule is not None else 0,
+        }
+
+    def _saved_streak(self, saved: Optional[dict], count: int) -> Optional[StreakState]:
+        """
+        A stored streak state if it was computed for this history (count) and
+        period layout (anchor; files without one used 0), else None.
+        """
+        rule = self.rule
+        if (
+            saved
+            and "last_day" in saved
+            and saved.get("count") == count
+            and saved.get("anchor", 0) == (rule.anchor if rule is not None else 0)
+        ):
+            return StreakState(**{k: saved[k] for k in StreakState._fields})
+        return None
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Habit":
+    def _from_header(cls, data: dict) -> "Habit":
         created_raw = data.get("created_at")
         created_at = datetime.fromisoformat(created_raw) if created_raw else datetime.now()
 
@@ -39,14 +340,27 @@ class Habit:
             periodicity=data["periodicity"],
             description=data.get("description", ""),
             created_at=created_at,
-            completions=data.get("completions", []),
             is_active=data.get("is_active", True),
         )
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "Habit":
+        habit = cls._from_header(data)
+        stamps = array("q", sorted(map(parse_stamp, data.get("completions", []))))
+        habit._stamps = stamps
+
+        # Trust the persisted streak state when it still matches the history;
+        # otherwise (older files, hand edits) fall back to a rescan.
+        saved = habit._saved_streak(data.get("streak"), len(stamps))
+        if saved is not None and saved.last_day == (stamps[-1] // US_PER_DAY if stamps else None):
+            habit._streak = saved
+        else:
+            habit._recompute_streak()
+        return habit
 
-@dataclass
-class Task:
 
+@dataclass(slots=True)
+class Task:
     title: str
     urgent: bool
     important: bool
@@ -54,6 +368,23 @@ class Task:
     due_datetime: Optional[str] = None  # store as string, e.g., "DD/MM/YY 14:30" or ISO
     created_at: datetime = field(default_factory=datetime.now)
     completed: bool = False
+    id: str = field(default_factory=new_task_id)  # stable across saves/processes
+    # Parsed once from due_datetime (None: no or unreadable due date); see utils_time.parse_due.
+    due_stamp: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.due_stamp = due_stamp(self.due_datetime)
+
+    @property
+    def due(self) -> Optional[datetime]:
+        return from_stamp(self.due_stamp) if self.due_stamp is not None else None
+
+    @property
+    def quadrant(self) -> int:
+        """Eisenhower quadrant: 1 = urgent+important, 2 = important only, 3 = urgent only, 4 = neither."""
+        if self.important:
+            return 1 if self.urgent else 2
+        return 3 if self.urgent else 4
 
     def to_dict(self) -> dict:
         return {
@@ -64,6 +395,7 @@ class Task:
             "due_datetime": self.due_datetime,
             "created_at": self.created_at.isoformat(),
             "completed": self.completed,
+            "id": self.id,
         }
 
     @classmethod
@@ -71,6 +403,10 @@ class Task:
         created_raw = data.get("created_at")
         created_at = datetime.fromisoformat(created_raw) if created_raw else datetime.now()
 
+        # Records written before tasks had ids get a deterministic one, so
+        # every process loading the same legacy file agrees on it.
+        task_id = data.get("id") or _legacy_task_id(created_raw, data["title"])
+
         return cls(
             title=data["title"],
             urgent=bool(data["urgent"]),
@@ -79,4 +415,5 @@ class Task:
             due_datetime=data.get("due_datetime"),
             created_at=created_at,
             completed=bool(data.get("completed", False)),
+            id=task_id,
         )
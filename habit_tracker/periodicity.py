@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, replace
+from datetime import date
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Sequence
+
+from habit_tracker.streaks import EMPTY_STREAK, StreakState, advance_streak, scan_streaks
+from habit_tracker.utils_time import US_PER_DAY
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_EVERY_N_DAYS = re.compile(r"^every[\s_-]*(\d+)[\s_-]*days?$")
+_N_PER_WEEK = re.compile(r"^(\d+)[\s_-]*(?:x|times)?[\s_-]*(?:per|a|/)[\s_-]*week$")
+
+SUPPORTED_PERIODICITIES = "daily, weekly, monthly, every-N-days or N-per-week"
+
+
+@dataclass(frozen=True)
+class Periodicity:
+    """
+    A habit periodicity as a mapping from completion stamps to integer
+    period numbers, where consecutive periods have consecutive numbers:
+    - unit "day":   days since `anchor` (days since 1970-01-01 of the habit's
+                    creation day), grouped by `every` (every-N-days)
+    - unit "week":  Monday-based weeks since the week of 1970-01-01
+    - unit "month": calendar months since January 1970
+
+    A period counts as completed once it has `times` distinct completion
+    days (N-per-week); otherwise one completion is enough.
+    """
+
+    unit: str
+    every: int = 1
+    times: int = 1
+    anchor: int = 0
+
+    def anchored(self, day: int) -> "Periodicity":
+        """This rule with every-N-days periods starting on `day`; other rules don't depend on it."""
+        if self.unit != "day" or self.every == 1:
+            return self
+        return _anchored(self, day % self.every)
+
+    def __str__(self) -> str:
+        if self.unit == "day":
+            return "daily" if self.every == 1 else f"every-{self.every}-days"
+        if self.unit == "week":
+            return "weekly" if self.times == 1 else f"{self.times}-per-week"
+        return "monthly"
+
+    def period_of_day(self, day: int) -> int:
+        if self.unit == "day":
+            return (day - self.anchor) // self.every
+        if self.unit == "week":
+            return (day + 3) // 7  # 1970-01-01 was a Thursday
+        d = date.fromordinal(_EPOCH_ORDINAL + day)
+        return (d.year - 1970) * 12 + d.month - 1
+
+    def periods(self, stamps: Iterable[int]) -> Iterator[int]:
+        """Completed period numbers, in order, for sorted stamps."""
+        period_of_day = self.period_of_day
+        times = self.times
+        last_day = tail = None
+        tail_days = 0
+        for stamp in stamps:
+            day = stamp // US_PER_DAY
+            if day == last_day:
+                continue
+            last_day = day
+            p = period_of_day(day)
+            if times == 1:
+                yield p
+                continue
+            if p == tail:
+                tail_days += 1
+            else:
+                tail, tail_days = p, 1
+            if tail_days == times:
+                yield p
+
+    def scan(self, stamps: Sequence[int]) -> StreakState:
+        """Full streak state for sorted stamps, in a single pass."""
+        if self.times == 1:
+            state = scan_streaks(self.periods(stamps))
+            if not stamps:
+                return state
+            day = stamps[-1] // US_PER_DAY
+            return state._replace(tail=state.last, tail_days=1, last_day=day)
+
+        state = EMPTY_STREAK
+        for stamp in stamps:
+            state = self.advance(state, stamp)
+        return state
+
+    def advance(self, state: StreakState, stamp: int) -> StreakState:
+        """O(1) update for a completion at or after the latest one in `state`."""
+        day = stamp // US_PER_DAY
+        if day == state.last_day:
+            return state
+        p = self.period_of_day(day)
+        tail_days = state.tail_days + 1 if p == state.tail else 1
+        state = state._replace(tail=p, tail_days=tail_days, last_day=day)
+        if tail_days == self.times:
+            state = advance_streak(state, p)
+        return state
+
+
+@lru_cache(maxsize=None)
+def _anchored(rule: Periodicity, anchor: int) -> Periodicity:
+    return replace(rule, anchor=anchor)
+
+
+DAILY = Periodicity("day")
+WEEKLY = Periodicity("week")
+MONTHLY = Periodicity("month")
+
+
+@lru_cache(maxsize=None)
+def parse_periodicity(text: str) -> Periodicity:
+    """Parse "daily", "weekly", "monthly", "every-N-days" or "N-per-week"."""
+    t = text.strip().lower()
+    if t == "daily":
+        return DAILY
+    if t == "weekly":
+        return WEEKLY
+    if t == "monthly":
+        return MONTHLY
+
+    m = _EVERY_N_DAYS.match(t)
+    if m and int(m.group(1)) >= 1:
+        return Periodicity("day", every=int(m.group(1)))
+
+    m = _N_PER_WEEK.match(t)
+    if m and 1 <= int(m.group(1)) <= 7:
+        return Periodicity("week", times=int(m.group(1)))
+
+    raise ValueError(f"Periodicity must be {SUPPORTED_PERIODICITIES}.")
+
+
+def periodicity_rule(text: str) -> Optional[Periodicity]:
+    """Like parse_periodicity, but None for unknown values (e.g. legacy data)."""
+    try:
+        return parse_periodicity(text)
+    except ValueError:
+        return None
+
+
+def normalize_periodicity(text: str) -> str:
+    """Canonical spelling of a periodicity; raises ValueError if unsupported."""
+    return str(parse_periodicity(text))
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from itertools import count, islice
+from typing import Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from habit_tracker.models import Habit, Task, new_task_id
+
+T = TypeVar("T")
+
+
+def name_key(name: str) -> str:
+    """Normalized habit name used for lookups (case/whitespace-insensitive)."""
+    return name.strip().lower()
+
+
+def _remove_same(items: List[T], obj: T) -> None:
+    # By identity: two distinct habits may compare equal.
+    for i, other in enumerate(items):
+        if other is obj:
+            del items[i]
+            return
+
+
+class _Bucket(Generic[T]):
+    """Insertion-ordered set of objects (by identity) - one secondary index entry."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self) -> None:
+        self._items: Dict[int, T] = {}
+
+    def add(self, obj: T) -> None:
+        self._items[id(obj)] = obj
+
+    def discard(self, obj: T) -> None:
+        self._items.pop(id(obj), None)
+
+    def values(self) -> List[T]:
+        return list(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class HabitRepository:
+    """
+    In-memory habit store with indexes kept consistent on every mutation:
+    - normalized name -> habits (O(1) get)
+    - periodicity -> habits
+    - is_active -> habits
+
+    Iteration and all() keep insertion order; index listings keep the
+    order in which habits entered that index. Habits must be re-indexed
+    (reindex()) when their name, periodicity or is_active change.
+    """
+
+    def __init__(self, habits: Iterable[Habit] = ()) -> None:
+        self.replace_all(habits)
+
+    def replace_all(self, habits: Iterable[Habit]) -> None:
+        self._items: Dict[int, Habit] = {}
+        # Lists only to tolerate legacy files with duplicate names; the first wins.
+        self._by_name: Dict[str, List[Habit]] = {}
+        self._by_periodicity: Dict[str, _Bucket[Habit]] = {}
+        self._by_active: Dict[bool, _Bucket[Habit]] = {True: _Bucket(), False: _Bucket()}
+        for h in habits:
+            self.add(h)
+
+    def add(self, habit: Habit) -> None:
+        self._items[id(habit)] = habit
+        self._index(habit)
+
+    def remove(self, habit: Habit) -> None:
+        if self._items.pop(id(habit), None) is None:
+            raise ValueError("Habit not found.")
+        self._unindex(habit)
+
+    def reindex(self, habit: Habit, old_name: str, old_periodicity: str, old_active: bool) -> None:
+        """Update the secondary indexes after a habit's indexed fields changed."""
+        same = self._by_name.get(name_key(old_name), [])
+        _remove_same(same, habit)
+        if not same:
+            self._by_name.pop(name_key(old_name), None)
+        bucket = self._by_periodicity.get(old_periodicity)
+        if bucket is not None:
+            bucket.discard(habit)
+        self._by_active[bool(old_active)].discard(habit)
+        self._index(habit)
+
+    # --- Lookups ---
+    def get(self, name: str) -> Optional[Habit]:
+        same = self._by_name.get(name_key(name))
+        return same[0] if same else None
+
+    def all(self) -> List[Habit]:
+        return list(self._items.values())
+
+    def by_periodicity(self, periodicity: str) -> List[Habit]:
+        bucket = self._by_periodicity.get(periodicity)
+        return bucket.values() if bucket is not None else []
+
+    def by_active(self, active: bool = True) -> List[Habit]:
+        return self._by_active[bool(active)].values()
+
+    def __iter__(self) -> Iterator[Habit]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # --- Index maintenance ---
+    def _index(self, habit: Habit) -> None:
+        self._by_name.setdefault(name_key(habit.name), []).append(habit)
+        self._by_periodicity.setdefault(habit.periodicity, _Bucket()).add(habit)
+        self._by_active[bool(habit.is_active)].add(habit)
+
+    def _unindex(self, habit: Habit) -> None:
+        key = name_key(habit.name)
+        same = self._by_name[key]
+        _remove_same(same, habit)
+        if not same:
+            del self._by_name[key]
+        bucket = self._by_periodicity[habit.periodicity]
+        bucket.discard(habit)
+        if not len(bucket):
+            del self._by_periodicity[habit.periodicity]
+        self._by_active[bool(habit.is_active)].discard(habit)
+
+
+class TaskRepository:
+    """
+    In-memory task store keyed by Task.id, with quadrant (1-4) and
+    completed indexes kept consistent on every mutation. Keeps insertion
+    order.
+
+    Open tasks with a due date are also kept in a list sorted by
+    (due_stamp, insertion seq), so deadline queries are a bisect away.
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()) -> None:
+        self.replace_all(tasks)
+
+    def replace_all(self, tasks: Iterable[Task]) -> int:
+        """Replace the content; returns how many tasks needed a fresh id (duplicates)."""
+        self._items: Dict[str, Task] = {}
+        self._by_quadrant: Dict[int, _Bucket[Task]] = {q: _Bucket() for q in (1, 2, 3, 4)}
+        self._by_completed: Dict[bool, _Bucket[Task]] = {True: _Bucket(), False: _Bucket()}
+        self._due: List[Tuple[int, int, Task]] = []
+        self._due_keys: Dict[str, Tuple[int, int]] = {}
+        self._seq = count()
+        reassigned = 0
+        for t in tasks:
+            if t.id in self._items:
+                t.id = new_task_id()
+                reassigned += 1
+            self.add(t)
+        return reassigned
+
+    def add(self, task: Task) -> None:
+        if task.id in self._items:
+            raise ValueError("A task with this id already exists.")
+        self._items[task.id] = task
+        self._by_quadrant[task.quadrant].add(task)
+        self._by_completed[bool(task.completed)].add(task)
+        if not task.completed:
+            self._index_due(task)
+
+    def remove(self, task: Task) -> None:
+        if self._items.pop(task.id, None) is None:
+            raise ValueError("Task not found.")
+        self._by_quadrant[task.quadrant].discard(task)
+        self._by_completed[bool(task.completed)].discard(task)
+        self._unindex_due(task)
+
+    def set_completed(self, task: Task, completed: bool = True) -> None:
+        self._by_completed[bool(task.completed)].discard(task)
+        task.completed = completed
+        self._by_completed[bool(completed)].add(task)
+        if completed:
+            self._unindex_due(task)
+        elif task.id not in self._due_keys:
+            self._index_due(task)
+
+    # --- Lookups ---
+    def get(self, task_id: str) -> Optional[Task]:
+        return self._items.get(task_id)
+
+    def at(self, index: int) -> Task:
+        """Task by 1-based position (as shown in the CLI/GUI lists)."""
+        if index < 1 or index > len(self._items):
+            raise ValueError("Invalid task number.")
+        return next(islice(self._items.values(), index - 1, None))
+
+    def all(self) -> List[Task]:
+        return list(self._items.values())
+
+    def by_quadrant(self, quadrant: int) -> List[Task]:
+        return self._by_quadrant[quadrant].values()
+
+    def by_completed(self, completed: bool) -> List[Task]:
+        return self._by_completed[bool(completed)].values()
+
+    def due_between(self, start: Optional[int], end: Optional[int]) -> List[Task]:
+        """Open tasks with start <= due_stamp < end (None: unbounded), earliest first."""
+        due = self._due
+        lo = 0 if start is None else bisect_left(due, (start,))
+        hi = len(due) if end is None else bisect_left(due, (end,))
+        return [entry[2] for entry in due[lo:hi]]
+
+    def next_due(self, start: Optional[int] = None) -> Optional[Task]:
+        """Earliest-due open task with due_stamp >= start."""
+        due = self._due
+        i = 0 if start is None else bisect_left(due, (start,))
+        return due[i][2] if i < len(due) else None
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self._items.values())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # --- Due index maintenance ---
+    def _index_due(self, task: Task) -> None:
+        if task.due_stamp is None:
+            return
+        key = (task.due_stamp, next(self._seq))
+        self._due_keys[task.id] = key
+        insort(self._due, (*key, task))
+
+    def _unindex_due(self, task: Task) -> None:
+        key = self._due_keys.pop(task.id, None)
+        if key is not None:
+            i = bisect_left(self._due, key)
+            del self._due[i]
+
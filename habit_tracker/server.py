@@ -0,0 +1,339 @@
+"""
+Local HTTP/JSON API over one long-lived ThreadSafeHabitTracker.
+
+    python -m habit_tracker serve --port 8000
+
+Routes (JSON bodies in and out):
+    GET    /habits[?periodicity=daily&active=true]
+    POST   /habits                    {"name", "periodicity", "description"}
+    GET    /habits/<name>
+    DELETE /habits/<name>
+    POST   /habits/<name>/checkoff    {"ts": ISO timestamp} (optional)
+    GET    /habits/<name>/stats
+    GET    /analytics/longest
+    GET    /tasks[?quadrant=1&completed=false]
+    POST   /tasks                     {"title", "urgent", "important", "description", "due"}
+    GET    /tasks/due
+    POST   /tasks/<id>/complete
+    DELETE /tasks/<id>
+
+GET responses carry an ETag made of the tracker version counters they
+depend on (habits_version, tasks_version, habit_version(name)), prefixed
+with an epoch picked at startup: the counters restart on every load, so
+an ETag from an earlier run never matches. A matching If-None-Match gets
+a 304 before anything is computed, and rendered bodies are reused until
+those versions move. Writes other processes (e.g. the CLI) make are
+merged in by a refresh() at most every REFRESH_INTERVAL seconds, before
+a GET reads. Connections are HTTP/1.1 keep-alive, one thread each
+(ThreadingHTTPServer).
+"""
+from __future__ import annotations
+
+import json
+import secrets
+import sys
+import time
+import traceback
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from habit_tracker.analytics import habit_stats, longest_streak_overall_with_habit
+from habit_tracker.models import Habit, Task
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.threadsafe import ThreadSafeHabitTracker, TrackerSnapshot
+
+
+class Response(NamedTuple):
+    status: int
+    body: bytes = b""
+    etag: Optional[str] = None
+
+
+class NotFound(ValueError):
+    pass
+
+
+def _json(value: object) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _habit_json(h: Habit, detail: bool = False) -> dict:
+    data = {
+        "name": h.name,
+        "periodicity": h.periodicity,
+        "description": h.description,
+        "created_at": h.created_at.isoformat(),
+        "is_active": h.is_active,
+        "completion_count": h.completion_count,
+        "longest_streak": h.longest_streak,
+    }
+    if detail:
+        data["completions"] = list(h.completions)
+    return data
+
+
+def _task_json(t: Task) -> dict:
+    return {**t.to_dict(), "quadrant": t.quadrant}
+
+
+def _str(payload: dict, name: str, default: Optional[str] = "") -> Optional[str]:
+    value = payload.get(name, default)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"'{name}' must be a string.")
+    return value
+
+
+def _bool(payload: dict, name: str) -> bool:
+    value = payload.get(name, False)
+    if not isinstance(value, bool):
+        raise ValueError(f"'{name}' must be true or false.")
+    return value
+
+
+def _flag(query: Dict[str, List[str]], name: str) -> Optional[bool]:
+    raw = query.get(name, [None])[0]
+    if raw is None:
+        return None
+    if raw.lower() in {"1", "true", "yes"}:
+        return True
+    if raw.lower() in {"0", "false", "no"}:
+        return False
+    raise ValueError(f"'{name}' must be true or false.")
+
+
+# A GET resource: (version tag, render) from a snapshot; tag None means "not cacheable".
+Resource = Tuple[Optional[str], Callable[[], object]]
+
+
+class TrackerAPI:
+    """Routing and caching, independent of the HTTP plumbing (see TrackerHTTPServer)."""
+
+    MAX_CACHED = 1024
+    REFRESH_INTERVAL = 1.0  # seconds between checks for other processes' writes
+
+    def __init__(self, tracker: ThreadSafeHabitTracker) -> None:
+        self.tracker = tracker
+        self._epoch = secrets.token_hex(4)
+        self._bodies: Dict[str, Tuple[str, bytes]] = {}  # path?query -> (etag, rendered body)
+        self._refreshed_at = time.monotonic()
+
+    def handle(self, method: str, target: str, body: bytes = b"", if_none_match: Optional[str] = None) -> Response:
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        query = parse_qs(url.query)
+        try:
+            if method in ("GET", "HEAD"):
+                return self._get(target, parts, query, if_none_match)
+            payload = json.loads(body) if body else {}
+            if not isinstance(payload, dict):
+                raise ValueError("Request body must be a JSON object.")
+            return self._write(method, parts, payload)
+        except NotFound as e:
+            return Response(404, _json({"error": str(e)}))
+        except json.JSONDecodeError:
+            return Response(400, _json({"error": "Request body is not valid JSON."}))
+        except ValueError as e:
+            status = 404 if str(e).endswith("not found.") else 400
+            return Response(status, _json({"error": str(e)}))
+
+    # --- Reads ---
+    def _get(self, target: str, parts: List[str], query: Dict[str, List[str]], if_none_match: Optional[str]) -> Response:
+        now = time.monotonic()
+        if now - self._refreshed_at >= self.REFRESH_INTERVAL:
+            self._refreshed_at = now  # racing threads may both refresh: harmless
+            self.tracker.refresh()
+        snap = self.tracker.snapshot()
+        etag, render = self._resource(snap, parts, query)
+        if etag is None:
+            return Response(200, _json(render()))
+        etag = f'"{self._epoch}-{etag}"'
+        if if_none_match is not None and etag in {t.strip() for t in if_none_match.split(",")}:
+            return Response(304, etag=etag)
+        cached = self._bodies.get(target)
+        if cached is not None and cached[0] == etag:
+            return Response(200, cached[1], etag)
+        body = _json(render())
+        if len(self._bodies) >= self.MAX_CACHED:
+            self._bodies.clear()
+        self._bodies[target] = (etag, body)
+        return Response(200, body, etag)
+
+    def _resource(self, snap: TrackerSnapshot, parts: List[str], query: Dict[str, List[str]]) -> Resource:
+        if parts == ["habits"]:
+            periodicity = query.get("periodicity", [None])[0]
+            active = _flag(query, "active")
+
+            def habits() -> list:
+                found = snap.list_habits_by_periodicity(periodicity) if periodicity else snap.list_habits()
+                return [_habit_json(h) for h in found if active is None or h.is_active == active]
+
+            return f"h{snap.habits_version}", habits
+
+        if len(parts) in (2, 3) and parts[0] == "habits":
+            habit = snap.get_habit_by_name(parts[1])
+            if habit is None:
+                raise NotFound("Habit not found.")
+            # Per-URL tags: the habit's version alone tells its states apart
+            # (versions come from the tracker-wide clock).
+            version = snap.habit_version(habit.name)
+            if len(parts) == 2:
+                return f"h{version}", lambda: _habit_json(habit, detail=True)
+            if parts[2] == "stats":
+                today = date.today()  # current streak depends on the day too
+                return f"h{version}-{today.isoformat()}", lambda: habit_stats(habit, today)._asdict()
+
+        if parts == ["analytics", "longest"]:
+
+            def longest() -> dict:
+                best = longest_streak_overall_with_habit(snap.list_habits())
+                return {"habit": best[0], "streak": best[1]} if best else {"habit": None, "streak": 0}
+
+            return f"h{snap.habits_version}", longest
+
+        if parts == ["tasks"]:
+            quadrant = query.get("quadrant", [None])[0]
+            completed = _flag(query, "completed")
+
+            def tasks() -> list:
+                found = snap.list_tasks_by_quadrant(int(quadrant)) if quadrant else snap.list_tasks()
+                return [_task_json(t) for t in found if completed is None or t.completed == completed]
+
+            if quadrant is not None and not quadrant.isdigit():
+                raise ValueError("Quadrant must be 1, 2, 3, or 4.")
+            return f"t{snap.tasks_version}", tasks
+
+        if parts == ["tasks", "due"]:
+            # Depends on the clock as well: not cached.
+            return None, lambda: {
+                "overdue": [_task_json(t) for t in snap.overdue_tasks()],
+                "upcoming": [_task_json(t) for t in snap.upcoming_tasks()],
+            }
+
+        raise NotFound("No such resource.")
+
+    # --- Writes ---
+    def _write(self, method: str, parts: List[str], payload: dict) -> Response:
+        t = self.tracker
+        if method == "POST" and parts == ["habits"]:
+            habit = t.create_habit(
+                name=_str(payload, "name"),
+                periodicity=_str(payload, "periodicity", "daily"),
+                description=_str(payload, "description"),
+            )
+            return Response(201, _json(_habit_json(habit)))
+
+        if method == "POST" and len(parts) == 3 and parts[0] == "habits" and parts[2] == "checkoff":
+            raw = _str(payload, "ts", None)
+            try:
+                ts = datetime.fromisoformat(raw) if raw else None
+            except ValueError:
+                raise ValueError("'ts' must be an ISO timestamp.") from None
+            t.check_off(parts[1], ts)
+            return Response(200, _json({"habit": parts[1], "version": t.habit_version(parts[1])}))
+
+        if method == "DELETE" and len(parts) == 2 and parts[0] == "habits":
+            t.delete_habit(parts[1])
+            return Response(204)
+
+        if method == "POST" and parts == ["tasks"]:
+            task = t.create_task(
+                title=_str(payload, "title"),
+                urgent=_bool(payload, "urgent"),
+                important=_bool(payload, "important"),
+                description=_str(payload, "description"),
+                due_datetime=_str(payload, "due", None),
+            )
+            return Response(201, _json(_task_json(task)))
+
+        if method == "POST" and len(parts) == 3 and parts[0] == "tasks" and parts[2] == "complete":
+            return Response(200, _json(_task_json(t.complete_task(parts[1]))))
+
+        if method == "DELETE" and len(parts) == 2 and parts[0] == "tasks":
+            t.remove_task(parts[1])
+            return Response(204)
+
+        raise NotFound("No such resource.")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    server: "TrackerHTTPServer"
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_HEAD(self) -> None:
+        self._dispatch("HEAD")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str) -> None:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.send_error(400, "Invalid Content-Length")
+            return
+        body = self.rfile.read(length) if length > 0 else b""
+        try:
+            response = self.server.api.handle(method, self.path, body, self.headers.get("If-None-Match"))
+        except Exception:
+            # A bug, or storage trouble: answer instead of dropping the connection.
+            self.log_error("%s %s failed:\n%s", method, self.path, traceback.format_exc())
+            response = Response(500, _json({"error": "Internal server error."}))
+
+        self.send_response(response.status)
+        if response.etag is not None:
+            self.send_header("ETag", response.etag)
+            self.send_header("Cache-Control", "no-cache")  # always revalidate; 304s are cheap
+        if response.status != 304:
+            if response.body:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if response.body and method != "HEAD":
+            self.wfile.write(response.body)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format: str, *args) -> None:
+        # Logged even when quiet.
+        sys.stderr.write(f"{self.address_string()} - - [{self.log_date_time_string()}] {format % args}\n")
+
+
+class TrackerHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], tracker: ThreadSafeHabitTracker, verbose: bool = False) -> None:
+        super().__init__(address, _Handler)
+        self.api = TrackerAPI(tracker)
+        self.verbose = verbose
+
+
+def serve(
+    storage: JsonStorage,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    write_behind: Optional[float] = None,
+    verbose: bool = True,
+) -> int:
+    tracker = ThreadSafeHabitTracker(storage=storage, write_behind=write_behind)
+    tracker.load()
+    server = TrackerHTTPServer((host, port), tracker, verbose=verbose)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        tracker.close()
+    return 0
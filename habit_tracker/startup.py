@@ -0,0 +1,85 @@
+"""
+--profile-startup: re-run the same command in a fresh interpreter under
+CPython's -X importtime and report where the cold start went.
+
+Entry points import the GUI, fixtures and analytics lazily, so a
+scripted command only loads the tracker, its storage and argparse.
+CLI_BUDGET_MS is the cold import budget for those commands; the report
+says when a change pushes startup over it.
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from typing import IO, List, NamedTuple, Optional, Sequence, Tuple
+
+CLI_BUDGET_MS = 100.0  # -X importtime total for `list`; measured ~80 ms
+
+# Only ever imported on demand; seeing one in a CLI start is a regression.
+LAZY_MODULES = (
+    "tkinter",
+    "habit_tracker.gui",
+    "habit_tracker.fixtures",
+    "habit_tracker.analytics_cache",
+    "habit_tracker.analytics_vectorized",
+    "numpy",
+)
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 for modules imported directly by the program
+
+
+def parse_importtime(lines: Sequence[str]) -> Tuple[List[ImportTime], List[str]]:
+    """Split stderr into -X importtime records and everything else."""
+    records, other = [], []
+    for line in lines:
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:  # the header line
+            continue
+        name = fields[2].rstrip("\n")
+        stripped = name.lstrip(" ")
+        records.append(ImportTime(stripped, self_us, cumulative_us, (len(name) - len(stripped) - 1) // 2))
+    return records, other
+
+
+def report(records: List[ImportTime], wall_s: float, out: IO[str], top: int = 15) -> None:
+    total_ms = sum(r.cumulative_us for r in records if r.depth == 0) / 1000
+    status = "over" if total_ms > CLI_BUDGET_MS else "within"
+    print(
+        f"startup: {total_ms:.1f} ms importing {len(records)} modules, {wall_s * 1000:.1f} ms wall "
+        f"({status} the {CLI_BUDGET_MS:.0f} ms CLI import budget)",
+        file=out,
+    )
+    print(f"{'self ms':>9} {'total ms':>9}  module", file=out)
+    for r in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+        print(f"{r.self_us / 1000:9.1f} {r.cumulative_us / 1000:9.1f}  {r.module}", file=out)
+    lazy = sorted({r.module for r in records if r.module.split(".")[0] in LAZY_MODULES or r.module in LAZY_MODULES})
+    if lazy:
+        print(f"loaded on this path: {', '.join(lazy)}", file=out)
+
+
+def profile_startup(argv: Sequence[str], err: Optional[IO[str]] = None) -> int:
+    """Run `python -m habit_tracker argv` under -X importtime; returns its exit status."""
+    err = err or sys.stderr
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "habit_tracker", *argv],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall_s = time.perf_counter() - start
+    records, other = parse_importtime(proc.stderr.splitlines())
+    for line in other:
+        print(line, file=err)
+    report(records, wall_s, err)
+    return proc.returncode
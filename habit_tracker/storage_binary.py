@@ -0,0 +1,203 @@
+"""
+Columnar binary snapshot format (read-mostly analytics over big histories).
+
+Layout (all integers little-endian):
+
+    magic    8 bytes   b"HTSNAP\\0\\0"
+    version  uint32    FORMAT_VERSION
+    length   uint32    size of the JSON header in bytes
+    header   JSON      {"habits": [...], "tasks": [...]}, padded with spaces
+                       so the column starts on an 8-byte boundary
+    column   int64[]   every habit's completion stamps (see utils_time),
+                       habit after habit, each run sorted
+
+Each habit entry is its to_dict() record without "completions", plus
+"offset" and "count" into the column. Opening a snapshot maps the file, so
+a habit's stamps are a zero-copy slice of one memoryview.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+from habit_tracker.models import Habit, Task
+from habit_tracker.storage_json import JsonStorage, atomic_open, write_json_stream
+from habit_tracker.utils_time import format_stamps
+
+MAGIC = b"HTSNAP\0\0"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<8sII")
+_NATIVE_LE = sys.byteorder == "little"
+
+
+def _habit_header(habit: Habit, offset: int) -> dict:
+    return {
+        "name": habit.name,
+        "periodicity": habit.periodicity,
+        "description": habit.description,
+        "created_at": habit.created_at.isoformat(),
+        "is_active": habit.is_active,
+        "streak": habit.streak_record(),
+        "offset": offset,
+        "count": habit.completion_count,
+    }
+
+
+def write_snapshot(path: Union[str, Path], habits: Iterable[Habit], tasks: Iterable[Task]) -> None:
+    """Write habits and tasks as a binary snapshot (atomically)."""
+    habits = list(habits)
+    entries = []
+    offset = 0
+    for habit in habits:
+        entries.append(_habit_header(habit, offset))
+        offset += habit.completion_count
+
+    header = json.dumps(
+        {"habits": entries, "tasks": [t.to_dict() for t in tasks]}, separators=(",", ":")
+    ).encode("utf-8")
+    header += b" " * (-(_PREFIX.size + len(header)) % 8)
+
+    with atomic_open(Path(path), "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for habit in habits:
+            stamps = habit.stamps
+            if not _NATIVE_LE:
+                stamps = array("q", stamps)
+                stamps.byteswap()
+            f.write(stamps.tobytes())
+
+
+class BinarySnapshot:
+    """
+    A memory-mapped snapshot. `column` is the int64 completion column;
+    view(i) / view_of(name) are zero-copy slices of it. Views must be
+    released before close().
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, length = _PREFIX.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise ValueError("Not a habit tracker snapshot.")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported snapshot version {version} (expected {FORMAT_VERSION}).")
+            start = _PREFIX.size + length
+            header = json.loads(self._mmap[_PREFIX.size:start].decode("utf-8"))
+        except (struct.error, ValueError):
+            self._mmap.close()
+            raise
+
+        self.habits: List[dict] = header["habits"]
+        self.tasks: List[dict] = header["tasks"]
+        self._bytes = memoryview(self._mmap)[start:]
+        self.column = self._bytes.cast("q")
+        self._index = {h["name"].strip().lower(): i for i, h in enumerate(self.habits)}
+
+    def view(self, i: int) -> memoryview:
+        """Stamps of the i-th habit, without copying (native little-endian only)."""
+        if not _NATIVE_LE:
+            raise ValueError("Zero-copy views need a little-endian machine; use stamps() instead.")
+        entry = self.habits[i]
+        return self.column[entry["offset"]:entry["offset"] + entry["count"]]
+
+    def view_of(self, name: str) -> Optional[memoryview]:
+        i = self._index.get(name.strip().lower())
+        return None if i is None else self.view(i)
+
+    def stamps(self, i: int) -> array:
+        """A copy of the i-th habit's stamps as array('q')."""
+        entry = self.habits[i]
+        out = array("q")
+        out.frombytes(self._bytes[entry["offset"] * 8:(entry["offset"] + entry["count"]) * 8])
+        if not _NATIVE_LE:
+            out.byteswap()
+        return out
+
+    def close(self) -> None:
+        self.column.release()
+        self._bytes.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "BinarySnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class BinaryStorage:
+    """
+    Storage with the load()/save() contract backed by a binary snapshot.
+
+    lazy=True returns header-only habits whose stamps are copied out of the
+    mapped column on first use; the mapping stays open until the next
+    load()/save() or close().
+    """
+
+    def __init__(self, file_path: str = "data.htsnap", lazy: bool = False) -> None:
+        self.path = Path(file_path)
+        self.lazy = lazy
+        self._snapshot: Optional[BinarySnapshot] = None
+
+    def load(self) -> Tuple[List[Habit], List[Task]]:
+        self.close()
+        if not self.path.exists():
+            return [], []
+
+        snapshot = BinarySnapshot(self.path)
+        habits = [
+            Habit.lazy(entry, entry["count"], lambda i=i: snapshot.stamps(i))
+            for i, entry in enumerate(snapshot.habits)
+        ]
+        tasks = [Task.from_dict(t) for t in snapshot.tasks]
+        if self.lazy:
+            self._snapshot = snapshot
+        else:
+            for habit in habits:
+                habit.materialize()
+            snapshot.close()
+        return habits, tasks
+
+    def save(self, habits: List[Habit], tasks: List[Task]) -> None:
+        self.save_iter(habits, tasks)
+
+    def save_iter(self, habits: Iterable[Habit], tasks: Iterable[Task]) -> None:
+        habits = list(habits)
+        if self._snapshot is not None:
+            # Unloaded habits still read from the current mapping.
+            for habit in habits:
+                habit.materialize()
+            self.close()
+        write_snapshot(self.path, habits, tasks)
+
+    def close(self) -> None:
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+
+# --- Conversion to / from the data.json layout ---
+
+def json_to_binary(json_path: Union[str, Path], binary_path: Union[str, Path]) -> None:
+    habits, tasks = JsonStorage(file_path=str(json_path)).load()
+    write_snapshot(binary_path, habits, tasks)
+
+
+def binary_to_json(binary_path: Union[str, Path], json_path: Union[str, Path]) -> None:
+    with BinarySnapshot(binary_path) as snapshot:
+        def habit_records():
+            for i, entry in enumerate(snapshot.habits):
+                record = {k: v for k, v in entry.items() if k not in ("offset", "count")}
+                record["completions"] = format_stamps(snapshot.stamps(i))
+                yield record
+
+        write_json_stream(Path(json_path), habit_records(), iter(snapshot.tasks))
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from habit_tracker.locking import file_signature
+from habit_tracker.models import Habit, Task
+from habit_tracker.storage_json import JsonStorage, write_json_stream
+from habit_tracker.utils_time import parse_stamp
+
+
+class JournalStorage(JsonStorage):
+    """
+    Snapshot + append-only log storage:
+    - the snapshot file uses the same layout as JsonStorage (plus a "journal_seq" key)
+    - every mutation appends one small JSON record to "<file>.log"
+    - load() replays the log on top of the snapshot
+    - save() writes a fresh snapshot and truncates the log (compaction)
+    """
+
+    def __init__(self, file_path: str = "data.json", compact_after_bytes: int = 1_000_000, lazy: bool = False) -> None:
+        super().__init__(file_path=file_path, lazy=lazy)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.compact_after_bytes = compact_after_bytes
+        self._seq = 0
+
+    # ----------------------------
+    # Storage contract
+    # ----------------------------
+    def load(self) -> Tuple[List[Habit], List[Task]]:
+        with self._lock:
+            return self._load()
+
+    def _load(self) -> Tuple[List[Habit], List[Task]]:
+        habits: List[Habit] = []
+        tasks: List[Task] = []
+        self._seq = 0
+
+        if self.path.exists():
+            raw = self._read_payload()
+            habits, tasks = self._from_payload(raw)
+            self._seq = int(raw.get("journal_seq", 0))
+
+        # Records already folded into the snapshot (crash between
+        # snapshot write and log truncation) are skipped.
+        pending = [r for r in self._read_log() if int(r.get("seq", 0)) > self._seq]
+        replay(habits, tasks, pending)
+        if pending:
+            self._seq = int(pending[-1]["seq"])
+
+        return habits, tasks
+
+    def save(self, habits: List[Habit], tasks: List[Task]) -> None:
+        with self._lock:
+            payload = self._to_payload(habits, tasks)
+            payload["journal_seq"] = self._seq
+            self._write_payload(payload)
+            self.log_path.write_text("", encoding="utf-8")
+
+    def save_iter(self, habits: Iterable[Habit], tasks: Iterable[Task]) -> None:
+        with self._lock:
+            write_json_stream(
+                self.path,
+                (h.to_dict() for h in habits),
+                (t.to_dict() for t in tasks),
+                extra={"journal_seq": self._seq},
+            )
+            self.log_path.write_text("", encoding="utf-8")
+
+    # ----------------------------
+    # Journal API (used by HabitTracker)
+    # ----------------------------
+    def append(self, op: str, data: dict) -> None:
+        self._seq += 1
+        record = {"seq": self._seq, "op": op, **data}
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock, self.log_path.open("a+b") as f:
+            _drop_torn_tail(f)
+            f.write(line)
+
+    def signature(self) -> object:
+        return file_signature(self.path), file_signature(self.log_path)
+
+    def needs_compaction(self) -> bool:
+        try:
+            return self.log_path.stat().st_size > self.compact_after_bytes
+        except FileNotFoundError:
+            return False
+
+    def _read_log(self) -> List[dict]:
+        if not self.log_path.exists():
+            return []
+
+        records = []
+        with self.log_path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A torn final line from an interrupted append (the next
+                    # append cuts it off, see _drop_torn_tail).
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    break
+        return records
+
+
+def _drop_torn_tail(f) -> None:
+    """Truncate an unterminated last line, so the next record starts on a line of its own."""
+    end = f.seek(0, os.SEEK_END)
+    if not end:
+        return
+    f.seek(end - 1)
+    if f.read(1) == b"\n":
+        return
+    f.seek(0)
+    f.truncate(f.read().rfind(b"\n") + 1)
+
+
+def replay(habits: List[Habit], tasks: List[Task], records: Iterable[dict]) -> None:
+    """Apply journal records, in order, to in-memory habit/task lists (in place)."""
+    by_name: Dict[str, Habit] = {h.name.strip().lower(): h for h in habits}
+    by_id: Dict[str, Task] = {t.id: t for t in tasks}
+
+    for record in records:
+        op = record["op"]
+
+        if op == "habit_add":
+            habit = Habit.from_dict(record["habit"])
+            habits.append(habit)
+            by_name[habit.name.strip().lower()] = habit
+
+        elif op == "habit_delete":
+            habit = by_name.pop(record["name"].strip().lower(), None)
+            if habit is not None:
+                habits.remove(habit)
+
+        elif op == "check_off":
+            habit = by_name.get(record["name"].strip().lower())
+            if habit is not None:
+                habit.add_completion(datetime.fromisoformat(record["ts"]))
+
+        elif op == "completions_add":
+            habit = by_name.get(record["name"].strip().lower())
+            if habit is not None:
+                habit.add_stamps(parse_stamp(ts) for ts in record["ts"])
+
+        elif op == "habit_active":
+            habit = by_name.get(record["name"].strip().lower())
+            if habit is not None:
+                habit.is_active = bool(record["active"])
+
+        elif op == "habits_replace":
+            habits[:] = [Habit.from_dict(h) for h in record["habits"]]
+            by_name = {h.name.strip().lower(): h for h in habits}
+
+        elif op == "task_add":
+            task = Task.from_dict(record["task"])
+            tasks.append(task)
+            by_id[task.id] = task
+
+        elif op == "task_complete":
+            task = _task_for(record, tasks, by_id)
+            if task is not None:
+                task.completed = True
+
+        elif op == "task_delete":
+            task = _task_for(record, tasks, by_id)
+            if task is not None:
+                by_id.pop(task.id, None)
+                tasks[:] = [t for t in tasks if t is not task]
+
+        else:
+            raise ValueError(f"Unknown journal record: {op!r}")
+
+
+def _task_for(record: dict, tasks: List[Task], by_id: Dict[str, Task]) -> Optional[Task]:
+    if "id" in record:
+        return by_id.get(record["id"])
+    # Logs written before tasks had ids address them by 1-based position.
+    index = record["index"]
+    return tasks[index - 1] if 1 <= index <= len(tasks) else None
@@ -1,38 +1,145 @@
 from __future__ import annotations
 
 import json
+import os
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
-from typing import List, Tuple
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
 
+from habit_tracker.locking import FileLock, file_signature, lock_path_for
 from habit_tracker.models import Habit, Task
 
 
+@contextmanager
+def atomic_open(path: Path, mode: str = "w") -> Iterator[IO]:
+    """
+    Open a temp file in the same directory as path for writing and rename
+    it over path on success, so readers (and a crash mid-write) never see
+    a half-written file.
+    """
+    import tempfile  # only needed to write; keeps read-only startups lighter
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    with atomic_open(path, "wb") as f:
+        f.write(data)
+
+
+def write_json_stream(
+    path: Path,
+    habit_records: Iterable[dict],
+    task_records: Iterable[dict],
+    extra: Optional[dict] = None,
+) -> None:
+    """
+    Write a data.json-layout file one record at a time (atomically), so the
+    full payload is never held in memory.
+    """
+    with atomic_open(path, "w") as f:
+        f.write("{")
+        for key, value in (extra or {}).items():
+            f.write(f"\n  {json.dumps(key)}: {json.dumps(value)},")
+        for section, records in (("habits", habit_records), ("tasks", task_records)):
+            if section == "tasks":
+                f.write(",")
+            f.write(f'\n  "{section}": [')
+            sep = "\n    "
+            for record in records:
+                f.write(sep)
+                f.write(json.dumps(record))
+                sep = ",\n    "
+            f.write("\n  ]")
+        f.write("\n}\n")
+
+
+def _split_lines(joined: str) -> List[str]:
+    return joined.split("\n") if joined else []
+
+
 class JsonStorage:
-    def __init__(self, file_path: str = "data.json") -> None:
+    def __init__(self, file_path: str = "data.json", lazy: bool = False) -> None:
         self.path = Path(file_path)
+        # lazy: habits load as headers and parse their completions on first
+        # use (see Habit.lazy); saving an untouched habit skips parsing entirely.
+        self.lazy = lazy
+        # Serializes reads/writes with other processes using the same file.
+        self._lock = FileLock(lock_path_for(self.path))
 
     # ----------------------------
     # New API (habits + tasks)
     # ----------------------------
     def load(self) -> Tuple[List[Habit], List[Task]]:
-        if not self.path.exists():
-            return [], []
+        with self._lock:
+            if not self.path.exists():
+                return [], []
+            return self._from_payload(self._read_payload())
+
+    def save(self, habits: List[Habit], tasks: List[Task]) -> None:
+        with self._lock:
+            self._write_payload(self._to_payload(habits, tasks))
 
-        raw = json.loads(self.path.read_text(encoding="utf-8"))
+    def save_iter(self, habits: Iterable[Habit], tasks: Iterable[Task]) -> None:
+        """Like save(), but streams habits/tasks from iterables (e.g. generators)."""
+        with self._lock:
+            write_json_stream(self.path, (h.to_dict() for h in habits), (t.to_dict() for t in tasks))
+
+    # ----------------------------
+    # Multi-process support (used by HabitTracker)
+    # ----------------------------
+    def lock(self) -> FileLock:
+        """The advisory lock held around every read and write of the file."""
+        return self._lock
 
+    def signature(self) -> object:
+        """Cheap token that changes whenever the file is rewritten (by anyone)."""
+        return file_signature(self.path)
+
+    # ----------------------------
+    # Payload helpers (shared with subclasses)
+    # ----------------------------
+    def _read_payload(self) -> dict:
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def _write_payload(self, payload: dict) -> None:
+        atomic_write(self.path, json.dumps(payload, indent=2).encode("utf-8"))
+
+    @staticmethod
+    def _to_payload(habits: List[Habit], tasks: List[Task]) -> dict:
+        return {
+            "habits": [h.to_dict() for h in habits],
+            "tasks": [t.to_dict() for t in tasks],
+        }
+
+    def _from_payload(self, raw: dict) -> Tuple[List[Habit], List[Task]]:
         habits_raw = raw.get("habits", [])
         tasks_raw = raw.get("tasks", [])
 
-        habits = [Habit.from_dict(h) for h in habits_raw]
+        habits = [self._habit_from_record(h) for h in habits_raw]
         tasks = [Task.from_dict(t) for t in tasks_raw]
         return habits, tasks
 
-    def save(self, habits: List[Habit], tasks: List[Task]) -> None:
-        payload = {
-            "habits": [h.to_dict() for h in habits],
-            "tasks": [t.to_dict() for t in tasks],
-        }
-        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    def _habit_from_record(self, record: dict) -> Habit:
+        if not self.lazy:
+            return Habit.from_dict(record)
+        # Held as one string until first use: a list of ISO strings takes
+        # ~4x the memory of one joined string (and ~10x the parsed stamps).
+        completions = record.get("completions") or []
+        return Habit.lazy(record, len(completions), partial(_split_lines, "\n".join(completions)))
 
     # ----------------------------
     # Backwards-compatible API
@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from habit_tracker.models import Habit, Task, new_task_id
+from habit_tracker.storage_json import JsonStorage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS habits (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT    NOT NULL,
+    name_key    TEXT    NOT NULL,
+    periodicity TEXT    NOT NULL,
+    description TEXT    NOT NULL DEFAULT '',
+    created_at  TEXT    NOT NULL,
+    is_active   INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_habits_name ON habits(name_key, id);
+CREATE INDEX IF NOT EXISTS idx_habits_periodicity ON habits(periodicity);
+
+CREATE TABLE IF NOT EXISTS completions (
+    id       INTEGER PRIMARY KEY,
+    habit_id INTEGER NOT NULL REFERENCES habits(id) ON DELETE CASCADE,
+    ts       TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_completions_habit_ts ON completions(habit_id, ts);
+CREATE INDEX IF NOT EXISTS idx_completions_ts ON completions(ts);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id           INTEGER PRIMARY KEY,
+    uid          TEXT,
+    title        TEXT    NOT NULL,
+    urgent       INTEGER NOT NULL,
+    important    INTEGER NOT NULL,
+    description  TEXT    NOT NULL DEFAULT '',
+    due_datetime TEXT,
+    created_at   TEXT    NOT NULL,
+    completed    INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_TASK_COLUMNS = "uid, title, urgent, important, description, due_datetime, created_at, completed"
+
+
+# Names aren't unique (older data.json files can hold "Read" and "read "),
+# so lookups by name take the first habit, like HabitRepository.get.
+_HABIT_ID_BY_NAME = "(SELECT id FROM habits WHERE name_key = ? ORDER BY id LIMIT 1)"
+
+
+def _name_key(name: str) -> str:
+    return name.strip().lower()
+
+
+class SqliteStorage:
+    """
+    SQLite-backed storage with the same load()/save() contract as JsonStorage.
+
+    Habits, tasks and completions live in normalized tables, so single
+    mutations (append) and queries (get_habit, completions_between, ...)
+    touch only the rows they need instead of the whole dataset.
+
+    load() itself still reads every habit, completion and task unless the
+    storage is opened with lazy=True (habit headers and counts up front,
+    each habit's completions on first use).
+    """
+
+    def __init__(self, file_path: str = "data.sqlite3", lazy: bool = False) -> None:
+        self.path = file_path
+        # lazy: load() returns habit headers with completion counts; each
+        # habit queries its completions on first use (see Habit.lazy).
+        self.lazy = lazy
+        # One connection shared by every thread (write-behind timers, server
+        # handler threads, lazy habits materializing); _lock serializes its
+        # use. It's a leaf lock: nothing else is acquired while holding it.
+        self._lock = threading.RLock()
+        # Held by lock() for its whole block and around every write, so one
+        # thread's writes never commit another thread's lock() transaction.
+        self._write_lock = threading.RLock()
+        self._lock_depth = 0
+        self._conn = sqlite3.connect(file_path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if file_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ----------------------------
+    # Storage contract
+    # ----------------------------
+    def load(self) -> Tuple[List[Habit], List[Task]]:
+        with self._lock:
+            habits = self._load_lazy_habits() if self.lazy else self._load_habits()
+            tasks = [
+                self._task_from_row(row)
+                for row in self._conn.execute(
+                    f"SELECT {_TASK_COLUMNS} FROM tasks ORDER BY id"
+                )
+            ]
+        return habits, tasks
+
+    def _load_habits(self) -> List[Habit]:
+        habits_by_id: Dict[int, Habit] = {}
+        for row in self._conn.execute(
+            "SELECT id, name, periodicity, description, created_at, is_active FROM habits ORDER BY id"
+        ):
+            habits_by_id[row[0]] = self._habit_from_row(row)
+
+        completions: Dict[int, List[str]] = {}
+        for habit_id, ts in self._conn.execute("SELECT habit_id, ts FROM completions ORDER BY id"):
+            completions.setdefault(habit_id, []).append(ts)
+        for habit_id, values in completions.items():
+            habits_by_id[habit_id].completions = values
+        return list(habits_by_id.values())
+
+    def _load_lazy_habits(self) -> List[Habit]:
+        rows = self._conn.execute(
+            "SELECT h.id, h.name, h.periodicity, h.description, h.created_at, h.is_active, "
+            "(SELECT COUNT(*) FROM completions c WHERE c.habit_id = h.id) "
+            "FROM habits h ORDER BY h.id"
+        )
+        return [
+            Habit.lazy(
+                {
+                    "name": name,
+                    "periodicity": periodicity,
+                    "description": description,
+                    "created_at": created_at,
+                    "is_active": bool(is_active),
+                },
+                count,
+                partial(self._completions_of, habit_id),
+            )
+            for habit_id, name, periodicity, description, created_at, is_active, count in rows
+        ]
+
+    def _completions_of(self, habit_id: int) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT ts FROM completions WHERE habit_id = ? ORDER BY id", (habit_id,))
+            return [ts for (ts,) in rows]
+
+    def save(self, habits: List[Habit], tasks: List[Task]) -> None:
+        self.save_iter(habits, tasks)
+
+    def save_iter(self, habits: Iterable[Habit], tasks: Iterable[Task]) -> None:
+        """Like save(), but consumes habits/tasks lazily (e.g. from a generator)."""
+        if self.lazy:
+            # Unloaded habits read their completions by row id: fetch them
+            # before the rows are replaced.
+            habits = list(habits)
+            for habit in habits:
+                habit.materialize()
+        with self._writing():
+            self._conn.execute("DELETE FROM completions")
+            self._conn.execute("DELETE FROM habits")
+            self._conn.execute("DELETE FROM tasks")
+            for habit in habits:
+                self._insert_habit(habit)
+            for task in tasks:
+                self._insert_task(task)
+
+    # ----------------------------
+    # Incremental API (used by HabitTracker)
+    # ----------------------------
+    def append(self, op: str, data: dict) -> None:
+        with self._writing():
+            if op == "habit_add":
+                self._insert_habit(Habit.from_dict(data["habit"]))
+
+            elif op == "habit_delete":
+                self._conn.execute(f"DELETE FROM habits WHERE id = {_HABIT_ID_BY_NAME}", (_name_key(data["name"]),))
+
+            elif op == "check_off":
+                self._conn.execute(
+                    "INSERT INTO completions (habit_id, ts) "
+                    f"SELECT id, ? FROM habits WHERE id = {_HABIT_ID_BY_NAME}",
+                    (data["ts"], _name_key(data["name"])),
+                )
+
+            elif op == "completions_add":
+                row = self._conn.execute(f"SELECT {_HABIT_ID_BY_NAME}", (_name_key(data["name"]),)).fetchone()
+                if row[0] is not None:
+                    self._conn.executemany(
+                        "INSERT INTO completions (habit_id, ts) VALUES (?, ?)", ((row[0], ts) for ts in data["ts"])
+                    )
+
+            elif op == "habit_active":
+                self._conn.execute(
+                    f"UPDATE habits SET is_active = ? WHERE id = {_HABIT_ID_BY_NAME}",
+                    (int(bool(data["active"])), _name_key(data["name"])),
+                )
+
+            elif op == "habits_replace":
+                self._conn.execute("DELETE FROM completions")
+                self._conn.execute("DELETE FROM habits")
+                for h in data["habits"]:
+                    self._insert_habit(Habit.from_dict(h))
+
+            elif op == "task_add":
+                self._insert_task(Task.from_dict(data["task"]))
+
+            elif op == "task_complete":
+                self._conn.execute("UPDATE tasks SET completed = 1 WHERE uid = ?", (data["id"],))
+
+            elif op == "task_delete":
+                self._conn.execute("DELETE FROM tasks WHERE uid = ?", (data["id"],))
+
+            else:
+                raise ValueError(f"Unknown storage record: {op!r}")
+
+    def needs_compaction(self) -> bool:
+        return False
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """
+        Hold SQLite's write lock (BEGIN IMMEDIATE) for the block: the
+        tracker's signature check and the writes after it commit as one
+        transaction, with no other connection writing in between.
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._lock_depth:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                self._lock_depth += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._lock_depth -= 1
+                    if not self._lock_depth:
+                        self._conn.commit()
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        # Inside lock() writes join its transaction; otherwise each commits on its own.
+        with self._write_lock, self._lock:
+            if self._lock_depth:
+                yield
+            else:
+                with self._conn:
+                    yield
+
+    def signature(self) -> int:
+        """Changes whenever another connection (e.g. another process) commits."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # ----------------------------
+    # Queries (no full load needed)
+    # ----------------------------
+    def habit_names(self, periodicity: Optional[str] = None) -> List[str]:
+        with self._lock:
+            if periodicity is None:
+                rows = self._conn.execute("SELECT name FROM habits ORDER BY id")
+            else:
+                rows = self._conn.execute(
+                    "SELECT name FROM habits WHERE periodicity = ? ORDER BY id",
+                    (periodicity.strip().lower(),),
+                )
+            return [r[0] for r in rows]
+
+    def get_habit(self, name: str) -> Optional[Habit]:
+        with self._lock:
+            return self._get_habit(name)
+
+    def _get_habit(self, name: str) -> Optional[Habit]:
+        row = self._conn.execute(
+            "SELECT id, name, periodicity, description, created_at, is_active FROM habits "
+            "WHERE name_key = ? ORDER BY id LIMIT 1",
+            (_name_key(name),),
+        ).fetchone()
+        if row is None:
+            return None
+
+        habit = self._habit_from_row(row)
+        habit.completions = self._completions_of(row[0])
+        return habit
+
+    def completions_between(self, name: str, start: datetime, end: datetime) -> List[str]:
+        """ISO timestamps of a habit's completions with start <= ts < end, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ts FROM completions WHERE habit_id = {_HABIT_ID_BY_NAME} "
+                "AND ts >= ? AND ts < ? ORDER BY ts",
+                (_name_key(name), start.isoformat(), end.isoformat()),
+            )
+            return [r[0] for r in rows]
+
+    # ----------------------------
+    # Migration
+    # ----------------------------
+    def import_json(self, json_path: str) -> None:
+        """Replace the database content with the habits and tasks of a data.json file."""
+        habits, tasks = JsonStorage(file_path=json_path).load()
+        self.save(habits, tasks)
+
+    # ----------------------------
+    # Row helpers
+    # ----------------------------
+    def _insert_habit(self, habit: Habit) -> None:
+        cur = self._conn.execute(
+            "INSERT INTO habits (name, name_key, periodicity, description, created_at, is_active) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                habit.name,
+                _name_key(habit.name),
+                habit.periodicity,
+                habit.description,
+                habit.created_at.isoformat(),
+                int(habit.is_active),
+            ),
+        )
+        self._conn.executemany(
+            "INSERT INTO completions (habit_id, ts) VALUES (?, ?)",
+            ((cur.lastrowid, ts) for ts in habit.completions),
+        )
+
+    def _insert_task(self, task: Task) -> None:
+        self._conn.execute(
+            f"INSERT INTO tasks ({_TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                task.id,
+                task.title,
+                int(task.urgent),
+                int(task.important),
+                task.description,
+                task.due_datetime,
+                task.created_at.isoformat(),
+                int(task.completed),
+            ),
+        )
+
+    def _migrate(self) -> None:
+        # Databases created before tasks had stable ids: add and backfill the
+        # column the same way Task.from_dict derives ids for legacy records.
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        with self._conn:
+            # Names used to be unique; that rejected legacy files with
+            # case-duplicate names (see _HABIT_ID_BY_NAME).
+            self._conn.execute("DROP INDEX IF EXISTS idx_habits_name_key")
+            if "uid" not in columns:
+                self._conn.execute("ALTER TABLE tasks ADD COLUMN uid TEXT")
+                seen = set()
+                rows = self._conn.execute("SELECT id, title, created_at FROM tasks").fetchall()
+                for row_id, title, created_at in rows:
+                    uid = Task.from_dict({"title": title, "urgent": 0, "important": 0, "created_at": created_at}).id
+                    if uid in seen:
+                        uid = new_task_id()
+                    seen.add(uid)
+                    self._conn.execute("UPDATE tasks SET uid = ? WHERE id = ?", (uid, row_id))
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_uid ON tasks(uid)")
+
+    @staticmethod
+    def _habit_from_row(row: tuple) -> Habit:
+        _id, name, periodicity, description, created_at, is_active = row
+        return Habit(
+            name=name,
+            periodicity=periodicity,
+            description=description,
+            created_at=datetime.fromisoformat(created_at),
+            is_active=bool(is_active),
+        )
+
+    @staticmethod
+    def _task_from_row(row: tuple) -> Task:
+        uid, title, urgent, important, description, due_datetime, created_at, completed = row
+        return Task(
+            id=uid,
+            title=title,
+            urgent=bool(urgent),
+            important=bool(important),
+            description=description,
+            due_datetime=due_datetime,
+            created_at=datetime.fromisoformat(created_at),
+            completed=bool(completed),
+        )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Iterable, NamedTuple, Optional
+
+
+class StreakState(NamedTuple):
+    current: int  # length of the run ending at `last`
+    longest: int
+    last: Optional[int]  # last completed (qualifying) period number
+    # Bookkeeping for periodicities that need several completion days per
+    # period ("3-per-week"): the period of the latest completion, how many
+    # distinct days it has so far, and the latest completion day.
+    tail: Optional[int] = None
+    tail_days: int = 0
+    last_day: Optional[int] = None
+
+
+EMPTY_STREAK = StreakState(0, 0, None)
+
+
+def scan_streaks(periods: Iterable[int]) -> StreakState:
+    """
+    Single pass over non-decreasing period numbers (duplicates allowed).
+    """
+    current = longest = 0
+    last: Optional[int] = None
+    for p in periods:
+        if p == last:
+            continue
+        current = current + 1 if last is not None and p == last + 1 else 1
+        if current > longest:
+            longest = current
+        last = p
+    return StreakState(current, longest, last)
+
+
+def advance_streak(state: StreakState, period: int) -> StreakState:
+    """O(1) update for a completed period >= state.last."""
+    if period == state.last:
+        return state
+    current = state.current + 1 if state.last is not None and period == state.last + 1 else 1
+    return state._replace(current=current, longest=max(state.longest, current), last=period)
@@ -0,0 +1,215 @@
+"""
+HabitTracker for multi-threaded services.
+
+- writers (every mutating method) are serialized by the write side of an
+  RWLock; persistence runs after the lock is released. A flush that has
+  to merge another process's writes holds it from reload to merge, so
+  no write lands in between (see HabitTracker._exclusive)
+- readers (list_*/get_*/deadline queries) answer from an immutable
+  TrackerSnapshot that is rebuilt, under the read side of the lock, at most
+  once per tracker version. Between writes, reads take no lock at all,
+  and a rebuild re-copies only the habits whose version changed and the
+  tasks reported changed.
+
+Objects returned by readers are snapshot copies: mutate through the
+tracker, not through them.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from habit_tracker.models import Habit, Task
+from habit_tracker.repository import HabitRepository, TaskRepository, name_key
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.tracker import Change, HabitTracker
+
+
+class RWLock:
+    """
+    Many readers or one writer. Waiting writers block new readers, so a
+    steady stream of readers can't starve them. The writer may re-enter
+    write() and read().
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None  # thread ident
+        self._depth = 0
+        self._waiting_writers = 0
+
+    def held_by_me(self) -> bool:
+        return self._writer == threading.get_ident()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        if self.held_by_me():
+            yield
+            return
+        with self._cond:
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer != me:
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._cond.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer = me
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._depth -= 1
+                if not self._depth:
+                    self._writer = None
+                    self._cond.notify_all()
+
+
+class TrackerSnapshot:
+    """
+    Read-only copies of a tracker's habits and tasks at one version, with
+    the tracker's query methods and version counters (so an AnalyticsCache
+    can compute from a snapshot).
+    """
+
+    def __init__(self, tracker: HabitTracker, habits: List[Habit], tasks: List[Task]) -> None:
+        self.version = tracker.version
+        self._habits_version = tracker.habits_version
+        self._tasks_version = tracker.tasks_version
+        self._habit_versions = dict(tracker._habit_versions)
+        self._habits = HabitRepository(habits)
+        self._tasks = TaskRepository(tasks)
+
+    # HabitTracker's queries only read _habits/_tasks and the version
+    # fields, so they work unchanged here.
+    habits_version = HabitTracker.habits_version
+    tasks_version = HabitTracker.tasks_version
+    habit_version = HabitTracker.habit_version
+    list_habits = HabitTracker.list_habits
+    list_habits_by_periodicity = HabitTracker.list_habits_by_periodicity
+    list_active_habits = HabitTracker.list_active_habits
+    get_habit_by_name = HabitTracker.get_habit_by_name
+    list_tasks = HabitTracker.list_tasks
+    list_tasks_by_quadrant = HabitTracker.list_tasks_by_quadrant
+    list_tasks_by_status = HabitTracker.list_tasks_by_status
+    upcoming_tasks = HabitTracker.upcoming_tasks
+    overdue_tasks = HabitTracker.overdue_tasks
+    next_due = HabitTracker.next_due
+    get_task = HabitTracker.get_task
+
+
+_QUERIES = (
+    "list_habits", "list_habits_by_periodicity", "list_active_habits", "get_habit_by_name",
+    "list_tasks", "list_tasks_by_quadrant", "list_tasks_by_status",
+    "upcoming_tasks", "overdue_tasks", "next_due", "get_task",
+)
+
+
+def _query(name: str) -> Callable:
+    method = getattr(HabitTracker, name)
+
+    @wraps(method)
+    def wrapper(self: "ThreadSafeHabitTracker", *args, **kwargs):
+        # Inside a mutation (e.g. create_habit's duplicate check) the writer
+        # must see the live state, not the last snapshot.
+        target = self if self._rw.held_by_me() else self.snapshot()
+        return method(target, *args, **kwargs)
+
+    return wrapper
+
+
+class ThreadSafeHabitTracker(HabitTracker):
+    """HabitTracker safe to share between threads; see the module docstring."""
+
+    def __init__(self, storage: JsonStorage, write_behind: Optional[float] = None) -> None:
+        self._rw = RWLock()
+        self._snapshot_lock = threading.Lock()
+        self._snapshot: Optional[TrackerSnapshot] = None
+        # Copies reused by the next snapshot while their original is unchanged.
+        self._habit_copies: Dict[int, Tuple[Habit, int, Habit]] = {}  # id(live) -> (live, version, copy)
+        self._task_copies: Dict[str, Tuple[Task, Task]] = {}  # task id -> (live, copy)
+        super().__init__(storage, write_behind)
+        self.subscribe(self._forget_task_copies)
+
+    # --- Snapshots ---
+    def snapshot(self) -> TrackerSnapshot:
+        """Consistent read-only view of the current state (shared until the next write)."""
+        snap = self._snapshot
+        if snap is not None and snap.version == self._clock:
+            return snap
+        with self._snapshot_lock, self._rw.read():
+            snap = self._snapshot
+            if snap is None or snap.version != self._clock:
+                snap = self._snapshot = TrackerSnapshot(self, self._copy_habits(), self._copy_tasks())
+            return snap
+
+    def _copy_habits(self) -> List[Habit]:
+        copies = {}
+        out = []
+        for habit in self._habits:
+            version = self._habit_versions.get(name_key(habit.name), 0)
+            cached = self._habit_copies.get(id(habit))
+            if cached is None or cached[0] is not habit or cached[1] != version:
+                cached = (habit, version, habit.copy())
+            copies[id(habit)] = cached
+            out.append(cached[2])
+        self._habit_copies = copies
+        return out
+
+    def _copy_tasks(self) -> List[Task]:
+        copies = {}
+        out = []
+        for task in self._tasks:
+            cached = self._task_copies.get(task.id)
+            if cached is None or cached[0] is not task:
+                cached = (task, copy.copy(task))
+            copies[task.id] = cached
+            out.append(cached[1])
+        self._task_copies = copies
+        return out
+
+    def _forget_task_copies(self, change: Change) -> None:
+        # Runs inside mutations (write lock held). Tasks have no per-task
+        # version, so their change notifications invalidate the copies.
+        if change.kind != "task":
+            return
+        if change.key is None:
+            self._task_copies = {}
+        else:
+            self._task_copies.pop(change.key, None)
+
+    # --- Writers ---
+    def _exclusive(self) -> ContextManager[None]:
+        # Mutations, batch() bookkeeping, load and reload-and-merge all take
+        # the write side; persistence runs outside it, so readers and
+        # writers keep going during I/O. batch() defers every thread's writes.
+        return self._rw.write()
+
+    def _state_to_save(self) -> Tuple[List[Habit], List[Task]]:
+        snap = self.snapshot()
+        return snap.list_habits(), snap.list_tasks()
+
+
+for _name in _QUERIES:
+    setattr(ThreadSafeHabitTracker, _name, _query(_name))
+del _name
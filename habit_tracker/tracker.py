@@ -1,79 +1,459 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+import atexit
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 from habit_tracker.models import Habit, Task
+from habit_tracker.periodicity import normalize_periodicity, periodicity_rule
+from habit_tracker.repository import HabitRepository, TaskRepository, name_key
+from habit_tracker.storage_journal import replay
 from habit_tracker.storage_json import JsonStorage
+from habit_tracker.utils_time import format_stamps, parse_due, to_stamp
+
+
+class Change(NamedTuple):
+    kind: str  # "habit" or "task"
+    key: Optional[str]  # habit name_key / task id; None: everything of that kind may have changed
+
+
+def _mutation(method: Callable) -> Callable:
+    """Run a mutating method under _writing() (see HabitTracker._exclusive)."""
+
+    @wraps(method)
+    def wrapper(self: "HabitTracker", *args, **kwargs):
+        with self._writing():
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class HabitTracker:
     """
     Controller/service layer:
-    - manages habits + tasks in memory
-    - persists both via JsonStorage
+    - manages habits + tasks in memory (indexed repositories, so name
+      lookups and filtered listings don't scan every habit/task)
+    - persists both via JsonStorage (or any storage with the same load/save contract)
+
+    Storages that also provide append(op, data) / needs_compaction()
+    (e.g. JournalStorage) receive one small record per mutation instead
+    of a full save.
+
+    Every mutation bumps a version counter (globally, and per habit for
+    habit mutations) so caches such as AnalyticsCache can tell what changed.
+
+    Persistence can be deferred:
+    - `with tracker.batch():` persists once when the outermost block exits
+    - write_behind=<seconds> marks the tracker dirty and flushes on a timer
+      (and at interpreter exit / close())
+
+    subscribe(listener) delivers a Change after every mutation, on the
+    thread that made it (the write-behind timer thread for merges found
+    while flushing), so views can update only what changed.
+
+    Several processes may share one storage: writes happen under the
+    storage's lock(), and its signature() tells when someone else wrote.
+    refresh() then merges their changes; a flush replays this tracker's
+    pending mutations on top of them instead of overwriting them. Mutations
+    and those merges exclude each other (_exclusive), so a mutation made
+    while the write-behind timer merges is kept, not overwritten.
     """
 
-    def __init__(self, storage: JsonStorage) -> None:
+    def __init__(self, storage: JsonStorage, write_behind: Optional[float] = None) -> None:
         self.storage = storage
-        self._habits: List[Habit] = []
-        self._tasks: List[Task] = []
+        self.write_behind = write_behind
+        self._habits = HabitRepository()
+        self._tasks = TaskRepository()
+
+        self._clock = 0
+        self._habits_version = 0
+        self._tasks_version = 0
+        self._habit_versions: Dict[str, int] = {}
+        self._listeners: List[Callable[[Change], None]] = []
+
+        self._batch_depth = 0
+        self._dirty = False
+        self._pending: List[Tuple[str, dict]] = []
+        self._flush_lock = threading.Lock()  # one flush/save at a time
+        self._state_lock = threading.RLock()  # see _exclusive
+        self._pending_lock = threading.Lock()  # _pending, _dirty, _flush_timer; never held while taking another lock
+        self._flush_timer: Optional[threading.Timer] = None
+        self._storage_sig: object = None
+        if write_behind is not None:
+            atexit.register(self.flush)
 
     # --- Persistence ---
     def load(self) -> None:
-        habits, tasks = self.storage.load()
-        self._habits = habits
-        self._tasks = tasks
+        with self._storage_lock():
+            habits, tasks = self.storage.load()
+            self._storage_sig = self._signature()
+        with self._exclusive():
+            reassigned = self._adopt(habits, tasks)
+        if reassigned:
+            # Duplicate task ids (copied records) got fresh ones: persist them
+            # so id-based journal records keep pointing at the same task.
+            self.save()
+
+    def _adopt(self, habits: List[Habit], tasks: List[Task]) -> int:
+        """Replace the in-memory state; returns the number of reassigned task ids."""
+        self._habits.replace_all(habits)
+        reassigned = self._tasks.replace_all(tasks)
+        self._reset_habit_versions()
+        self._tasks_changed()
+        return reassigned
 
     def save(self) -> None:
-        self.storage.save(self._habits, self._tasks)
+        """Write the full state now, on top of whatever other processes wrote meanwhile (see flush)."""
+        self._flush(full=True)
+
+    def _state_to_save(self) -> Tuple[List[Habit], List[Task]]:
+        return self._habits.all(), self._tasks.all()
+
+    def refresh(self) -> bool:
+        """
+        Pick up changes other processes made to the storage. Costs one
+        signature check (a stat) when nothing changed; otherwise reloads
+        and merges, bumping versions only of the habits/tasks that differ.
+        Returns whether anything changed.
+        """
+        before = self._clock
+        self.flush()
+        with self._flush_lock, self._storage_lock():
+            if self._signature() != self._storage_sig:
+                with self._exclusive():
+                    self._reload([])
+                self._storage_sig = self._signature()
+        return self._clock != before
+
+    @contextmanager
+    def batch(self) -> Iterator["HabitTracker"]:
+        """
+        Defer persistence of every mutation inside the block until the
+        outermost batch exits. Changes made before an exception are still
+        persisted, exactly as they would have been without the batch.
+        """
+        with self._exclusive():
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._exclusive():
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self._persist()
+
+    def flush(self) -> None:
+        """Write any deferred changes to storage now."""
+        self._flush(full=False)
+
+    def _flush(self, full: bool) -> None:
+        with self._flush_lock:
+            with self._pending_lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                if not self._dirty and not full:
+                    return
+
+            pending: List[Tuple[str, dict]] = []
+            try:
+                with self._storage_lock():
+                    if self._signature() != self._storage_sig:
+                        # Written by another process since we loaded: take its
+                        # version and re-apply our pending mutations on top.
+                        with self._exclusive():
+                            pending = self._take_pending()
+                            self._reload(pending)
+                    else:
+                        pending = self._take_pending()
+                    if full:
+                        self.storage.save(*self._state_to_save())
+                        pending.clear()
+                    else:
+                        self._write(pending)
+                    self._storage_sig = self._signature()
+            except BaseException:
+                # Keep what wasn't written for the next flush.
+                with self._pending_lock:
+                    self._pending[:0] = pending
+                    self._dirty = True
+                raise
+
+    def _take_pending(self) -> List[Tuple[str, dict]]:
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+            self._dirty = False
+        return pending
+
+    def _reload(self, pending: List[Tuple[str, dict]]) -> None:
+        """
+        Merge in the stored state with `pending` and every not yet flushed
+        mutation replayed on top. Callers hold the storage lock and
+        _exclusive(), so no mutation can slip in between load and merge.
+        """
+        habits, tasks = self.storage.load()
+        with self._pending_lock:
+            unflushed = pending + self._pending
+        replay(habits, tasks, [{"op": op, **data} for op, data in unflushed])
+        self._merge(habits, tasks)
+
+    def _write(self, pending: List[Tuple[str, dict]]) -> None:
+        """Persist pending ops; removes them from the list as they are written."""
+        append = getattr(self.storage, "append", None)
+        if append is None:
+            self.storage.save(*self._state_to_save())
+            pending.clear()
+            return
+        written = 0
+        try:
+            for op, data in pending:
+                append(op, data)
+                written += 1
+        finally:
+            del pending[:written]
+        if self.storage.needs_compaction():
+            self.storage.save(*self._state_to_save())
+
+    def close(self) -> None:
+        """Flush deferred changes and stop the write-behind timer."""
+        self.flush()
+        if self.write_behind is not None:
+            atexit.unregister(self.flush)
+
+    def _commit(self, op: str, **data) -> None:
+        with self._pending_lock:
+            # Kept for every storage: appended as-is, or replayed after a
+            # concurrent write (see flush).
+            self._pending.append((op, data))
+            self._dirty = True
+        if self._batch_depth == 0:
+            self._persist()
+
+    def _persist(self) -> None:
+        if not self._dirty:
+            return
+        if self.write_behind is None:
+            self.flush()
+            return
+        with self._pending_lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.write_behind, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _exclusive(self) -> ContextManager:
+        """
+        Held by every mutation (see _writing) and around reload-and-merge
+        (see _reload), so a merge never overwrites a mutation made while
+        the storage was being loaded.
+        """
+        return self._state_lock
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        with self._exclusive():
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+        if outermost:
+            self._persist()  # outside the lock: a flush may need it to merge
+
+    def _storage_lock(self) -> ContextManager:
+        lock = getattr(self.storage, "lock", None)
+        return lock() if lock is not None else nullcontext()
+
+    def _signature(self) -> object:
+        signature = getattr(self.storage, "signature", None)
+        return signature() if signature is not None else None
+
+    def _merge(self, habits: List[Habit], tasks: List[Task]) -> None:
+        """Adopt a freshly loaded state, keeping (and not re-versioning) unchanged objects."""
+        merged: List[Habit] = []
+        changed: List[str] = []
+        seen = set()
+        for habit in habits:
+            key = name_key(habit.name)
+            old = self._habits.get(habit.name)
+            if old is not None and key not in seen and old.same_as(habit):
+                merged.append(old)
+            else:
+                merged.append(habit)
+                changed.append(key)
+            seen.add(key)
+        removed = set(self._habit_versions) - seen
+        if changed or removed or len(merged) != len(self._habits):
+            self._habits.replace_all(merged)
+            version = self._habits_version = self._tick()
+            for key in changed:
+                self._habit_versions[key] = version
+            for key in removed:
+                del self._habit_versions[key]
+            self._notify("habit", None)
+
+        merged_tasks = []
+        for task in tasks:
+            old = self._tasks.get(task.id)
+            merged_tasks.append(old if old is not None and old.to_dict() == task.to_dict() else task)
+        current = self._tasks.all()
+        if len(merged_tasks) != len(current) or any(a is not b for a, b in zip(merged_tasks, current)):
+            self._tasks.replace_all(merged_tasks)
+            self._tasks_changed()
+
+    # --- Versions ---
+    @property
+    def version(self) -> int:
+        """Increases on every mutation of habits or tasks."""
+        return self._clock
+
+    @property
+    def habits_version(self) -> int:
+        return self._habits_version
+
+    @property
+    def tasks_version(self) -> int:
+        return self._tasks_version
+
+    def habit_version(self, name: str) -> Optional[int]:
+        """Version of the last mutation of this habit (None if unknown)."""
+        return self._habit_versions.get(name_key(name))
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _habit_changed(self, habit: Habit) -> None:
+        key = name_key(habit.name)
+        self._habits_version = self._habit_versions[key] = self._tick()
+        self._notify("habit", key)
+
+    def _habit_removed(self, habit: Habit) -> None:
+        key = name_key(habit.name)
+        self._habit_versions.pop(key, None)
+        self._habits_version = self._tick()
+        self._notify("habit", key)
+
+    def _reset_habit_versions(self) -> None:
+        # Versions come from the global clock, so a re-created habit never
+        # reuses a version number of an earlier habit with the same name.
+        v = self._habits_version = self._tick()
+        self._habit_versions = {name_key(h.name): v for h in self._habits}
+        self._notify("habit", None)
+
+    def _tasks_changed(self, task: Optional[Task] = None) -> None:
+        self._tasks_version = self._tick()
+        self._notify("task", task.id if task is not None else None)
+
+    # --- Change notifications ---
+    def subscribe(self, listener: Callable[[Change], None]) -> Callable[[], None]:
+        """Call listener(change) after every mutation; returns an unsubscribe function."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _notify(self, kind: str, key: Optional[str]) -> None:
+        change = Change(kind, key)
+        for listener in list(self._listeners):
+            listener(change)
 
     # --- Habits ---
+    @_mutation
     def replace_all_habits(self, habits: List[Habit]) -> None:
-        self._habits = list(habits)
-        self.save()
+        self._habits.replace_all(habits)
+        self._reset_habit_versions()
+        self._commit("habits_replace", habits=[h.to_dict() for h in self._habits])
 
+    @_mutation
     def create_habit(self, name: str, periodicity: str, description: str = "") -> Habit:
-        periodicity = periodicity.strip().lower()
-        if periodicity not in {"daily", "weekly"}:
-            raise ValueError("Periodicity must be 'daily' or 'weekly'.")
+        periodicity = normalize_periodicity(periodicity)
 
         if self.get_habit_by_name(name) is not None:
             raise ValueError("A habit with this name already exists.")
 
         habit = Habit(name=name.strip(), periodicity=periodicity, description=description.strip())
-        self._habits.append(habit)
-        self.save()
+        self._habits.add(habit)
+        self._habit_changed(habit)
+        self._commit("habit_add", habit=habit.to_dict())
         return habit
 
     def list_habits(self) -> List[Habit]:
-        return list(self._habits)
+        return self._habits.all()
 
     def list_habits_by_periodicity(self, periodicity: str) -> List[Habit]:
-        p = periodicity.strip().lower()
-        return [h for h in self._habits if h.periodicity == p]
+        rule = periodicity_rule(periodicity)
+        return self._habits.by_periodicity(str(rule) if rule is not None else periodicity.strip().lower())
+
+    def list_active_habits(self, active: bool = True) -> List[Habit]:
+        return self._habits.by_active(active)
 
     def get_habit_by_name(self, name: str) -> Optional[Habit]:
-        n = name.strip().lower()
-        for h in self._habits:
-            if h.name.strip().lower() == n:
-                return h
-        return None
+        return self._habits.get(name)
 
-    def check_off(self, name: str) -> None:
+    @_mutation
+    def check_off(self, name: str, ts: Optional[datetime] = None) -> None:
+        """Record a completion now, or at ts (which may be in the past)."""
         habit = self.get_habit_by_name(name)
         if habit is None:
             raise ValueError("Habit not found.")
-        habit.add_completion()
-        self.save()
+        ts = ts or datetime.now()
+        habit.add_completion(ts)
+        self._habit_changed(habit)
+        self._commit("check_off", name=habit.name, ts=ts.isoformat())
 
+    @_mutation
+    def add_completions(self, name: str, timestamps: Iterable[datetime], dedupe: bool = True) -> int:
+        """
+        Add (possibly backdated) completions in one mutation, skipping
+        timestamps the habit already has (or, with dedupe=False, adding
+        every one, as repeated check_off calls would). Returns how many
+        were added.
+        """
+        habit = self.get_habit_by_name(name)
+        if habit is None:
+            raise ValueError("Habit not found.")
+        if not dedupe:
+            new = sorted(to_stamp(ts) for ts in timestamps)
+        else:
+            stamps = habit.stamps
+            new = sorted(
+                s for s in {to_stamp(ts) for ts in timestamps}
+                if (i := bisect_left(stamps, s)) == len(stamps) or stamps[i] != s
+            )
+        if not new:
+            return 0
+        habit.add_stamps(new)
+        self._habit_changed(habit)
+        self._commit("completions_add", name=habit.name, ts=format_stamps(new))
+        return len(new)
+
+    @_mutation
+    def set_habit_active(self, name: str, active: bool) -> None:
+        habit = self.get_habit_by_name(name)
+        if habit is None:
+            raise ValueError("Habit not found.")
+        old_active = habit.is_active
+        habit.is_active = active
+        self._habits.reindex(habit, habit.name, habit.periodicity, old_active)
+        self._habit_changed(habit)
+        self._commit("habit_active", name=habit.name, active=active)
+
+    @_mutation
     def delete_habit(self, name: str) -> None:
         habit = self.get_habit_by_name(name)
         if habit is None:
             raise ValueError("Habit not found.")
         self._habits.remove(habit)
-        self.save()
+        self._habit_removed(habit)
+        self._commit("habit_delete", name=habit.name)
 
     # --- Tasks (Eisenhower Matrix) ---
+    @_mutation
     def create_task(
         self,
         title: str,
@@ -85,20 +465,24 @@ class HabitTracker:
         title = title.strip()
         if not title:
             raise ValueError("Task title cannot be empty.")
+        due_datetime = due_datetime.strip() if due_datetime else None
+        if due_datetime:
+            parse_due(due_datetime)  # reject typos up front; loaded tasks are lenient
 
         task = Task(
             title=title,
             urgent=urgent,
             important=important,
             description=description.strip(),
-            due_datetime=due_datetime.strip() if due_datetime else None,
+            due_datetime=due_datetime,
         )
-        self._tasks.append(task)
-        self.save()
+        self._tasks.add(task)
+        self._tasks_changed(task)
+        self._commit("task_add", task=task.to_dict())
         return task
 
     def list_tasks(self) -> List[Task]:
-        return list(self._tasks)
+        return self._tasks.all()
 
     def list_tasks_by_quadrant(self, quadrant: int) -> List[Task]:
         """
@@ -110,30 +494,53 @@ class HabitTracker:
         """
         if quadrant not in {1, 2, 3, 4}:
             raise ValueError("Quadrant must be 1, 2, 3, or 4.")
+        return self._tasks.by_quadrant(quadrant)
+
+    def list_tasks_by_status(self, completed: bool) -> List[Task]:
+        return self._tasks.by_completed(completed)
+
+    # --- Deadlines (open tasks with a due date) ---
+    def upcoming_tasks(self, within: timedelta = timedelta(days=1), now: Optional[datetime] = None) -> List[Task]:
+        """Open tasks due from now up to now + within, earliest first."""
+        start = to_stamp(now or datetime.now())
+        return self._tasks.due_between(start, start + within // timedelta(microseconds=1))
 
-        def in_quad(t: Task) -> bool:
-            if quadrant == 1:
-                return t.urgent and t.important
-            if quadrant == 2:
-                return (not t.urgent) and t.important
-            if quadrant == 3:
-                return t.urgent and (not t.important)
-            return (not t.urgent) and (not t.important)
+    def overdue_tasks(self, now: Optional[datetime] = None) -> List[Task]:
+        """Open tasks whose due date has passed, earliest first."""
+        return self._tasks.due_between(None, to_stamp(now or datetime.now()))
+
+    def next_due(self, now: Optional[datetime] = None) -> Optional[Task]:
+        """The open task with the nearest due date that has not passed yet."""
+        return self._tasks.next_due(to_stamp(now or datetime.now()))
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        return self._tasks.get(task_id)
+
+    @_mutation
+    def complete_task(self, task_id: str) -> Task:
+        task = self._tasks.get(task_id)
+        if task is None:
+            raise ValueError("Task not found.")
+        self._tasks.set_completed(task)
+        self._tasks_changed(task)
+        self._commit("task_complete", id=task.id)
+        return task
 
-        return [t for t in self._tasks if in_quad(t)]
+    @_mutation
+    def remove_task(self, task_id: str) -> None:
+        task = self._tasks.get(task_id)
+        if task is None:
+            raise ValueError("Task not found.")
+        self._tasks.remove(task)
+        self._tasks_changed(task)
+        self._commit("task_delete", id=task.id)
 
+    # Positional variants (1-based, as numbered in list_tasks()); prefer the
+    # id-based methods, positions shift when tasks are deleted elsewhere.
+    @_mutation
     def mark_task_completed(self, index: int) -> None:
-        tasks = self.list_tasks()
-        if index < 1 or index > len(tasks):
-            raise ValueError("Invalid task number.")
-        tasks[index - 1].completed = True
-        self._tasks = tasks
-        self.save()
+        self.complete_task(self._tasks.at(index).id)
 
+    @_mutation
     def delete_task(self, index: int) -> None:
-        tasks = self.list_tasks()
-        if index < 1 or index > len(tasks):
-            raise ValueError("Invalid task number.")
-        del tasks[index - 1]
-        self._tasks = tasks
-        self.save()
+        self.remove_task(self._tasks.at(index).id)
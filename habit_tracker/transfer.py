@@ -0,0 +1,163 @@
+"""
+Streaming bulk import/export of completions (CSV / NDJSON).
+
+Import formats, one completion per row:
+- CSV with a header containing "habit" and "ts" (or "timestamp") columns
+- NDJSON, one {"habit": ..., "ts": ...} object per line; lines with another
+  "type" (as written by export_ndjson) are ignored
+
+Timestamps are ISO strings and may be in the past or out of order.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+from habit_tracker.models import Habit, Task
+from habit_tracker.tracker import HabitTracker
+from habit_tracker.utils_time import format_stamp
+
+CompletionRecord = Tuple[str, datetime]
+PathOrFile = Union[str, Path, IO[str]]
+
+
+class ImportResult(NamedTuple):
+    added: int
+    duplicates: int  # already recorded, or repeated in the input
+    unknown: int  # rows for habits that don't exist
+
+
+@contextmanager
+def _opened(target: PathOrFile, mode: str) -> Iterator[IO[str]]:
+    if isinstance(target, (str, Path)):
+        with open(target, mode, encoding="utf-8", newline="") as f:
+            yield f
+    else:
+        yield target
+
+
+def _parse_ts(raw: object, line: int) -> datetime:
+    try:
+        return datetime.fromisoformat(str(raw).strip())
+    except ValueError:
+        raise ValueError(f"Line {line}: invalid timestamp {raw!r}.") from None
+
+
+# --- Readers (generators: nothing is held beyond the current row) ---
+
+def read_csv_completions(source: PathOrFile) -> Iterator[CompletionRecord]:
+    with _opened(source, "r") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+        habit_col = fields.get("habit") or fields.get("name")
+        ts_col = fields.get("ts") or fields.get("timestamp")
+        if habit_col is None or ts_col is None:
+            raise ValueError("CSV needs a header with 'habit' and 'ts' columns.")
+        for row in reader:
+            name = (row[habit_col] or "").strip()
+            if name:
+                yield name, _parse_ts(row[ts_col], reader.line_num)
+
+
+def read_ndjson_completions(source: PathOrFile) -> Iterator[CompletionRecord]:
+    with _opened(source, "r") as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                raise ValueError(f"Line {line_no}: invalid JSON.") from None
+            if record.get("type", "completion") != "completion":
+                continue
+            if "habit" not in record or "ts" not in record:
+                raise ValueError(f"Line {line_no}: expected 'habit' and 'ts'.")
+            yield str(record["habit"]).strip(), _parse_ts(record["ts"], line_no)
+
+
+def read_completions(path: Union[str, Path]) -> Iterator[CompletionRecord]:
+    """Pick the reader by file extension (.csv, else NDJSON)."""
+    if Path(path).suffix.lower() == ".csv":
+        return read_csv_completions(path)
+    return read_ndjson_completions(path)
+
+
+# --- Import ---
+
+def import_completions(tracker: HabitTracker, records: Iterable[CompletionRecord]) -> ImportResult:
+    """
+    Add completions from (habit name, timestamp) records.
+
+    The input is consumed first, so a malformed row aborts the import with
+    nothing applied; then every habit gets one bulk add and the tracker
+    persists once.
+    """
+    per_habit: Dict[str, List[datetime]] = {}
+    unknown = 0
+    total = 0
+    for name, ts in records:
+        habit = tracker.get_habit_by_name(name)
+        if habit is None:
+            unknown += 1
+            continue
+        per_habit.setdefault(habit.name, []).append(ts)
+        total += 1
+
+    added = 0
+    with tracker.batch():
+        for name, timestamps in per_habit.items():
+            added += tracker.add_completions(name, timestamps)
+    return ImportResult(added=added, duplicates=total - added, unknown=unknown)
+
+
+def import_file(tracker: HabitTracker, path: Union[str, Path]) -> ImportResult:
+    return import_completions(tracker, read_completions(path))
+
+
+# --- Export (one row at a time; the full payload is never built) ---
+
+def _habit_header(habit: Habit) -> dict:
+    return {
+        "name": habit.name,
+        "periodicity": habit.periodicity,
+        "description": habit.description,
+        "created_at": habit.created_at.isoformat(),
+        "is_active": habit.is_active,
+    }
+
+
+def iter_export_records(habits: Iterable[Habit], tasks: Iterable[Task]) -> Iterator[dict]:
+    for habit in habits:
+        yield {"type": "habit", **_habit_header(habit)}
+        for stamp in habit.stamps:
+            yield {"type": "completion", "habit": habit.name, "ts": format_stamp(stamp)}
+    for task in tasks:
+        yield {"type": "task", **task.to_dict()}
+
+
+def export_ndjson(habits: Iterable[Habit], tasks: Iterable[Task], target: PathOrFile) -> int:
+    """Write habits, their completions and tasks as NDJSON; returns the number of lines."""
+    n = 0
+    with _opened(target, "w") as f:
+        for record in iter_export_records(habits, tasks):
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            n += 1
+    return n
+
+
+def export_completions_csv(habits: Iterable[Habit], target: PathOrFile) -> int:
+    """Write a habit,ts CSV (readable by read_csv_completions); returns the number of rows."""
+    n = 0
+    with _opened(target, "w") as f:
+        writer = csv.writer(f)
+        writer.writerow(["habit", "ts"])
+        for habit in habits:
+            for stamp in habit.stamps:
+                writer.writerow([habit.name, format_stamp(stamp)])
+                n += 1
+    return n
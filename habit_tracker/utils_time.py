@@ -1,7 +1,14 @@
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import Iterable, Set, Tuple
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set, Tuple
+
+# Completions are stored as integer "stamps": microseconds since 1970-01-01
+# (naive local time, like the ISO strings in data.json).
+EPOCH = datetime(1970, 1, 1)
+US_PER_DAY = 86_400_000_000
+_EPOCH_ORDINAL = EPOCH.toordinal()
 
 
 def parse_iso(ts: str) -> datetime:
@@ -21,3 +28,95 @@ def normalize_weekly(completions: Iterable[str]) -> Set[Tuple[int, int]]:
         iso_year, iso_week, _ = d.isocalendar()
         out.add((iso_year, iso_week))
     return out
+
+
+def to_stamp(ts: datetime) -> int:
+    if ts.tzinfo is not None:
+        ts = ts.astimezone().replace(tzinfo=None)
+    delta = ts - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_stamp(stamp: int) -> datetime:
+    return EPOCH + timedelta(microseconds=stamp)
+
+
+def parse_stamp(ts: str) -> int:
+    return to_stamp(parse_iso(ts))
+
+
+# Formatting stamps back to ISO strings is on every full save; going through
+# datetime objects costs ~4x more than gluing cached date and time parts.
+@lru_cache(maxsize=4096)
+def _iso_date(day: int) -> str:
+    return date.fromordinal(_EPOCH_ORDINAL + day).isoformat() + "T"
+
+
+@lru_cache(maxsize=65536)
+def _iso_time(us: int) -> str:
+    seconds, micros = divmod(us, 1_000_000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if micros:
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{micros:06d}"
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def format_stamp(stamp: int) -> str:
+    """Same string as from_stamp(stamp).isoformat()."""
+    return _iso_date(stamp // US_PER_DAY) + _iso_time(stamp % US_PER_DAY)
+
+
+def format_stamps(stamps: Iterable[int]) -> List[str]:
+    iso_date, iso_time = _iso_date, _iso_time
+    return [iso_date(s // US_PER_DAY) + iso_time(s % US_PER_DAY) for s in stamps]
+
+
+def stamp_dates(stamps: Iterable[int]) -> Set[date]:
+    """Distinct calendar dates of the given stamps (no string parsing)."""
+    return {date.fromordinal(_EPOCH_ORDINAL + day) for day in {s // US_PER_DAY for s in stamps}}
+
+
+# Task due dates as typed in the CLI/GUI; ISO strings are accepted too.
+_DUE_FORMATS = ("%d/%m/%y %H:%M", "%d/%m/%Y %H:%M")
+_DUE_DATE_FORMATS = ("%d/%m/%y", "%d/%m/%Y")
+
+
+def parse_due(value: str) -> datetime:
+    """
+    Parse a task due date: "DD/MM/YY HH:MM", "DD/MM/YYYY HH:MM" or ISO.
+    A date without a time is due at the end of that day.
+    """
+    value = value.strip()
+    for fmt in _DUE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    for fmt in _DUE_DATE_FORMATS:
+        try:
+            return datetime.combine(datetime.strptime(value, fmt).date(), time.max)
+        except ValueError:
+            pass
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError("Due date must look like DD/MM/YY HH:MM or be an ISO date.") from None
+    if "T" not in value and " " not in value and ":" not in value:
+        parsed = datetime.combine(parsed.date(), time.max)
+    return parsed
+
+
+def due_stamp(value: Optional[str]) -> Optional[int]:
+    """Stamp of a due date string, or None when it is empty or unparseable."""
+    if not value:
+        return None
+    try:
+        return to_stamp(parse_due(value))
+    except ValueError:
+        return None
+
+
+def epoch_day(d: date) -> int:
+    """Days since 1970-01-01 (same numbering as stamp // US_PER_DAY)."""
+    return d.toordinal() - _EPOCH_ORDINAL
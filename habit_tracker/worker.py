@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class JobResult(NamedTuple):
+    key: str
+    token: int
+    value: Any
+    error: Optional[BaseException]
+
+
+class BackgroundWorker:
+    """
+    A daemon thread running submitted jobs one at a time, in order.
+
+    Every job has a key (e.g. "stats"). Submitting a new job for a key makes
+    the older ones stale: they are skipped if they haven't started, and
+    their results are dropped if they have. The UI thread collects results
+    with poll() (from Tk's after() loop), so widgets are only touched there.
+    """
+
+    _STOP = object()
+
+    def __init__(self, name: str = "habit-tracker-worker") -> None:
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._results: "queue.Queue[JobResult]" = queue.Queue()
+        self._latest: Dict[str, int] = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> int:
+        """Queue fn(*args, **kwargs); returns the job's generation token."""
+        token = self.cancel(key)
+        self._jobs.put((key, token, fn, args, kwargs))
+        return token
+
+    def cancel(self, key: str) -> int:
+        """Make every queued/running job for key stale; returns the new generation token."""
+        with self._lock:
+            self._counter += 1
+            self._latest[key] = self._counter
+            return self._counter
+
+    def is_current(self, key: str, token: int) -> bool:
+        with self._lock:
+            return self._latest.get(key) == token
+
+    def poll(self) -> List[JobResult]:
+        """Finished, still-current results (non-blocking)."""
+        out = []
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                return out
+            if self.is_current(result.key, result.token):
+                out.append(result)
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        self._jobs.put(self._STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is self._STOP:
+                return
+            key, token, fn, args, kwargs = job
+            if not self.is_current(key, token):
+                continue
+            try:
+                value, error = fn(*args, **kwargs), None
+            except Exception as e:  # handed to the UI thread
+                value, error = None, e
+            self._results.put(JobResult(key, token, value, error))
@@ -1,7 +1,11 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from habit_tracker.models import Habit
 from habit_tracker.analytics import (
+    completion_rate,
+    completions_between,
+    count_completions_between,
+    rolling_counts,
     longest_streak_for_habit,
     longest_streak_overall,
     longest_streak_overall_with_habit,
@@ -72,3 +76,27 @@ def test_filter_by_periodicity():
     ]
     daily = habits_by_periodicity(habits, "daily")
     assert [h.name for h in daily] == ["D1", "D2"]
+
+
+def test_completions_between_and_count():
+    h = Habit(name="Walk", periodicity="daily")
+    base = datetime(2026, 1, 1, 8, 0, 0)
+    for i in (4, 0, 2, 1, 3):  # out of order on purpose
+        h.add_completion(base + timedelta(days=i))
+
+    got = completions_between(h, date(2026, 1, 2), date(2026, 1, 4))
+    assert got == [datetime(2026, 1, 2, 8, 0), datetime(2026, 1, 3, 8, 0)]
+    assert count_completions_between(h, datetime(2026, 1, 1, 9, 0), date(2026, 2, 1)) == 4
+
+
+def test_completion_rate_and_rolling_counts():
+    h = Habit(name="Walk", periodicity="daily")
+    for day in (1, 2, 4, 5):
+        h.add_completion(datetime(2026, 1, day, 8, 0))
+
+    assert completion_rate(h, date(2026, 1, 1), date(2026, 1, 5)) == 4 / 5
+    assert completion_rate(h, date(2026, 1, 3), date(2026, 1, 3)) == 0.0
+
+    counts = rolling_counts(h, window=2, end=date(2026, 1, 6))
+    assert [c for _d, c in counts] == [1, 2, 1, 1, 2, 1]
+    assert counts[0][0] == date(2026, 1, 1)
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from habit_tracker.analytics_cache import AnalyticsCache
+from habit_tracker.fixtures import build_predefined_habits_with_4_weeks_data
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.tracker import HabitTracker
+
+
+def make_tracker(tmp_path: Path) -> HabitTracker:
+    tracker = HabitTracker(storage=JsonStorage(file_path=str(tmp_path / "data.json")))
+    tracker.load()
+    tracker.replace_all_habits(build_predefined_habits_with_4_weeks_data())
+    return tracker
+
+
+def test_repeated_queries_hit_the_cache(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    cache = AnalyticsCache(t)
+
+    assert cache.longest_overall_with_habit() == ("Brush teeth", 22)
+    misses = cache.misses
+    assert cache.longest_overall_with_habit() == ("Brush teeth", 22)
+    assert cache.misses == misses
+    assert cache.hits == 1
+
+
+def test_check_off_only_recomputes_the_changed_habit(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    cache = AnalyticsCache(t)
+    cache.longest_overall_with_habit()
+    assert cache.misses == 1 + 5  # overall + one per habit
+
+    t.check_off("Workout")
+    cache.longest_overall_with_habit()
+    assert cache.misses == 6 + 2  # new overall + Workout only
+    assert cache.hits == 4
+
+
+def test_recreated_habit_does_not_reuse_stale_entry(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    cache = AnalyticsCache(t)
+    assert cache.longest_streak(t.get_habit_by_name("Workout")) > 0
+
+    t.delete_habit("Workout")
+    t.create_habit("Workout", "daily")
+    assert cache.longest_streak(t.get_habit_by_name("Workout")) == 0
+
+
+def test_lru_is_bounded(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    cache = AnalyticsCache(t, maxsize=2)
+    for h in t.list_habits():
+        cache.longest_streak(h)
+    info = cache.cache_info()
+    assert info.currsize == 2
+    assert info.misses == 5
+
+
+def test_default_bound_grows_with_the_habit_count(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(AnalyticsCache, "DEFAULT_MAXSIZE", 2)
+    t = make_tracker(tmp_path)
+    cache = AnalyticsCache(t)
+    cache.longest_overall_with_habit()
+    t.check_off("Workout")
+    cache.longest_overall_with_habit()
+    assert cache.misses == 6 + 2  # nothing evicted between the passes
+    assert cache.cache_info().maxsize == 10
@@ -0,0 +1,48 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from habit_tracker.analytics import habit_stats, longest_streak_overall_with_habit
+from habit_tracker.analytics_vectorized import HAS_NUMPY, batch_stats
+from habit_tracker.analytics_vectorized import longest_streak_overall_with_habit as batch_longest_overall
+from habit_tracker.fixtures import build_predefined_habits_with_4_weeks_data
+from habit_tracker.models import Habit
+
+TODAY = date(2026, 3, 1)
+
+
+def random_habits(seed: int = 7):
+    rng = random.Random(seed)
+    habits = []
+    periodicities = ["daily", "weekly", "monthly", "every-3-days", "2-per-week", "sometimes"]
+    for i in range(60):
+        h = Habit(name=f"H{i}", periodicity=periodicities[i % len(periodicities)])
+        start = datetime(2025, 1, 1, 6, 0)
+        for d in range(rng.randint(0, 420)):
+            if rng.random() < 0.6:
+                h.add_completion(start + timedelta(days=d, hours=rng.randint(0, 15)))
+        habits.append(h)
+    return habits
+
+
+def test_fallback_matches_habit_stats():
+    habits = build_predefined_habits_with_4_weeks_data()
+    assert batch_stats(habits, TODAY, use_numpy=False) == [habit_stats(h, TODAY) for h in habits]
+
+
+def test_overall_matches_pure_python_without_numpy():
+    habits = random_habits()
+    assert batch_longest_overall(habits, use_numpy=False) == longest_streak_overall_with_habit(habits)
+
+
+@pytest.mark.skipif(not HAS_NUMPY, reason="NumPy not installed")
+def test_numpy_matches_pure_python():
+    habits = random_habits() + [Habit(name="Empty", periodicity="daily")]
+    for today in (TODAY, date(2025, 6, 15), date(2026, 2, 23)):
+        expected = batch_stats(habits, today, use_numpy=False)
+        actual = batch_stats(habits, today, use_numpy=True)
+        for e, a in zip(expected, actual):
+            assert e._replace(completion_rate=0) == a._replace(completion_rate=0)
+            assert a.completion_rate == pytest.approx(e.completion_rate)
+    assert batch_longest_overall(habits, use_numpy=True) == longest_streak_overall_with_habit(habits)
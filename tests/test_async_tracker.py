@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from habit_tracker.async_tracker import AsyncHabitTracker
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.tracker import HabitTracker
+
+
+class CountingStorage(JsonStorage):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path=file_path)
+        self.saves = 0
+
+    def save(self, habits, tasks) -> None:
+        self.saves += 1
+        super().save(habits, tasks)
+
+
+def reload(tmp_path: Path) -> HabitTracker:
+    t = HabitTracker(storage=JsonStorage(file_path=str(tmp_path / "data.json")))
+    t.load()
+    return t
+
+
+def test_concurrent_check_offs_share_one_write(tmp_path: Path):
+    storage = CountingStorage(str(tmp_path / "data.json"))
+    start = datetime(2026, 1, 1, 7)
+
+    async def main():
+        async with AsyncHabitTracker(storage) as tracker:
+            await tracker.load()
+            await tracker.create_habit("Workout", "daily")
+            saves = storage.saves
+            await asyncio.gather(*(tracker.check_off("Workout", start + timedelta(days=i)) for i in range(50)))
+            assert storage.saves == saves + 1
+            assert await tracker.longest_streak("Workout") == 50
+            assert (await tracker.stats("workout")).completions == 50
+            assert await tracker.longest_overall_with_habit() == ("Workout", 50)
+
+    asyncio.run(main())
+    assert len(reload(tmp_path).get_habit_by_name("Workout").completions) == 50
+
+
+def test_tasks_errors_and_durability(tmp_path: Path):
+    async def main():
+        async with AsyncHabitTracker(JsonStorage(file_path=str(tmp_path / "data.json"))) as tracker:
+            await tracker.load()
+            task = await tracker.create_task("Taxes", urgent=True, important=False)
+            await tracker.complete_task(task.id)
+            assert reload(tmp_path).get_task(task.id).completed is True  # written when the await returns
+            with pytest.raises(ValueError, match="Habit not found"):
+                await tracker.check_off("Nope")
+            with pytest.raises(ValueError, match="Habit not found"):
+                await tracker.longest_streak("Nope")
+            assert [t.title for t in tracker.list_tasks()] == ["Taxes"]
+
+    asyncio.run(main())
@@ -0,0 +1,38 @@
+import time
+
+from habit_tracker.bench import BenchResult, compare, run_benchmarks, to_json
+from habit_tracker.utils_time import US_PER_DAY, format_stamps, from_stamp
+
+
+def test_run_benchmarks_smoke():
+    results = run_benchmarks([5], years=0.1, min_time=0.0)
+    names = {r.name for r in results}
+    assert "JsonStorage.load" in names
+    assert "longest_streak_for_habit[weekly]" in names
+    assert all(r.ops >= 5 and r.p50_us <= r.p99_us for r in results)
+    assert to_json(results)["results"][0]["size"] == 5
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"results": [{"name": "op", "size": 10, "p50_us": 100.0}]}
+    slow = BenchResult("op", 10, 5, 1.0, 130.0, 150.0, 1.0)
+    ok = slow._replace(p50_us=120.0)
+    assert len(compare([slow], baseline, tolerance=0.25)) == 1
+    assert compare([ok], baseline, tolerance=0.25) == []
+
+
+def test_save_formats_stamps_well_under_datetime_cost():
+    # A full save formats every completion; keep it well below going
+    # through datetime.isoformat (a ~4x gap when this was written).
+    stamps = [day * US_PER_DAY + (7 * 3600 + day % 3600) * 1_000_000 for day in range(20_000, 20_365)] * 100
+
+    def best(op) -> float:
+        timings = []
+        for _ in range(3):
+            t0 = time.perf_counter()
+            op()
+            timings.append(time.perf_counter() - t0)
+        return min(timings)
+
+    naive = best(lambda: [from_stamp(s).isoformat() for s in stamps])
+    assert best(lambda: format_stamps(stamps)) < naive / 2
@@ -0,0 +1,88 @@
+import io
+from pathlib import Path
+
+from habit_tracker.commands import main
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.tracker import HabitTracker
+
+
+def run(tmp_path: Path, *argv: str, stdin: str = ""):
+    out, err = io.StringIO(), io.StringIO()
+    code = main(["--data", str(tmp_path / "data.json"), *argv], stdin=io.StringIO(stdin), out=out, err=err)
+    return code, out.getvalue(), err.getvalue()
+
+
+def load(tmp_path: Path) -> HabitTracker:
+    t = HabitTracker(storage=JsonStorage(file_path=str(tmp_path / "data.json")))
+    t.load()
+    return t
+
+
+def test_subcommands(tmp_path: Path):
+    assert run(tmp_path, "add", "Workout", "-p", "daily")[0] == 0
+    assert run(tmp_path, "checkoff", "Workout", "--at", "2026-01-01T07:00")[0] == 0
+    assert run(tmp_path, "checkoff", "Workout", "--at", "2026-01-02T07:00")[0] == 0
+    code, out, _ = run(tmp_path, "streaks", "workout")
+    assert code == 0 and "longest 2" in out
+
+    run(tmp_path, "tasks", "add", "Pay taxes", "--urgent", "--important")
+    code, out, _ = run(tmp_path, "tasks", "list", "--open")
+    task_id = out.split()[0]
+    assert "[Q1] Pay taxes" in out
+    assert run(tmp_path, "tasks", "done", task_id)[0] == 0
+    assert run(tmp_path, "tasks", "list", "--open")[1] == ""
+
+    code, _, err = run(tmp_path, "checkoff", "Nope")
+    assert code == 1 and "Habit not found." in err
+    assert run(tmp_path, "bogus")[0] == 2
+
+
+def test_missing_files_are_reported_not_raised(tmp_path: Path):
+    code, _, err = run(tmp_path, "import", str(tmp_path / "missing.csv"))
+    assert code == 1 and err.startswith("Error: ") and "missing.csv" in err
+
+    (tmp_path / "bad.csv").write_text("habit,ts\nRead," + "x" * 200_000 + "\n", encoding="utf-8")  # csv.Error
+    lines = ["add X", f"import {tmp_path / 'missing.csv'}", f"import {tmp_path / 'bad.csv'}", "add Y"]
+    code, _, err = run(tmp_path, "--batch", stdin="\n".join(lines))
+    assert code == 1
+    assert [line.split(":")[0] for line in err.splitlines()] == ["line 2", "line 3"]
+    assert [h.name for h in load(tmp_path).list_habits()] == ["X", "Y"]
+
+
+def test_batch_applies_everything_and_saves_once(tmp_path: Path, monkeypatch):
+    saves = []
+    original = JsonStorage.save
+    monkeypatch.setattr(JsonStorage, "save", lambda self, h, t: saves.append(1) or original(self, h, t))
+
+    lines = ["add Workout", "# comment", "", 'add "Read a book" -p weekly']
+    lines += [f"checkoff Workout --at 2026-01-{day:02d}T07:00" for day in range(20, 0, -1)]
+    lines += ["checkoff Nope", "tasks add 'Call mom'", "checkoff 'Read a book'"]
+    code, _, err = run(tmp_path, "--batch", stdin="\n".join(lines))
+
+    assert code == 1 and err.strip() == "line 25: Habit not found."
+    assert len(saves) == 1
+    t = load(tmp_path)
+    assert len(t.get_habit_by_name("Workout").completions) == 20
+    assert t.get_habit_by_name("Workout").longest_streak == 20
+    assert len(t.get_habit_by_name("Read a book").completions) == 1
+    assert [task.title for task in t.list_tasks()] == ["Call mom"]
+
+
+def test_batch_checkoffs_record_repeats_like_single_commands(tmp_path: Path):
+    run(tmp_path, "add", "Read")
+    for _ in range(2):
+        run(tmp_path, "checkoff", "Read", "--at", "2026-01-05T07:00")
+    run(tmp_path, "--batch", stdin="checkoff Read --at 2026-01-06T07:00\ncheckoff Read --at 2026-01-06T07:00\n")
+    assert load(tmp_path).get_habit_by_name("Read").completions == [
+        "2026-01-05T07:00:00", "2026-01-05T07:00:00", "2026-01-06T07:00:00", "2026-01-06T07:00:00",
+    ]
+
+
+def test_profile_startup_reruns_the_command_without_the_flag(tmp_path: Path, monkeypatch):
+    calls = []
+    monkeypatch.setattr("habit_tracker.startup.profile_startup", lambda argv, err: calls.append(argv) or 3)
+    assert run(tmp_path, "--profile-startup", "list")[0] == 3
+    assert calls == [["--data", str(tmp_path / "data.json"), "list"]]
+
+    code, _, err = run(tmp_path, "--batch", stdin="--profile-startup list\n")
+    assert code == 1 and "line 1:" in err
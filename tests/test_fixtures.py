@@ -1,4 +1,12 @@
-from habit_tracker.fixtures import build_predefined_habits_with_4_weeks_data
+from datetime import datetime
+
+from habit_tracker.fixtures import (
+    build_predefined_habits_with_4_weeks_data,
+    iter_synthetic_habit_records,
+    write_synthetic_dataset,
+)
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.storage_sqlite import SqliteStorage
 
 
 def test_fixtures_create_five_habits():
@@ -6,3 +14,36 @@ def test_fixtures_create_five_habits():
     assert len(habits) == 5
     assert any(h.periodicity == "daily" for h in habits)
     assert any(h.periodicity == "weekly" for h in habits)
+
+
+def test_synthetic_records_are_seeded_and_configurable():
+    a = list(iter_synthetic_habit_records(n_habits=6, years=0.5, seed=3))
+    b = list(iter_synthetic_habit_records(n_habits=6, years=0.5, seed=3))
+    assert a == b
+    assert {r["periodicity"] for r in a} == {"daily", "weekly"}
+
+    weekly = next(iter_synthetic_habit_records(n_habits=1, years=0.5, pattern="weekly", completion_probability=1.0))
+    # 182 days from a Thursday touch 27 ISO weeks: exactly one completion in each.
+    weeks = [datetime.fromisoformat(ts).isocalendar()[:2] for ts in weekly["completions"]]
+    assert len(weeks) == len(set(weeks)) == 27
+
+
+def test_synthetic_injects_duplicates_and_out_of_order_entries():
+    record = next(
+        iter_synthetic_habit_records(n_habits=1, pattern="random", duplicate_rate=0.2, out_of_order_rate=0.2)
+    )
+    completions = record["completions"]
+    assert len(set(completions)) < len(completions)
+    assert completions != sorted(completions)
+
+
+def test_write_synthetic_dataset_to_path_and_storage(tmp_path):
+    path = tmp_path / "data.json"
+    write_synthetic_dataset(str(path), n_habits=20, years=0.25, n_tasks=7)
+    habits, tasks = JsonStorage(file_path=str(path)).load()
+    assert len(habits) == 20 and len(tasks) == 7
+
+    sqlite = SqliteStorage(file_path=str(tmp_path / "data.sqlite3"))
+    write_synthetic_dataset(sqlite, n_habits=20, years=0.25, n_tasks=7)
+    habits2, _tasks = sqlite.load()
+    assert [h.to_dict() for h in habits2] == [h.to_dict() for h in habits]
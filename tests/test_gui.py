@@ -0,0 +1,25 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from habit_tracker.gui import HabitTrackerGUI
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.threadsafe import ThreadSafeHabitTracker
+from habit_tracker.worker import BackgroundWorker
+
+
+def test_close_writes_changes_still_waiting_for_write_behind(tmp_path: Path):
+    path = str(tmp_path / "data.json")
+    tracker = ThreadSafeHabitTracker(storage=JsonStorage(file_path=path, lazy=True), write_behind=60.0)
+    tracker.load()
+    tracker.create_habit("Read", "daily")
+    destroyed = []
+    window = SimpleNamespace(worker=BackgroundWorker(), tracker=tracker, destroy=lambda: destroyed.append(True))
+
+    HabitTrackerGUI.on_close(window)
+
+    assert destroyed == [True]
+    assert [h.name for h in JsonStorage(file_path=path).load_habits()] == ["Read"]
@@ -1,4 +1,7 @@
+from datetime import datetime
+
 from habit_tracker.models import Habit
+from habit_tracker.utils_time import format_stamps, to_stamp
 
 
 def test_add_completion_adds_timestamp():
@@ -6,3 +9,87 @@ def test_add_completion_adds_timestamp():
     habit.add_completion()
 
     assert len(habit.completions) == 1
+
+
+def test_to_dict_from_dict_roundtrip_keeps_iso_strings():
+    raw = {
+        "name": "Read",
+        "periodicity": "daily",
+        "description": "",
+        "created_at": "2026-01-10T13:32:45.077269",
+        "completions": ["2026-01-02T09:00:00", "2026-02-02T09:08:42.317436"],
+        "is_active": True,
+    }
+    habit = Habit.from_dict(raw)
+    out = habit.to_dict()
+    out.pop("streak")
+    assert out == raw
+    assert list(habit.stamps) == sorted(habit.stamps)
+
+
+def test_stamps_format_like_isoformat():
+    moments = [
+        datetime(1969, 12, 31, 23, 59, 59, 999999),
+        datetime(1970, 1, 1),
+        datetime(2024, 2, 29, 0, 0, 0, 1),
+        datetime(2026, 1, 2, 9, 8, 42),
+    ]
+    stamps = [to_stamp(m) for m in moments]
+    assert format_stamps(stamps) == [m.isoformat() for m in moments]
+
+
+def test_completions_kept_sorted_on_backdated_insert():
+    habit = Habit(name="Walk", periodicity="daily")
+    habit.completions.append("2026-01-03T08:00:00")
+    habit.completions.append("2026-01-01T08:00:00")
+    habit.completions.append("2026-01-02T08:00:00")
+
+    assert list(habit.completions) == [
+        "2026-01-01T08:00:00",
+        "2026-01-02T08:00:00",
+        "2026-01-03T08:00:00",
+    ]
+
+
+def test_streak_state_updates_incrementally_and_on_backdated_insert():
+    habit = Habit(name="Walk", periodicity="daily")
+    for day in (1, 2, 3, 5, 6):
+        habit.add_completion(datetime(2026, 1, day, 8, 0))
+    assert (habit.current_streak, habit.longest_streak) == (2, 3)
+
+    habit.add_completion(datetime(2026, 1, 4, 8, 0))  # backdated: fills the gap
+    assert (habit.current_streak, habit.longest_streak) == (6, 6)
+
+
+def test_streak_state_is_persisted_and_validated():
+    habit = Habit(name="Walk", periodicity="daily")
+    habit.add_completion(datetime(2026, 1, 1, 8, 0))
+    habit.add_completion(datetime(2026, 1, 2, 8, 0))
+    data = habit.to_dict()
+    assert data["streak"]["longest"] == 2
+
+    assert Habit.from_dict(data).longest_streak == 2
+
+    # A stale state (history edited by hand) is ignored and recomputed.
+    data["completions"].append("2026-01-03T08:00:00")
+    assert Habit.from_dict(data).longest_streak == 3
+
+
+def test_lazy_habit_loads_completions_on_first_use():
+    source = Habit(name="Read", periodicity="daily", completions=["2026-01-01T08:00:00", "2026-01-02T08:00:00"])
+    record = source.to_dict()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return record["completions"]
+
+    habit = Habit.lazy(record, 2, loader)
+    assert len(habit.completions) == 2
+    assert habit.longest_streak == 2  # from the saved streak state
+    assert habit.to_dict()["completions"] == record["completions"]
+    assert not habit.is_loaded and calls == [1]
+
+    habit.add_completion(datetime(2026, 1, 3, 8, 0))
+    assert habit.is_loaded and calls == [1, 1]
+    assert habit.current_streak == 3
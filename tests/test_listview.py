@@ -0,0 +1,73 @@
+from habit_tracker.listview import ListModel, PrefixIndex
+from habit_tracker.models import Task
+
+
+def test_prefix_index_matches_every_query_word():
+    index = PrefixIndex()
+    index.set("a", "Read a book")
+    index.set("b", "Book club")
+    index.set("c", "Workout")
+    assert index.search("boo") == {"a", "b"}
+    assert index.search("bo re") == {"a"}
+    assert index.search("") == {"a", "b", "c"}
+
+    index.set("a", "Meditate")
+    index.discard("c")
+    assert index.search("boo") == {"b"}
+    assert index.search("work") == set()
+
+
+def make_model(tasks):
+    by_id = {t.id: t for t in tasks}
+    formatted = []
+
+    def fmt(t):
+        formatted.append(t.id)
+        return t.title.upper()
+
+    model = ListModel(
+        items=lambda: list(by_id.values()),
+        get=by_id.get,
+        key=lambda t: t.id,
+        fmt=fmt,
+        text=lambda t: t.title,
+    )
+    return model, by_id, formatted
+
+
+def test_window_formats_only_visible_rows_once():
+    tasks = [Task(title=f"Task {i}", urgent=False, important=False) for i in range(100)]
+    model, _by_id, formatted = make_model(tasks)
+
+    assert len(model) == 100
+    assert [row for _k, row in model.window(10, 3)] == ["TASK 10", "TASK 11", "TASK 12"]
+    model.window(10, 3)
+    assert formatted == [t.id for t in tasks[10:13]]
+
+
+def test_apply_updates_only_given_keys_and_search():
+    tasks = [Task(title=title, urgent=False, important=False) for title in ("Pay taxes", "Call mom", "Pay rent")]
+    model, by_id, formatted = make_model(tasks)
+    model.window(0, 3)
+
+    renamed = Task(title="Pay bills", id=tasks[1].id, urgent=False, important=False)
+    by_id[renamed.id] = renamed
+    del by_id[tasks[0].id]
+    model.apply([tasks[0].id, renamed.id])
+
+    assert [row for _k, row in model.window(0, 3)] == ["PAY BILLS", "PAY RENT"]
+    assert formatted.count(tasks[2].id) == 1  # untouched row stays cached
+
+    model.set_query("pay")
+    assert model.keys() == [renamed.id, tasks[2].id]
+    model.set_query("pay re")
+    assert model.keys() == [tasks[2].id]
+
+
+def test_search_skips_items_removed_before_their_change_is_applied():
+    tasks = [Task(title=title, urgent=False, important=False) for title in ("Pay taxes", "Pay rent")]
+    model, by_id, _formatted = make_model(tasks)
+    del by_id[tasks[0].id]  # e.g. merged away on the write-behind thread
+
+    model.set_query("pay")
+    assert model.keys() == [tasks[1].id]
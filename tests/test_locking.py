@@ -0,0 +1,46 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from habit_tracker.locking import FileLock, file_signature, lock_path_for
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="flock semantics")
+def test_lock_excludes_other_holders_and_is_reentrant(tmp_path: Path):
+    import fcntl
+
+    lock = FileLock(tmp_path / "data.json.lock")
+
+    def held_elsewhere() -> bool:
+        fd = os.open(lock.path, os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        finally:
+            os.close(fd)
+        return False
+
+    with lock:
+        with lock:
+            assert held_elsewhere()
+        assert held_elsewhere()
+    assert not held_elsewhere()
+
+
+def test_signature_changes_on_rewrite(tmp_path: Path):
+    path = tmp_path / "data.json"
+    assert file_signature(path) is None
+    path.write_text("{}", encoding="utf-8")
+    first = file_signature(path)
+    path.write_text('{"habits": []}', encoding="utf-8")
+    assert file_signature(path) != first
+
+
+def test_lock_path_is_shared_per_data_file(tmp_path: Path):
+    path = tmp_path / "data.json"
+    assert lock_path_for(path) == lock_path_for(tmp_path / "sub" / ".." / "data.json")
+    assert lock_path_for(path) != lock_path_for(tmp_path / "other.json")
+    assert lock_path_for(path).parent != tmp_path
@@ -0,0 +1,96 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from habit_tracker.analytics import current_streak_for_habit, longest_streak_for_habit
+from habit_tracker.models import Habit
+from habit_tracker.periodicity import normalize_periodicity, parse_periodicity
+
+
+def make_habit(periodicity: str, days, created_at=None) -> Habit:
+    habit = Habit(name="H", periodicity=periodicity, created_at=created_at)
+    for d in days:
+        habit.add_completion(d)
+    return habit
+
+
+def test_parse_and_normalize():
+    assert normalize_periodicity(" Daily ") == "daily"
+    assert normalize_periodicity("every 3 days") == "every-3-days"
+    assert normalize_periodicity("3x per week") == "3-per-week"
+    assert normalize_periodicity("every-1-days") == "daily"
+    assert parse_periodicity("monthly").unit == "month"
+    with pytest.raises(ValueError):
+        parse_periodicity("fortnightly")
+    with pytest.raises(ValueError):
+        parse_periodicity("8-per-week")
+
+
+def test_weekly_streak_across_iso_year_boundary():
+    # 2026-12-28 is in ISO week 53 of 2026; 2027-01-04 starts week 1 of 2027.
+    habit = make_habit("weekly", [datetime(2026, 12, 21), datetime(2026, 12, 28), datetime(2027, 1, 4)])
+    assert longest_streak_for_habit(habit) == 3
+
+
+def test_monthly_streak():
+    habit = make_habit(
+        "monthly",
+        [datetime(2025, 11, 30), datetime(2025, 12, 1), datetime(2026, 1, 31), datetime(2026, 3, 1)],
+    )
+    assert longest_streak_for_habit(habit) == 3
+    assert habit.current_streak == 1
+
+
+def test_every_n_days_streak():
+    start = datetime(2026, 1, 1)
+    habit = make_habit("every-3-days", [start + timedelta(days=d) for d in (0, 4, 8, 15)], created_at=start)
+    assert longest_streak_for_habit(habit) == 3
+
+
+def test_every_n_days_periods_start_on_the_creation_day():
+    created = datetime(2026, 1, 2, 18, 30)  # periods: Jan 2-4, Jan 5-7, ...
+    last_of_first, first_of_second = datetime(2026, 1, 4, 23, 59), datetime(2026, 1, 5, 0, 1)
+    habit = make_habit("every-3-days", [last_of_first, first_of_second], created_at=created)
+    assert habit.longest_streak == 2
+    assert make_habit("every-3-days", [created, last_of_first], created_at=created).longest_streak == 1
+
+    # Same days, periods counted from Jan 3: both fall in Jan 3-5.
+    later = make_habit("every-3-days", [last_of_first, first_of_second], created_at=datetime(2026, 1, 3))
+    assert later.longest_streak == 1
+    assert current_streak_for_habit(habit, today=date(2026, 1, 10)) == 2
+    assert current_streak_for_habit(habit, today=date(2026, 1, 11)) == 0
+
+
+def test_saved_streak_from_another_period_layout_is_rescanned():
+    created = datetime(2026, 1, 2)  # day 20455: periods don't line up with 1970-01-01
+    habit = make_habit("every-3-days", [datetime(2026, 1, 4), datetime(2026, 1, 5)], created_at=created)
+    record = habit.to_dict()
+    stale = {**record, "streak": {**record["streak"], "current": 1, "longest": 1}}
+    assert Habit.from_dict(stale).longest_streak == 1  # same anchor: trusted as saved
+    del stale["streak"]["anchor"]  # written before periods were anchored
+    assert Habit.from_dict(stale).longest_streak == 2
+
+
+def test_times_per_week_requires_enough_distinct_days():
+    monday = datetime(2026, 1, 5)
+    days = [monday, monday + timedelta(days=2), monday + timedelta(days=2, hours=3)]  # 2 distinct days
+    days += [monday + timedelta(days=7 + d) for d in (0, 1, 2)]  # 3 distinct days
+    days += [monday + timedelta(days=14 + d) for d in (1, 3, 5)]  # 3 distinct days
+    habit = make_habit("3-per-week", days)
+    assert longest_streak_for_habit(habit) == 2
+
+    # Backdated completion makes the first week qualify too.
+    habit.add_completion(monday + timedelta(days=4))
+    assert longest_streak_for_habit(habit) == 3
+
+
+def test_incremental_state_matches_full_scan():
+    start = datetime(2026, 1, 1, 7, 0)
+    offsets = [0, 1, 1, 2, 5, 6, 7, 8, 13, 14, 20, 21, 22, 23, 40]
+    for periodicity in ("daily", "weekly", "monthly", "every-2-days", "2-per-week"):
+        habit = make_habit(periodicity, [start + timedelta(days=d) for d in offsets])
+        rescanned = Habit.from_dict({**habit.to_dict(), "streak": None})
+        assert (habit.current_streak, habit.longest_streak) == (
+            rescanned.current_streak,
+            rescanned.longest_streak,
+        ), periodicity
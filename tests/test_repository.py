@@ -0,0 +1,63 @@
+from habit_tracker.models import Habit, Task
+from habit_tracker.repository import HabitRepository, TaskRepository
+
+
+def test_habit_indexes_follow_mutations():
+    a = Habit(name="Read", periodicity="daily")
+    b = Habit(name="Swim", periodicity="weekly", is_active=False)
+    c = Habit(name="Walk", periodicity="daily")
+    repo = HabitRepository([a, b, c])
+
+    assert repo.get("  read ") is a
+    assert repo.by_periodicity("daily") == [a, c]
+    assert repo.by_active(False) == [b]
+
+    repo.remove(a)
+    assert repo.get("Read") is None
+    assert repo.by_periodicity("daily") == [c]
+
+    b.is_active = True
+    repo.reindex(b, b.name, b.periodicity, old_active=False)
+    assert repo.by_active(True) == [c, b]  # re-indexed habits move to the end
+    assert repo.all() == [b, c]
+
+
+def test_duplicate_legacy_names_are_kept_and_first_wins():
+    first = Habit(name="Read", periodicity="daily")
+    second = Habit(name="read", periodicity="weekly")
+    repo = HabitRepository([first, second])
+
+    assert len(repo) == 2
+    assert repo.get("READ") is first
+    repo.remove(first)
+    assert repo.get("READ") is second
+
+
+def test_task_indexes():
+    q1 = Task(title="A", urgent=True, important=True)
+    q4 = Task(title="B", urgent=False, important=False)
+    repo = TaskRepository([q1, q4])
+
+    assert repo.by_quadrant(1) == [q1]
+    assert repo.at(2) is q4
+
+    repo.set_completed(q4)
+    assert repo.by_completed(True) == [q4]
+    assert repo.by_completed(False) == [q1]
+
+    repo.remove(q1)
+    assert repo.by_quadrant(1) == []
+
+
+def test_due_index_keeps_ties_and_reopened_tasks():
+    a = Task(title="A", urgent=False, important=False, due_datetime="12/01/26 10:00")
+    b = Task(title="B", urgent=False, important=False, due_datetime="12/01/26 10:00")
+    c = Task(title="C", urgent=False, important=False, due_datetime="10/01/26 10:00")
+    repo = TaskRepository([a, b, c])
+
+    assert repo.due_between(None, None) == [c, a, b]
+    repo.set_completed(a)
+    assert repo.due_between(None, None) == [c, b]
+    repo.set_completed(a, False)
+    assert repo.due_between(None, None) == [c, b, a]
+    assert repo.next_due(a.due_stamp) is b
@@ -0,0 +1,170 @@
+import http.client
+import json
+import threading
+from pathlib import Path
+
+from habit_tracker.loadtest import run_load
+from habit_tracker.server import TrackerAPI, TrackerHTTPServer
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.storage_sqlite import SqliteStorage
+from habit_tracker.threadsafe import ThreadSafeHabitTracker
+
+
+def make_tracker(tmp_path: Path) -> ThreadSafeHabitTracker:
+    tracker = ThreadSafeHabitTracker(storage=JsonStorage(file_path=str(tmp_path / "data.json")))
+    tracker.load()
+    return tracker
+
+
+def start_server(tmp_path: Path) -> TrackerHTTPServer:
+    server = TrackerHTTPServer(("127.0.0.1", 0), make_tracker(tmp_path))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_server(server: TrackerHTTPServer) -> None:
+    server.shutdown()
+    server.server_close()
+    server.api.tracker.close()
+
+
+def test_habit_routes_and_conditional_gets(tmp_path: Path):
+    api = TrackerAPI(make_tracker(tmp_path))
+    created = api.handle("POST", "/habits", b'{"name": "Morning Run", "periodicity": "daily"}')
+    assert created.status == 201 and json.loads(created.body)["name"] == "Morning Run"
+
+    listing = api.handle("GET", "/habits")
+    assert [h["name"] for h in json.loads(listing.body)] == ["Morning Run"]
+    assert api.handle("GET", "/habits", if_none_match=listing.etag).status == 304
+
+    stats = api.handle("GET", "/habits/Morning%20Run/stats")
+    assert api.handle("GET", "/habits/Morning%20Run/stats", if_none_match=stats.etag).status == 304
+    other = api.handle("POST", "/habits", b'{"name": "Swim", "periodicity": "weekly"}')
+    assert other.status == 201
+    # Another habit changed: this habit's stats are still current, the listing is not.
+    assert api.handle("GET", "/habits/Morning%20Run/stats", if_none_match=stats.etag).status == 304
+    assert api.handle("GET", "/habits", if_none_match=listing.etag).status == 200
+
+    done = api.handle("POST", "/habits/Morning%20Run/checkoff", b'{"ts": "2026-01-05T07:00"}')
+    assert done.status == 200
+    fresh = api.handle("GET", "/habits/Morning%20Run/stats", if_none_match=stats.etag)
+    assert fresh.status == 200 and json.loads(fresh.body)["completions"] == 1
+    assert json.loads(api.handle("GET", "/analytics/longest").body) == {"habit": "Morning Run", "streak": 1}
+    assert json.loads(api.handle("GET", "/habits/morning%20run").body)["completions"] == ["2026-01-05T07:00:00"]
+
+    assert api.handle("DELETE", "/habits/Swim").status == 204
+    assert api.handle("GET", "/habits/Swim").status == 404
+
+
+def test_etags_do_not_survive_a_restart_and_other_writers_show_up(tmp_path: Path):
+    api = TrackerAPI(make_tracker(tmp_path))
+    api.handle("POST", "/habits", b'{"name": "A"}')
+    etag = api.handle("GET", "/habits").etag
+
+    other = make_tracker(tmp_path)  # e.g. the CLI, while the server runs
+    other.create_habit("B", "daily")
+    api.REFRESH_INTERVAL = 0.0
+    listing = api.handle("GET", "/habits", if_none_match=etag)
+    assert listing.status == 200 and [h["name"] for h in json.loads(listing.body)] == ["A", "B"]
+
+    # A restarted server starts its version counters over.
+    other.create_habit("C", "daily")
+    restarted = TrackerAPI(make_tracker(tmp_path))
+    assert restarted.handle("GET", "/habits", if_none_match=listing.etag).status == 200
+
+
+def test_errors_map_to_status_codes(tmp_path: Path):
+    api = TrackerAPI(make_tracker(tmp_path))
+    assert api.handle("GET", "/nope").status == 404
+    assert api.handle("POST", "/habits/Ghost/checkoff").status == 404
+    assert api.handle("POST", "/habits", b"{not json").status == 400
+    bad = api.handle("POST", "/habits", b'{"name": "Read", "periodicity": "hourly"}')
+    assert bad.status == 400 and "error" in json.loads(bad.body)
+    assert api.handle("GET", "/tasks?completed=maybe").status == 400
+    assert api.handle("POST", "/tasks", b'{"title": "Taxes", "due": 5}').status == 400
+    assert api.handle("POST", "/tasks", b'{"title": "Taxes", "urgent": "false"}').status == 400
+    assert api.handle("POST", "/habits/Read/checkoff", b'{"ts": 1}').status == 400
+    assert api.tracker.list_tasks() == []
+
+
+def test_task_routes(tmp_path: Path):
+    api = TrackerAPI(make_tracker(tmp_path))
+    task = json.loads(api.handle("POST", "/tasks", b'{"title": "Taxes", "urgent": true, "important": true}').body)
+    assert task["quadrant"] == 1
+
+    open_tasks = api.handle("GET", "/tasks?completed=false")
+    assert [t["id"] for t in json.loads(open_tasks.body)] == [task["id"]]
+    assert api.handle("POST", f"/tasks/{task['id']}/complete").status == 200
+    assert api.handle("GET", "/tasks?completed=false", if_none_match=open_tasks.etag).body == b"[]"
+    assert api.handle("GET", "/tasks/due").etag is None
+    assert api.handle("DELETE", f"/tasks/{task['id']}").status == 204
+
+
+def test_server_keeps_connections_alive_and_answers_304(tmp_path: Path):
+    server = start_server(tmp_path)
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        conn.request("POST", "/habits", body=b'{"name": "Read"}', headers={"Content-Type": "application/json"})
+        created = conn.getresponse()
+        assert created.status == 201 and json.loads(created.read())["periodicity"] == "daily"
+        conn.request("GET", "/habits")
+        first = conn.getresponse()
+        assert first.status == 200 and json.loads(first.read())[0]["name"] == "Read"
+        etag = first.getheader("ETag")
+
+        sock = conn.sock
+        conn.request("GET", "/habits", headers={"If-None-Match": etag})
+        again = conn.getresponse()
+        assert again.status == 304 and again.read() == b"" and again.getheader("ETag") == etag
+        assert conn.sock is sock  # same connection throughout
+        conn.close()
+    finally:
+        stop_server(server)
+
+    reloaded = make_tracker(tmp_path)
+    assert reloaded.get_habit_by_name("Read") is not None
+
+
+def test_unexpected_errors_answer_500_and_keep_the_connection(tmp_path: Path, monkeypatch):
+    server = start_server(tmp_path)
+    monkeypatch.setattr(server.api, "_write", lambda *args: 1 / 0)
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        conn.request("POST", "/habits", body=b'{"name": "Read"}')
+        failed = conn.getresponse()
+        assert failed.status == 500 and "error" in json.loads(failed.read())
+        conn.request("GET", "/habits")
+        assert conn.getresponse().status == 200
+        conn.close()
+    finally:
+        stop_server(server)
+
+
+def test_serves_sqlite_storage_from_handler_threads(tmp_path: Path):
+    tracker = ThreadSafeHabitTracker(storage=SqliteStorage(file_path=str(tmp_path / "data.sqlite3"), lazy=True))
+    tracker.load()
+    server = TrackerHTTPServer(("127.0.0.1", 0), tracker)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        conn.request("POST", "/habits", body=b'{"name": "Read"}')
+        created = conn.getresponse()
+        assert created.status == 201 and created.read()
+        conn.request("POST", "/habits/Read/checkoff", body=b'{"ts": "2026-01-05T07:00"}')
+        assert conn.getresponse().status == 200
+        conn.close()
+    finally:
+        stop_server(server)
+    assert SqliteStorage(file_path=str(tmp_path / "data.sqlite3")).get_habit("Read").completions == ["2026-01-05T07:00:00"]
+
+
+def test_load_test_smoke(tmp_path: Path):
+    server = start_server(tmp_path)
+    try:
+        server.api.tracker.create_habit("Read", "daily")
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        result = run_load(url, threads=2, seconds=0.3, write_ratio=0.1)
+    finally:
+        stop_server(server)
+    assert result.errors == 0 and result.requests > 0
+    assert result.statuses.get(304, 0) > 0
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from habit_tracker.startup import LAZY_MODULES, parse_importtime
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_cli_entry_points_do_not_load_gui_fixtures_or_heavy_analytics():
+    code = (
+        "import sys\n"
+        "import habit_tracker.main, habit_tracker.cli, habit_tracker.commands\n"
+        f"print(sorted(m for m in {LAZY_MODULES + ('uuid', 'tempfile')!r} if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_parse_importtime():
+    records, other = parse_importtime([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   _json",
+        "import time:       300 |        420 | json",
+        "Error: Habit not found.",
+    ])
+    assert [(r.module, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+        ("_json", 120, 120, 1),
+        ("json", 300, 420, 0),
+    ]
+    assert other == ["Error: Habit not found."]
@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from habit_tracker.fixtures import build_predefined_habits_with_4_weeks_data
+from habit_tracker.models import Task
+from habit_tracker.storage_binary import (
+    BinarySnapshot,
+    BinaryStorage,
+    binary_to_json,
+    json_to_binary,
+    write_snapshot,
+)
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.tracker import HabitTracker
+
+
+def test_snapshot_roundtrip_and_zero_copy_views(tmp_path: Path):
+    habits = build_predefined_habits_with_4_weeks_data()
+    tasks = [Task(title="Taxes", urgent=True, important=True, due_datetime="12/01/26 14:30")]
+    path = tmp_path / "data.htsnap"
+    write_snapshot(path, habits, tasks)
+
+    loaded_habits, loaded_tasks = BinaryStorage(file_path=str(path)).load()
+    assert loaded_habits == habits
+    assert [t.to_dict() for t in loaded_tasks] == [t.to_dict() for t in tasks]
+
+    with BinarySnapshot(path) as snapshot:
+        view = snapshot.view_of("workout")
+        assert list(view) == list(habits[0].stamps)
+        assert len(snapshot.column) == sum(len(h.stamps) for h in habits)
+        view.release()
+
+
+def test_lazy_storage_with_tracker(tmp_path: Path):
+    path = tmp_path / "data.htsnap"
+    write_snapshot(path, build_predefined_habits_with_4_weeks_data(), [])
+
+    storage = BinaryStorage(file_path=str(path), lazy=True)
+    t = HabitTracker(storage=storage)
+    t.load()
+    assert not any(h.is_loaded for h in t.list_habits())
+
+    t.check_off("Workout")
+    storage.close()
+    t2 = HabitTracker(storage=BinaryStorage(file_path=str(path)))
+    t2.load()
+    assert len(t2.get_habit_by_name("Workout").completions) == 25
+    assert len(t2.get_habit_by_name("Read a book").completions) == len(
+        t.get_habit_by_name("Read a book").completions
+    )
+
+
+def test_json_conversion_roundtrip(tmp_path: Path):
+    json_path = tmp_path / "data.json"
+    JsonStorage(file_path=str(json_path)).save(build_predefined_habits_with_4_weeks_data(), [])
+
+    json_to_binary(json_path, tmp_path / "data.htsnap")
+    binary_to_json(tmp_path / "data.htsnap", tmp_path / "back.json")
+
+    assert json.loads((tmp_path / "back.json").read_text(encoding="utf-8")) == json.loads(
+        json_path.read_text(encoding="utf-8")
+    )
+
+
+def test_rejects_other_files_and_versions(tmp_path: Path):
+    path = tmp_path / "data.htsnap"
+    path.write_bytes(b"{" * 64)
+    with pytest.raises(ValueError):
+        BinarySnapshot(path)
+
+    write_snapshot(path, [], [])
+    raw = bytearray(path.read_bytes())
+    raw[8] = 99
+    path.write_bytes(bytes(raw))
+    with pytest.raises(ValueError, match="version"):
+        BinarySnapshot(path)
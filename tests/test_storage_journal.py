@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+from habit_tracker.models import Task
+from habit_tracker.storage_journal import JournalStorage, replay
+from habit_tracker.tracker import HabitTracker
+
+
+def make_tracker(tmp_path: Path, **kwargs) -> HabitTracker:
+    storage = JournalStorage(file_path=str(tmp_path / "data.json"), **kwargs)
+    tracker = HabitTracker(storage=storage)
+    tracker.load()
+    return tracker
+
+
+def test_mutations_append_records_and_replay(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Read", "daily")
+    t.check_off("Read")
+    t.create_task("Call mom", urgent=True, important=False)
+    t.mark_task_completed(1)
+
+    # Nothing but the log has been written so far.
+    assert not (tmp_path / "data.json").exists()
+    lines = (tmp_path / "data.json.log").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["op"] for line in lines] == [
+        "habit_add",
+        "check_off",
+        "task_add",
+        "task_complete",
+    ]
+
+    t2 = make_tracker(tmp_path)
+    habit = t2.get_habit_by_name("read")
+    assert habit is not None
+    assert len(habit.completions) == 1
+    assert t2.list_tasks()[0].completed is True
+
+
+def test_compaction_writes_snapshot_and_truncates_log(tmp_path: Path):
+    t = make_tracker(tmp_path, compact_after_bytes=200)
+    t.create_habit("Walk", "daily")
+    for _ in range(5):
+        t.check_off("Walk")
+
+    assert (tmp_path / "data.json").exists()
+    assert (tmp_path / "data.json.log").stat().st_size <= 200
+
+    t2 = make_tracker(tmp_path)
+    assert len(t2.get_habit_by_name("Walk").completions) == 5
+
+
+def test_records_already_in_snapshot_are_not_replayed_twice(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Walk", "daily")
+    t.check_off("Walk")
+    log = (tmp_path / "data.json.log").read_text(encoding="utf-8")
+
+    # Simulate a crash after the snapshot was written but before the log was truncated.
+    t.save()
+    (tmp_path / "data.json.log").write_text(log, encoding="utf-8")
+
+    t2 = make_tracker(tmp_path)
+    assert len(t2.list_habits()) == 1
+    assert len(t2.get_habit_by_name("Walk").completions) == 1
+
+
+def test_torn_last_line_is_ignored(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Walk", "daily")
+    with (tmp_path / "data.json.log").open("a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "op": "check_')
+
+    t2 = make_tracker(tmp_path)
+    assert len(t2.get_habit_by_name("Walk").completions) == 0
+
+
+def test_append_after_torn_tail_starts_a_new_line(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("A", "daily")
+    t.create_habit("B", "daily")
+    log = tmp_path / "data.json.log"
+    log.write_bytes(log.read_bytes()[:-10])  # crash in the middle of the second append
+
+    t2 = make_tracker(tmp_path)
+    t2.create_habit("C", "daily")
+    t2.create_habit("D", "daily")
+
+    t3 = make_tracker(tmp_path)
+    assert [h.name for h in t3.list_habits()] == ["A", "C", "D"]
+
+
+def test_replay_accepts_legacy_index_records():
+    tasks = [Task(title="A", urgent=False, important=False), Task(title="B", urgent=False, important=False)]
+    replay([], tasks, [{"op": "task_complete", "index": 2}, {"op": "task_delete", "index": 1}])
+    assert [(t.title, t.completed) for t in tasks] == [("B", True)]
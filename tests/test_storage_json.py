@@ -1,6 +1,8 @@
 import json
+import tracemalloc
 from pathlib import Path
 
+from habit_tracker.fixtures import write_synthetic_dataset
 from habit_tracker.storage_json import JsonStorage
 from habit_tracker.models import Habit
 
@@ -20,3 +22,46 @@ def test_save_and_load_habits_roundtrip(tmp_path: Path):
     # also ensure JSON has expected top-level key
     raw = json.loads(file_path.read_text(encoding="utf-8"))
     assert "habits" in raw
+
+
+def test_lazy_load_keeps_history_untouched_until_needed(tmp_path: Path):
+    file_path = tmp_path / "data.json"
+    JsonStorage(file_path=str(file_path)).save(
+        [Habit(name="Read", periodicity="daily", completions=["2026-01-01T08:00:00"])], []
+    )
+
+    storage = JsonStorage(file_path=str(file_path), lazy=True)
+    habits, _tasks = storage.load()
+    assert not habits[0].is_loaded
+    storage.save(habits, [])
+    assert not habits[0].is_loaded
+
+    assert JsonStorage(file_path=str(file_path)).load()[0] == habits
+
+
+def test_lazy_habits_stay_compact_and_save_without_loading(tmp_path: Path):
+    file_path = tmp_path / "data.json"
+    write_synthetic_dataset(str(file_path), n_habits=60, years=1.0, n_tasks=1, seed=0)
+    raw = json.loads(file_path.read_text(encoding="utf-8"))
+    for record in raw["habits"]:
+        record.pop("streak", None)  # files from before streaks were stored
+    file_path.write_text(json.dumps(raw), encoding="utf-8")
+
+    def retained(lazy: bool) -> int:
+        tracemalloc.start()
+        try:
+            loaded = JsonStorage(file_path=str(file_path), lazy=lazy).load()
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+            del loaded
+
+    assert retained(lazy=True) < 3 * retained(lazy=False)  # a list of ISO strings: ~7x
+
+    storage = JsonStorage(file_path=str(file_path), lazy=True)
+    habits, tasks = storage.load()
+    storage.save(habits, tasks)
+    assert not any(h.is_loaded for h in habits)
+    saved = json.loads(file_path.read_text(encoding="utf-8"))["habits"]
+    assert [h["completions"] for h in saved] == [h["completions"] for h in raw["habits"]]
+    assert not any("streak" in h for h in saved)
@@ -0,0 +1,167 @@
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from habit_tracker.fixtures import build_predefined_habits_with_4_weeks_data
+from habit_tracker.models import Task
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.storage_sqlite import SqliteStorage
+from habit_tracker.tracker import HabitTracker
+
+
+def make_tracker(tmp_path: Path) -> HabitTracker:
+    tracker = HabitTracker(storage=SqliteStorage(file_path=str(tmp_path / "data.sqlite3")))
+    tracker.load()
+    return tracker
+
+
+def test_save_and_load_roundtrip(tmp_path: Path):
+    storage = SqliteStorage(file_path=str(tmp_path / "data.sqlite3"))
+    habits = build_predefined_habits_with_4_weeks_data()
+    tasks = [Task(title="Taxes", urgent=True, important=True, due_datetime="12/01/26 14:30")]
+    storage.save(habits, tasks)
+
+    loaded_habits, loaded_tasks = storage.load()
+    assert [h.to_dict() for h in loaded_habits] == [h.to_dict() for h in habits]
+    assert [t.to_dict() for t in loaded_tasks] == [t.to_dict() for t in tasks]
+
+
+def test_tracker_mutations_are_applied_incrementally(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Read", "daily")
+    t.create_habit("Swim", "weekly")
+    t.check_off("Read")
+    t.delete_habit("Swim")
+    t.create_task("A", urgent=False, important=True)
+    t.create_task("B", urgent=True, important=True)
+    t.mark_task_completed(2)
+    t.delete_task(1)
+
+    t2 = make_tracker(tmp_path)
+    assert [h.name for h in t2.list_habits()] == ["Read"]
+    assert len(t2.get_habit_by_name("Read").completions) == 1
+    assert [(task.title, task.completed) for task in t2.list_tasks()] == [("B", True)]
+
+
+def test_queries_without_full_load(tmp_path: Path):
+    storage = SqliteStorage(file_path=str(tmp_path / "data.sqlite3"))
+    storage.save(build_predefined_habits_with_4_weeks_data(), [])
+
+    assert storage.habit_names("weekly") == ["Practice drawing"]
+    habit = storage.get_habit("workout")
+    assert habit is not None and len(habit.completions) == 24
+    assert storage.get_habit("missing") is None
+
+    week = storage.completions_between("Workout", datetime(2026, 1, 1), datetime(2026, 1, 8))
+    assert len(week) == 6
+
+
+def test_import_json(tmp_path: Path):
+    json_path = tmp_path / "data.json"
+    JsonStorage(file_path=str(json_path)).save(build_predefined_habits_with_4_weeks_data(), [])
+
+    storage = SqliteStorage(file_path=str(tmp_path / "data.sqlite3"))
+    storage.import_json(str(json_path))
+    habits, _tasks = storage.load()
+    assert len(habits) == 5
+
+
+def test_import_keeps_case_duplicate_names_first_wins(tmp_path: Path):
+    json_path = tmp_path / "data.json"
+    json_path.write_text(
+        '{"habits": [{"name": "Read", "periodicity": "daily"}, {"name": "read ", "periodicity": "weekly"}]}',
+        encoding="utf-8",
+    )
+    path = str(tmp_path / "data.sqlite3")
+    sqlite3.connect(path).executescript(  # created before names could repeat
+        "CREATE TABLE habits (id INTEGER PRIMARY KEY, name TEXT NOT NULL, name_key TEXT NOT NULL,"
+        " periodicity TEXT NOT NULL, description TEXT NOT NULL DEFAULT '', created_at TEXT NOT NULL,"
+        " is_active INTEGER NOT NULL DEFAULT 1);"
+        "CREATE UNIQUE INDEX idx_habits_name_key ON habits(name_key);"
+    )
+    SqliteStorage(file_path=path).import_json(str(json_path))
+
+    t = make_tracker(tmp_path)
+    assert [(h.name, h.periodicity) for h in t.list_habits()] == [("Read", "daily"), ("read ", "weekly")]
+    t.check_off("READ", datetime(2026, 1, 5, 7, 0))
+    t.delete_habit("read")  # the first one, as in memory
+    assert [(h.name, h.completion_count) for h in make_tracker(tmp_path).list_habits()] == [("read ", 0)]
+
+
+def test_migrates_tasks_without_ids(tmp_path: Path):
+    path = str(tmp_path / "data.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT NOT NULL, urgent INTEGER NOT NULL, "
+        "important INTEGER NOT NULL, description TEXT NOT NULL DEFAULT '', due_datetime TEXT, "
+        "created_at TEXT NOT NULL, completed INTEGER NOT NULL DEFAULT 0)"
+    )
+    conn.execute("INSERT INTO tasks (title, urgent, important, created_at) VALUES ('Taxes', 1, 1, '2026-01-01T09:00:00')")
+    conn.commit()
+    conn.close()
+
+    t = make_tracker(tmp_path)
+    [task] = t.list_tasks()
+    legacy = Task.from_dict({"title": "Taxes", "urgent": 1, "important": 1, "created_at": "2026-01-01T09:00:00"})
+    assert task.id == legacy.id
+    t.complete_task(task.id)
+    assert make_tracker(tmp_path).get_task(task.id).completed is True
+
+
+def test_bulk_completions_append(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Read", "daily")
+    assert t.add_completions("Read", [datetime(2026, 1, 2), datetime(2026, 1, 1), datetime(2026, 1, 2)]) == 2
+    assert t.add_completions("Read", [datetime(2026, 1, 1)]) == 0
+    assert make_tracker(tmp_path).get_habit_by_name("Read").longest_streak == 2
+
+
+def test_lazy_load_and_full_save(tmp_path: Path):
+    storage = SqliteStorage(file_path=str(tmp_path / "data.sqlite3"))
+    storage.save(build_predefined_habits_with_4_weeks_data(), [])
+    storage.close()
+
+    lazy = SqliteStorage(file_path=str(tmp_path / "data.sqlite3"), lazy=True)
+    habits, _tasks = lazy.load()
+    assert [h.completion_count for h in habits][0] == 24
+    assert not any(h.is_loaded for h in habits)
+    lazy.save(habits, [])  # rows are rewritten: histories must be fetched first
+
+    reloaded, _tasks = lazy.load()
+    assert [h.stamps for h in reloaded] == [h.stamps for h in habits]
+
+
+def test_write_behind_flushes_from_the_timer_thread(tmp_path: Path):
+    storage = SqliteStorage(file_path=str(tmp_path / "data.sqlite3"))
+    t = HabitTracker(storage=storage, write_behind=0.01)
+    t.load()
+    t.create_habit("Read", "daily")
+    timer = t._flush_timer
+    timer.join(5)
+
+    assert not t._dirty
+    assert SqliteStorage(file_path=str(tmp_path / "data.sqlite3")).habit_names() == ["Read"]
+    t.close()
+
+
+def test_lock_keeps_other_writers_out_until_the_writes_commit(tmp_path: Path):
+    path = str(tmp_path / "data.sqlite3")
+    t = make_tracker(tmp_path)
+    other = sqlite3.connect(path, timeout=0.05)
+    insert = "INSERT INTO tasks (uid, title, urgent, important, created_at) VALUES ('x', 'Other', 0, 0, '2026-01-01')"
+
+    with t.storage.lock():
+        signature = t.storage.signature()
+        t.create_habit("Read", "daily")  # the flush joins the open transaction
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            other.execute(insert)
+        assert t.storage.signature() == signature
+    other.execute(insert)
+    other.commit()
+    other.close()
+
+    assert t.refresh() is True
+    assert [task.title for task in t.list_tasks()] == ["Other"]
+    assert [h.name for h in make_tracker(tmp_path).list_habits()] == ["Read"]
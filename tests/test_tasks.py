@@ -1,5 +1,9 @@
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import pytest
+
+from habit_tracker.models import Task
 from habit_tracker.storage_json import JsonStorage
 from habit_tracker.tracker import HabitTracker
 
@@ -30,3 +34,59 @@ def test_task_quadrants(tmp_path: Path):
     assert len(t.list_tasks_by_quadrant(2)) == 1
     assert len(t.list_tasks_by_quadrant(3)) == 1
     assert len(t.list_tasks_by_quadrant(4)) == 1
+
+
+def test_task_ids_survive_reload_and_deletes(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    a = t.create_task("A", urgent=False, important=True)
+    b = t.create_task("B", urgent=True, important=True)
+    t.remove_task(a.id)
+
+    t2 = make_tracker(tmp_path)
+    assert [task.id for task in t2.list_tasks()] == [b.id]
+    t2.complete_task(b.id)
+    assert t2.get_task(b.id).completed is True
+    assert make_tracker(tmp_path).get_task(b.id).completed is True
+
+
+def test_unknown_task_id_raises(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    with pytest.raises(ValueError):
+        t.complete_task("missing")
+    with pytest.raises(ValueError):
+        t.remove_task("missing")
+
+
+def test_legacy_tasks_get_deterministic_ids():
+    record = {"title": "Taxes", "urgent": True, "important": True, "created_at": "2026-01-01T09:00:00"}
+    assert Task.from_dict(record).id == Task.from_dict(dict(record)).id
+    assert Task.from_dict({**record, "title": "Rent"}).id != Task.from_dict(record).id
+
+
+def test_due_dates_are_parsed_once():
+    assert Task("A", False, False, due_datetime="12/01/26 14:30").due == datetime(2026, 1, 12, 14, 30)
+    assert Task("B", False, False, due_datetime="2026-01-12T14:30:00").due == datetime(2026, 1, 12, 14, 30)
+    assert Task("C", False, False, due_datetime="12/01/26").due == datetime(2026, 1, 12, 23, 59, 59, 999999)
+    assert Task("D", False, False, due_datetime="next week").due is None
+
+
+def test_deadline_queries(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    now = datetime(2026, 1, 12, 12, 0)
+    late = t.create_task("Late", urgent=True, important=True, due_datetime="11/01/26 09:00")
+    soon = t.create_task("Soon", urgent=True, important=False, due_datetime="2026-01-12T18:00")
+    later = t.create_task("Later", urgent=False, important=True, due_datetime="20/01/26 10:00")
+    t.create_task("Someday", urgent=False, important=False)
+
+    assert t.overdue_tasks(now) == [late]
+    assert t.upcoming_tasks(timedelta(days=1), now) == [soon]
+    assert t.next_due(now) is soon
+
+    t.complete_task(soon.id)
+    assert t.upcoming_tasks(timedelta(days=1), now) == []
+    assert t.next_due(now) is later
+    t.remove_task(late.id)
+    assert t.overdue_tasks(now) == []
+
+    with pytest.raises(ValueError):
+        t.create_task("Typo", urgent=False, important=False, due_datetime="32/13/26")
@@ -0,0 +1,199 @@
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.threadsafe import RWLock, ThreadSafeHabitTracker
+from habit_tracker.tracker import HabitTracker
+
+
+def make_tracker(tmp_path: Path) -> ThreadSafeHabitTracker:
+    tracker = ThreadSafeHabitTracker(storage=JsonStorage(file_path=str(tmp_path / "data.json")))
+    tracker.load()
+    return tracker
+
+
+def test_snapshots_are_isolated_and_reuse_unchanged_copies(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Read", "daily")
+    t.create_habit("Swim", "weekly")
+    task = t.create_task("Taxes", urgent=True, important=True)
+
+    before = t.snapshot()
+    assert t.snapshot() is before  # no writes: shared
+    t.check_off("Read", datetime(2026, 1, 5, 7))
+    t.complete_task(task.id)
+
+    assert len(before.get_habit_by_name("Read").completions) == 0
+    assert before.get_task(task.id).completed is False
+    after = t.snapshot()
+    assert len(after.get_habit_by_name("Read").completions) == 1
+    assert after.get_task(task.id).completed is True
+    assert after.get_habit_by_name("Swim") is before.get_habit_by_name("Swim")
+    assert t.list_habits() == after.list_habits()
+
+
+def test_concurrent_writers_and_readers(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    for name in ("Read", "Swim"):
+        t.create_habit(name, "daily")
+    start = datetime(2026, 1, 1, 7)
+    errors = []
+    done = threading.Event()
+
+    def write(name, offset):
+        try:
+            with t.batch():
+                for day in range(offset, 200, 4):
+                    t.check_off(name, start + timedelta(days=day))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    def read():
+        try:
+            while not done.is_set():
+                for habit in t.list_habits():
+                    assert list(habit.stamps) == sorted(habit.stamps)
+                    assert habit.longest_streak <= len(habit.stamps)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    writers = [threading.Thread(target=write, args=(name, i)) for name in ("Read", "Swim") for i in range(4)]
+    for th in readers + writers:
+        th.start()
+    for th in writers:
+        th.join()
+    done.set()
+    for th in readers:
+        th.join()
+
+    assert errors == []
+    for name in ("Read", "Swim"):
+        assert t.get_habit_by_name(name).longest_streak == 200
+    reloaded = make_tracker(tmp_path)
+    assert len(reloaded.get_habit_by_name("Swim").completions) == 200
+
+
+class BlockingStorage(JsonStorage):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path=file_path)
+        self.saving = threading.Event()
+        self.release = threading.Event()
+
+    def save(self, habits, tasks) -> None:
+        self.saving.set()
+        self.release.wait(2.0)
+        super().save(habits, tasks)
+
+
+def test_persistence_runs_outside_the_lock(tmp_path: Path):
+    storage = BlockingStorage(str(tmp_path / "data.json"))
+    t = ThreadSafeHabitTracker(storage=storage)
+    t.load()
+
+    saver = threading.Thread(target=t.create_habit, args=("Read", "daily"))
+    saver.start()
+    assert storage.saving.wait(2.0)
+    # The first write is still being persisted; reads and writes go on.
+    assert [h.name for h in t.list_habits()] == ["Read"]
+    with t.batch():
+        t.create_habit("Swim", "weekly")
+        assert [h.name for h in t.list_habits()] == ["Read", "Swim"]
+        storage.release.set()
+    saver.join()
+    t.flush()
+    assert [h.name for h in make_tracker(tmp_path).list_habits()] == ["Read", "Swim"]
+
+
+def test_rwlock_writer_excludes_readers_and_reenters():
+    lock = RWLock()
+    entered = threading.Event()
+
+    def reader():
+        with lock.read():
+            entered.set()
+
+    with lock.write():
+        with lock.write(), lock.read():
+            pass
+        th = threading.Thread(target=reader)
+        th.start()
+        assert not entered.wait(0.05)
+    assert entered.wait(2.0)
+    th.join()
+
+
+class RacingStorage(JsonStorage):
+    """Starts `racers` writer threads whenever a load is in progress."""
+
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path=file_path)
+        self.racers = []
+        self.started = []
+        self.held_off = []  # per racer: still waiting when the load returned
+
+    def load(self):
+        loaded = super().load()
+        for racer in self.racers:
+            racer.start()
+            racer.join(0.1)  # a write can't finish before the merge does
+            self.held_off.append(racer.is_alive())
+        self.started += self.racers
+        self.racers = []
+        return loaded
+
+
+def test_writes_during_a_merging_flush_are_kept(tmp_path: Path):
+    storage = RacingStorage(str(tmp_path / "data.json"))
+    t = ThreadSafeHabitTracker(storage=storage, write_behind=60.0)
+    t.load()
+    t.create_habit("Read", "daily")
+    t.flush()
+
+    other = HabitTracker(storage=JsonStorage(file_path=str(tmp_path / "data.json")))  # another process
+    other.load()
+    other.create_habit("Swim", "weekly")
+    storage.racers = [
+        threading.Thread(target=t.check_off, args=("Read", datetime(2026, 1, day, 7))) for day in (1, 2, 3)
+    ]
+    t.check_off("Read", datetime(2026, 1, 4, 7))
+    t.flush()  # merges Swim while three threads check off
+    for racer in storage.started:
+        racer.join()
+    t.close()
+
+    assert storage.held_off == [True, True, True]
+    assert len(t.get_habit_by_name("Read").completions) == 4
+    on_disk = make_tracker(tmp_path)
+    assert [h.name for h in on_disk.list_habits()] == ["Read", "Swim"]
+    assert len(on_disk.get_habit_by_name("Read").completions) == 4
+
+
+def test_many_writers_and_another_process(tmp_path: Path):
+    t = ThreadSafeHabitTracker(storage=JsonStorage(file_path=str(tmp_path / "data.json")), write_behind=0.001)
+    t.load()
+    t.create_habit("Read", "daily")
+    t.flush()
+    start = datetime(2026, 1, 1, 7)
+
+    def write(offset):
+        for day in range(offset, 120, 4):
+            t.check_off("Read", start + timedelta(days=day))
+
+    writers = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+    for th in writers:
+        th.start()
+    for i in range(10):  # another process adding habits meanwhile
+        other = HabitTracker(storage=JsonStorage(file_path=str(tmp_path / "data.json")))
+        other.load()
+        other.create_habit(f"Other {i}", "daily")
+    for th in writers:
+        th.join()
+    t.close()
+
+    names = ["Read"] + [f"Other {i}" for i in range(10)]
+    assert t.get_habit_by_name("Read").longest_streak == 120
+    on_disk = make_tracker(tmp_path)
+    assert sorted(h.name for h in on_disk.list_habits()) == sorted(names)
+    assert on_disk.get_habit_by_name("Read").longest_streak == 120
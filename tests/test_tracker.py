@@ -1,5 +1,9 @@
-import pytest
+import threading
+from datetime import datetime
 from pathlib import Path
+from typing import Callable, List, Optional
+
+import pytest
 
 from habit_tracker.storage_json import JsonStorage
 from habit_tracker.tracker import HabitTracker
@@ -31,4 +35,196 @@ def test_check_off_adds_completion(tmp_path: Path):
 def test_rejects_invalid_periodicity(tmp_path: Path):
     t = make_tracker(tmp_path)
     with pytest.raises(ValueError):
-        t.create_habit("Bad", "monthly")
+        t.create_habit("Bad", "fortnightly")
+
+
+class CountingStorage(JsonStorage):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path=file_path)
+        self.saves = 0
+
+    def save(self, habits, tasks) -> None:
+        self.saves += 1
+        super().save(habits, tasks)
+
+
+def test_batch_persists_once(tmp_path: Path):
+    storage = CountingStorage(str(tmp_path / "data.json"))
+    t = HabitTracker(storage=storage)
+    t.load()
+
+    with t.batch():
+        t.create_habit("Read", "daily")
+        t.create_habit("Walk", "daily")
+        with t.batch():
+            t.check_off("Read")
+        t.check_off("Walk")
+        assert storage.saves == 0
+
+    assert storage.saves == 1
+    t2 = make_tracker(tmp_path)
+    assert len(t2.get_habit_by_name("Walk").completions) == 1
+
+
+def test_write_behind_flushes_on_close(tmp_path: Path):
+    storage = CountingStorage(str(tmp_path / "data.json"))
+    t = HabitTracker(storage=storage, write_behind=60.0)
+    t.load()
+    t.create_habit("Read", "daily")
+    t.check_off("Read")
+    assert storage.saves == 0
+
+    t.close()
+    assert storage.saves == 1
+    assert len(make_tracker(tmp_path).get_habit_by_name("Read").completions) == 1
+
+
+class FailingStorage(JsonStorage):
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path=file_path)
+        self.fail = False
+
+    def save(self, habits, tasks) -> None:
+        if self.fail:
+            raise OSError("disk full")
+        super().save(habits, tasks)
+
+
+def test_failed_flush_keeps_changes_for_the_next_one(tmp_path: Path):
+    storage = FailingStorage(str(tmp_path / "data.json"))
+    t = HabitTracker(storage=storage, write_behind=60.0)
+    t.load()
+    t.create_habit("Read", "daily")
+    storage.fail = True
+    with pytest.raises(OSError):
+        t.flush()
+
+    storage.fail = False
+    t.close()
+    assert make_tracker(tmp_path).get_habit_by_name("Read") is not None
+
+
+def test_save_is_atomic_and_leaves_no_temp_files(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Read", "daily")
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_indexed_listings_stay_consistent(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Read", "daily")
+    t.create_habit("Swim", "weekly")
+    t.create_habit("Walk", "Daily")
+
+    assert [h.name for h in t.list_habits_by_periodicity("DAILY")] == ["Read", "Walk"]
+    t.set_habit_active("walk", False)
+    assert [h.name for h in t.list_active_habits()] == ["Read", "Swim"]
+    t.delete_habit("read")
+    assert [h.name for h in t.list_habits_by_periodicity("daily")] == ["Walk"]
+
+    t2 = make_tracker(tmp_path)
+    assert [h.name for h in t2.list_active_habits(False)] == ["Walk"]
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path: Path):
+    a = make_tracker(tmp_path)
+    b = make_tracker(tmp_path)
+    a.create_habit("Read", "daily")
+    read_version = a.habit_version("Read")
+
+    b.create_habit("Swim", "weekly")  # b's copy is stale: its flush re-applies on top of a's write
+    assert [h.name for h in b.list_habits()] == ["Read", "Swim"]
+    assert [h.name for h in make_tracker(tmp_path).list_habits()] == ["Read", "Swim"]
+
+    assert a.refresh() is True
+    assert [h.name for h in a.list_habits()] == ["Read", "Swim"]
+    assert a.habit_version("Read") == read_version  # unchanged habits keep their version
+    assert a.refresh() is False
+
+
+def test_save_keeps_habits_another_process_wrote(tmp_path: Path):
+    a = make_tracker(tmp_path)
+    b = make_tracker(tmp_path)
+    a.create_habit("A", "daily")
+    b.create_habit("B", "daily")
+
+    a.save()
+    assert [h.name for h in a.list_habits()] == ["A", "B"]
+    assert [h.name for h in make_tracker(tmp_path).list_habits()] == ["A", "B"]
+
+
+class RacingStorage(JsonStorage):
+    """Runs `race` on another thread while a load is in progress."""
+
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path=file_path)
+        self.race: Optional[Callable[[], None]] = None
+        self.racers: List[threading.Thread] = []
+
+    def load(self):
+        loaded = super().load()
+        if self.race is not None:
+            racer = threading.Thread(target=self.race)
+            self.race = None
+            racer.start()
+            racer.join(0.2)  # a mutation can't finish before the merge does
+            self.racers.append(racer)
+        return loaded
+
+
+def test_mutation_during_a_merging_flush_is_kept(tmp_path: Path):
+    storage = RacingStorage(str(tmp_path / "data.json"))
+    t = HabitTracker(storage=storage, write_behind=60.0)
+    t.load()
+    t.create_habit("Read", "daily")
+    t.flush()
+
+    make_tracker(tmp_path).create_habit("Swim", "weekly")  # another process
+    t.check_off("Read", datetime(2026, 1, 5, 7, 0))
+    storage.race = lambda: t.check_off("Read", datetime(2026, 1, 6, 7, 0))
+    t.flush()  # merges Swim while the racer checks off
+    for racer in storage.racers:
+        racer.join()
+    t.close()
+
+    assert len(t.get_habit_by_name("Read").completions) == 2
+    on_disk = make_tracker(tmp_path)
+    assert [h.name for h in on_disk.list_habits()] == ["Read", "Swim"]
+    assert len(on_disk.get_habit_by_name("Read").completions) == 2
+
+
+def test_refresh_merges_only_changed_habits_and_tasks(tmp_path: Path):
+    a = make_tracker(tmp_path)
+    a.create_habit("Read", "daily")
+    a.create_habit("Swim", "weekly")
+    task = a.create_task("Taxes", urgent=True, important=True)
+    b = make_tracker(tmp_path)
+
+    b.check_off("Swim")
+    b.complete_task(task.id)
+    read = a.get_habit_by_name("Read")
+    assert a.refresh() is True
+    assert a.get_habit_by_name("Read") is read
+    assert len(a.get_habit_by_name("Swim").completions) == 1
+    assert a.get_task(task.id).completed is True
+
+
+def test_subscribe_reports_changed_keys(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    changes = []
+    unsubscribe = t.subscribe(changes.append)
+
+    t.create_habit(name="Workout", periodicity="daily")
+    task = t.create_task(title="Taxes", urgent=True, important=True)
+    t.complete_task(task.id)
+    t.delete_habit("Workout")
+    assert [(c.kind, c.key) for c in changes] == [
+        ("habit", "workout"),
+        ("task", task.id),
+        ("task", task.id),
+        ("habit", "workout"),
+    ]
+
+    unsubscribe()
+    t.create_habit(name="Read", periodicity="daily")
+    assert len(changes) == 4
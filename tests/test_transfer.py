@@ -0,0 +1,87 @@
+import io
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from habit_tracker.storage_journal import JournalStorage
+from habit_tracker.storage_json import JsonStorage
+from habit_tracker.tracker import HabitTracker
+from habit_tracker.transfer import (
+    export_completions_csv,
+    export_ndjson,
+    import_completions,
+    import_file,
+    read_csv_completions,
+    read_ndjson_completions,
+)
+
+
+def make_tracker(tmp_path: Path, storage_cls=JsonStorage) -> HabitTracker:
+    t = HabitTracker(storage=storage_cls(file_path=str(tmp_path / "data.json")))
+    t.load()
+    return t
+
+
+def test_csv_import_dedupes_and_backfills_streaks(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Read", "daily")
+    t.check_off("Read", datetime(2026, 1, 3, 8, 0))
+
+    csv_path = tmp_path / "history.csv"
+    csv_path.write_text(
+        "habit,ts\n"
+        "read,2026-01-02T08:00:00\n"
+        "Read,2026-01-01T08:00:00\n"
+        "Read,2026-01-01T08:00:00\n"
+        "Read,2026-01-03T08:00:00\n"
+        "Swim,2026-01-01T08:00:00\n",
+        encoding="utf-8",
+    )
+    result = import_file(t, csv_path)
+
+    assert (result.added, result.duplicates, result.unknown) == (2, 2, 1)
+    habit = make_tracker(tmp_path).get_habit_by_name("Read")
+    assert len(habit.completions) == 3
+    assert habit.longest_streak == 3
+
+
+def test_import_persists_once_with_journal(tmp_path: Path):
+    t = make_tracker(tmp_path, JournalStorage)
+    t.create_habit("Walk", "daily")
+    records = (("Walk", datetime(2025, 12, d, 7, 0)) for d in range(1, 32))
+    assert import_completions(t, records).added == 31
+
+    log_lines = (tmp_path / "data.json.log").read_text(encoding="utf-8").splitlines()
+    assert len(log_lines) == 2  # habit_add + one completions_add
+    assert make_tracker(tmp_path, JournalStorage).get_habit_by_name("Walk").longest_streak == 31
+
+
+def test_bad_row_aborts_without_changes(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Read", "daily")
+    data = io.StringIO('{"habit": "Read", "ts": "2026-01-01T08:00:00"}\n{"habit": "Read", "ts": "soon"}\n')
+    with pytest.raises(ValueError):
+        import_completions(t, read_ndjson_completions(data))
+    assert len(t.get_habit_by_name("Read").completions) == 0
+
+
+def test_export_roundtrip(tmp_path: Path):
+    t = make_tracker(tmp_path)
+    t.create_habit("Read", "daily")
+    t.create_task("Taxes", urgent=True, important=True)
+    t.check_off("Read", datetime(2026, 1, 1, 8, 0))
+    t.check_off("Read", datetime(2026, 1, 2, 8, 0))
+
+    out = io.StringIO()
+    assert export_ndjson(t.list_habits(), t.list_tasks(), out) == 4
+    csv_out = io.StringIO()
+    assert export_completions_csv(t.list_habits(), csv_out) == 2
+
+    (tmp_path / "other").mkdir()
+    other = make_tracker(tmp_path / "other")
+    other.create_habit("Read", "daily")
+    out.seek(0)
+    assert import_completions(other, read_ndjson_completions(out)).added == 2
+    csv_out.seek(0)
+    assert [name for name, _ts in read_csv_completions(csv_out)] == ["Read", "Read"]
@@ -0,0 +1,53 @@
+import threading
+import time
+
+from habit_tracker.worker import BackgroundWorker
+
+
+def wait_for_results(worker: BackgroundWorker, count: int, timeout: float = 2.0):
+    results = []
+    deadline = time.monotonic() + timeout
+    while len(results) < count and time.monotonic() < deadline:
+        results.extend(worker.poll())
+        time.sleep(0.005)
+    return results
+
+
+def test_results_and_errors_come_back_through_poll():
+    worker = BackgroundWorker()
+    try:
+        worker.submit("sum", sum, [1, 2, 3])
+        worker.submit("boom", lambda: 1 / 0)
+        results = {r.key: r for r in wait_for_results(worker, 2)}
+        assert results["sum"].value == 6 and results["sum"].error is None
+        assert isinstance(results["boom"].error, ZeroDivisionError)
+    finally:
+        worker.stop()
+
+
+def test_newer_job_makes_older_ones_stale():
+    worker = BackgroundWorker()
+    started = threading.Event()
+    release = threading.Event()
+    ran = []
+
+    def slow(tag):
+        started.set()
+        release.wait(2.0)
+        ran.append(tag)
+        return tag
+
+    try:
+        worker.submit("stats", slow, "running")
+        started.wait(2.0)
+        worker.submit("stats", ran.append, "queued")  # skipped: superseded before it starts
+        worker.submit("stats", lambda: "latest")
+        release.set()
+
+        results = wait_for_results(worker, 1)
+        time.sleep(0.05)
+        results += worker.poll()
+        assert [r.value for r in results] == ["latest"]
+        assert ran == ["running"]
+    finally:
+        worker.stop()